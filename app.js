@@ -60,6 +60,8 @@ let selectedDressPhotoPath = '';
 let selectedStoreId = '';
 let activeStoreCanManagePhotos = false;
 let currentDressPhotos = [];
+let currentDressNextCursor = null;
+let dressPageRequest = null;
 let tagOptions = null;
 
 let swipeDeck = [];
@@ -68,6 +70,9 @@ let swipeLikes = [];
 let swipeDislikes = [];
 let rankedStoreDresses = [];
 let rankedStoreDressIndex = 0;
+let rankedStoreDressTotal = 0;
+let rankedStoreDressNextOffset = null;
+let rankingPageRequest = null;
 
 const getSessionUser = () => (localStorage.getItem(sessionKey) || '').trim();
 
@@ -188,13 +193,6 @@ updateHeaderAuth();
 
 const getActiveLocale = () => (document.documentElement?.lang || 'en').trim().toLowerCase() || 'en';
 
-const getLocalizedValue = (labels, locale, fallback = 'en') => {
-  if (!labels || typeof labels !== 'object') {
-    return '';
-  }
-  return labels[locale] || labels[fallback] || Object.values(labels)[0] || '';
-};
-
 const setDressMetadataMessage = (message, type) => {
   if (!dressMetadataMessage) {
     return;
@@ -214,7 +212,7 @@ const loadTagOptions = async () => {
     return tagOptions;
   }
   try {
-    const response = await fetch('/api/tag-options');
+    const response = await fetch(`/api/tag-options?lang=${encodeURIComponent(getActiveLocale())}`);
     if (!response.ok) {
       return null;
     }
@@ -261,41 +259,6 @@ const normalizeToken = (value) =>
     .toLowerCase()
     .replace(/[^a-z0-9]+/g, '-');
 
-const buildTagToCategoryMap = () => {
-  const map = new Map();
-  if (!tagOptions || !Array.isArray(tagOptions.categories)) {
-    return map;
-  }
-  tagOptions.categories.forEach((category) => {
-    const label = getLocalizedValue(category.label, 'en', tagOptions.defaultLocale || 'en') || category.id;
-    (category.tags || []).forEach((tag) => {
-      map.set(normalizeToken(tag.id), label);
-      map.set(normalizeToken(getLocalizedValue(tag.label, 'en', tagOptions.defaultLocale || 'en')), label);
-    });
-  });
-  return map;
-};
-
-const resolvePhotoCategory = (photoPath, tagToCategoryMap, fallbackCategories = []) => {
-  const tokens = normalizeToken(photoPath).split('-').filter(Boolean);
-  for (const token of tokens) {
-    if (tagToCategoryMap.has(token)) {
-      return tagToCategoryMap.get(token);
-    }
-  }
-  for (let index = 0; index < tokens.length - 1; index += 1) {
-    const pair = `${tokens[index]}-${tokens[index + 1]}`;
-    if (tagToCategoryMap.has(pair)) {
-      return tagToCategoryMap.get(pair);
-    }
-  }
-  if (fallbackCategories.length) {
-    const numericSeed = tokens.join('').split('').reduce((total, char) => total + char.charCodeAt(0), 0);
-    return fallbackCategories[numericSeed % fallbackCategories.length];
-  }
-  return 'General Style';
-};
-
 const renderSwipeCard = () => {
   if (!swipeWorkspace || !swipeImage || !swipeCaption || !swipeProgress || !swipeCategoryChip || !dislikeButton || !likeButton) {
     return;
@@ -321,68 +284,46 @@ const renderSwipeCard = () => {
 };
 
 const buildSessionTagInsights = () => {
-  const locale = getActiveLocale();
-  const defaultLocale = tagOptions?.defaultLocale || 'en';
   const categories = Array.isArray(tagOptions?.categories) ? tagOptions.categories : [];
+  const tagCategories = tagOptions?.tagCategories || {};
   const fallbackCategoryLabel = 'Additional Tags';
 
-  const categorySummaries = categories.map((category) => {
-    const categoryLabel = getLocalizedValue(category.label, locale, defaultLocale) || category.id;
-    const tags = (category.tags || []).map((tag) => ({
-      id: tag.id,
-      normalizedId: normalizeToken(tag.id),
-      label: getLocalizedValue(tag.label, locale, defaultLocale) || tag.id,
-      likeCount: 0,
-      dislikeCount: 0,
-    }));
-    return {
-      id: category.id,
-      label: categoryLabel,
-      tags,
-    };
-  });
-
-  const tagLookup = new Map();
-  categorySummaries.forEach((category) => {
-    category.tags.forEach((tag) => {
-      tagLookup.set(tag.normalizedId, tag);
-    });
-  });
-
-  const additionalTags = new Map();
-  const tallySentimentForItem = (item, sentiment) => {
+  const likeCounts = new Map();
+  const dislikeCounts = new Map();
+  const tallySentimentForItem = (item, counts) => {
     const uniqueTags = new Set((Array.isArray(item.tags) ? item.tags : []).map((tag) => normalizeToken(tag)).filter(Boolean));
     uniqueTags.forEach((tagId) => {
-      const knownTag = tagLookup.get(tagId);
-      if (knownTag) {
-        if (sentiment === 'like') {
-          knownTag.likeCount += 1;
-        } else {
-          knownTag.dislikeCount += 1;
-        }
-        return;
-      }
-
-      if (!additionalTags.has(tagId)) {
-        additionalTags.set(tagId, {
-          id: tagId,
-          normalizedId: tagId,
-          label: tagId,
-          likeCount: 0,
-          dislikeCount: 0,
-        });
-      }
-      const additionalTag = additionalTags.get(tagId);
-      if (sentiment === 'like') {
-        additionalTag.likeCount += 1;
-      } else {
-        additionalTag.dislikeCount += 1;
-      }
+      counts.set(tagId, (counts.get(tagId) || 0) + 1);
     });
   };
 
-  swipeLikes.forEach((item) => tallySentimentForItem(item, 'like'));
-  swipeDislikes.forEach((item) => tallySentimentForItem(item, 'dislike'));
+  swipeLikes.forEach((item) => tallySentimentForItem(item, likeCounts));
+  swipeDislikes.forEach((item) => tallySentimentForItem(item, dislikeCounts));
+
+  const categorySummaries = categories.map((category) => ({
+    id: category.id,
+    label: category.label,
+    tags: category.tags.map((tag) => ({
+      ...tag,
+      likeCount: likeCounts.get(tag.normalizedId) || 0,
+      dislikeCount: dislikeCounts.get(tag.normalizedId) || 0,
+    })),
+  }));
+
+  // tagCategories comes precomputed with the tag options; tags it does not know are grouped separately.
+  const additionalTags = new Map();
+  [...likeCounts.keys(), ...dislikeCounts.keys()].forEach((tagId) => {
+    if (Object.prototype.hasOwnProperty.call(tagCategories, tagId) || additionalTags.has(tagId)) {
+      return;
+    }
+    additionalTags.set(tagId, {
+      id: tagId,
+      normalizedId: tagId,
+      label: tagId,
+      likeCount: likeCounts.get(tagId) || 0,
+      dislikeCount: dislikeCounts.get(tagId) || 0,
+    });
+  });
 
   if (additionalTags.size) {
     categorySummaries.push({
@@ -395,43 +336,63 @@ const buildSessionTagInsights = () => {
   return categorySummaries;
 };
 
-const buildSwipePreferenceScores = () => {
-  const scores = new Map();
-  const updateScores = (items, delta) => {
-    items.forEach((item) => {
-      const uniqueTags = new Set((Array.isArray(item.tags) ? item.tags : []).map((tag) => normalizeToken(tag)).filter(Boolean));
-      uniqueTags.forEach((tagId) => {
-        scores.set(tagId, (scores.get(tagId) || 0) + delta);
-      });
-    });
+const RANKING_PAGE_SIZE = 50;
+
+// The server ranks the whole inventory; pages of it are fetched as the user steps through.
+const rankStoreDressesFromSession = async (offset = 0) => {
+  const emptyPage = { ranking: [], total: 0, nextOffset: null };
+  if (!selectedStoreId) {
+    return emptyPage;
+  }
+  const response = await fetch(`/api/stores/${encodeURIComponent(selectedStoreId)}/rank`, {
+    method: 'POST',
+    headers: { 'Content-Type': 'application/json' },
+    body: JSON.stringify({
+      likes: swipeLikes.map((item) => (Array.isArray(item.tags) ? item.tags : [])),
+      dislikes: swipeDislikes.map((item) => (Array.isArray(item.tags) ? item.tags : [])),
+      limit: RANKING_PAGE_SIZE,
+      offset,
+    }),
+  });
+  if (!response.ok) {
+    return emptyPage;
+  }
+  const data = await response.json();
+  return {
+    ranking: (Array.isArray(data.ranking) ? data.ranking : []).map((photo) => ({
+      ...photo,
+      normalizedTags: Array.isArray(photo.normalized_tags) ? photo.normalized_tags : [],
+    })),
+    total: Number(data.total) || 0,
+    nextOffset: typeof data.next_offset === 'number' ? data.next_offset : null,
   };
-
-  updateScores(swipeLikes, 1);
-  updateScores(swipeDislikes, -1);
-  return scores;
 };
 
-const rankStoreDressesFromSession = () => {
-  const preferenceScores = buildSwipePreferenceScores();
-  const safePhotos = Array.isArray(currentDressPhotos) ? currentDressPhotos : [];
-  return safePhotos
-    .map((photo) => {
-      const normalizedTags = Array.isArray(photo.tags)
-        ? photo.tags.map((tag) => normalizeToken(tag)).filter(Boolean)
-        : [];
-      const score = normalizedTags.reduce((total, tagId) => total + (preferenceScores.get(tagId) || 0), 0);
-      return {
-        ...photo,
-        score,
-        normalizedTags,
-      };
-    })
-    .sort((first, second) => {
-      if (second.score !== first.score) {
-        return second.score - first.score;
-      }
-      return (first.photo_path || '').localeCompare(second.photo_path || '');
-    });
+const loadNextRankingPage = () => {
+  if (rankedStoreDressNextOffset === null) {
+    return Promise.resolve();
+  }
+  if (!rankingPageRequest) {
+    const requestedDresses = rankedStoreDresses;
+    const request = rankStoreDressesFromSession(rankedStoreDressNextOffset)
+      .catch(() => ({ ranking: [], total: rankedStoreDressTotal, nextOffset: null }))
+      .then((page) => {
+        if (rankingPageRequest === request) {
+          rankingPageRequest = null;
+        }
+        // A new session may have started while this page was loading.
+        if (requestedDresses !== rankedStoreDresses) {
+          return;
+        }
+        rankedStoreDresses.push(...page.ranking);
+        rankedStoreDressNextOffset = page.ranking.length ? page.nextOffset : null;
+        if (rankedStoreDressNextOffset === null) {
+          rankedStoreDressTotal = rankedStoreDresses.length;
+        }
+      });
+    rankingPageRequest = request;
+  }
+  return rankingPageRequest;
 };
 
 const setSessionResultsTab = (tabId) => {
@@ -465,9 +426,9 @@ const renderRankedStoreDress = () => {
   sessionRankingImage.src = current.photo_path;
   sessionRankingCaption.textContent = `Top match tags: ${tagText}`;
   sessionRankingScore.textContent = `Match score: ${current.score > 0 ? `+${current.score}` : current.score}`;
-  sessionRankingPosition.textContent = `Dress ${rankedStoreDressIndex + 1} of ${rankedStoreDresses.length}`;
+  sessionRankingPosition.textContent = `Dress ${rankedStoreDressIndex + 1} of ${rankedStoreDressTotal}`;
   sessionRankingPrev.disabled = rankedStoreDressIndex === 0;
-  sessionRankingNext.disabled = rankedStoreDressIndex >= rankedStoreDresses.length - 1;
+  sessionRankingNext.disabled = rankedStoreDressIndex >= rankedStoreDressTotal - 1;
 };
 
 const renderSessionResults = () => {
@@ -550,9 +511,21 @@ const renderSessionResults = () => {
     });
   }
 
-  rankedStoreDresses = rankStoreDressesFromSession();
+  rankedStoreDresses = [];
   rankedStoreDressIndex = 0;
+  rankedStoreDressTotal = 0;
+  rankedStoreDressNextOffset = null;
+  rankingPageRequest = null;
   renderRankedStoreDress();
+  rankStoreDressesFromSession()
+    .catch(() => ({ ranking: [], total: 0, nextOffset: null }))
+    .then((page) => {
+      rankedStoreDresses = page.ranking;
+      rankedStoreDressIndex = 0;
+      rankedStoreDressTotal = page.ranking.length ? page.total : 0;
+      rankedStoreDressNextOffset = page.nextOffset;
+      renderRankedStoreDress();
+    });
   setSessionResultsTab('insights');
 
   sessionResults.classList.remove('is-hidden');
@@ -592,51 +565,31 @@ const startDefaultSession = async () => {
   await loadTagOptions();
 
   try {
-    const response = await fetch('/api/default-dress-photos');
+    const response = await fetch('/api/sessions/deck');
     if (!response.ok) {
       setSessionMessage('Unable to load default dress photos.', 'error');
       return;
     }
     const data = await response.json();
-    const photos = Array.isArray(data.photos) ? data.photos : [];
-    if (!photos.length) {
+    const deck = Array.isArray(data.deck) ? data.deck : [];
+    if (!deck.length) {
       setSessionMessage('No default photos were found.', 'error');
       return;
     }
 
-    let metadataByPhoto = new Map();
-    try {
-      const metadataResponse = await fetch('/api/default-dress-metadata');
-      if (metadataResponse.ok) {
-        const metadataPayload = await metadataResponse.json();
-        const metadataRows = Array.isArray(metadataPayload.photos) ? metadataPayload.photos : [];
-        metadataByPhoto = new Map(
-          metadataRows.map((row) => [row.photo_path, Array.isArray(row.tags) ? row.tags : []])
-        );
-      }
-    } catch (error) {
-      // Fallback to filename heuristics.
-    }
-
-    const tagMap = buildTagToCategoryMap();
-    const fallbackCategories = Array.from(new Set(Array.from(tagMap.values())));
-    swipeDeck = photos.map((photoPath) => {
-      const tags = metadataByPhoto.get(photoPath) || [];
-      const categoryFromTag = tags
-        .map((tag) => tagMap.get(normalizeToken(tag)))
-        .find((value) => Boolean(value));
-      return {
-        photoPath,
-        fileName: photoPath.split('/').pop() || photoPath,
-        tags,
-        category: categoryFromTag || resolvePhotoCategory(photoPath, tagMap, fallbackCategories),
-      };
-    });
+    swipeDeck = deck.map((card) => ({
+      photoPath: card.photo_path,
+      fileName: card.file_name,
+      tags: Array.isArray(card.tags) ? card.tags : [],
+      category: card.category,
+    }));
     swipeIndex = 0;
     swipeLikes = [];
     swipeDislikes = [];
     rankedStoreDresses = [];
     rankedStoreDressIndex = 0;
+    rankedStoreDressTotal = 0;
+    rankedStoreDressNextOffset = null;
 
     if (swipeWorkspace) {
       swipeWorkspace.classList.remove('is-hidden');
@@ -666,23 +619,9 @@ const setDressPhotoMessage = (message, type) => {
   }
 };
 
-const getStorePhotoUrlsFromTile = (tile) => {
-  if (!tile) {
-    return [];
-  }
-  const photoUrlsRaw = tile.dataset.photoUrls;
-  if (!photoUrlsRaw) {
-    return [];
-  }
-  try {
-    const parsed = JSON.parse(photoUrlsRaw);
-    if (Array.isArray(parsed)) {
-      return parsed;
-    }
-  } catch (error) {
-    // Ignore malformed payload.
-  }
-  return [];
+const getStorePhotoCountFromTile = (tile) => {
+  const count = Number.parseInt(tile?.dataset.photoCount || '', 10);
+  return Number.isNaN(count) ? 0 : count;
 };
 
 const setOverviewStore = (tile) => {
@@ -701,8 +640,7 @@ const setOverviewStore = (tile) => {
     return;
   }
 
-  const photoUrls = getStorePhotoUrlsFromTile(tile);
-  const photoCount = photoUrls.length;
+  const photoCount = getStorePhotoCountFromTile(tile);
   overviewName.textContent = tile.dataset.name || '';
   overviewAddress.textContent = tile.dataset.location || '';
   overviewPhotoCount.textContent = `${photoCount} picture${photoCount === 1 ? '' : 's'}`;
@@ -762,8 +700,12 @@ const removeDressPhoto = async (storeId, photoUrl) => {
       setDressPhotoMessage(errorData.error || 'Unable to remove this photo right now.', 'error');
       return;
     }
-    const store = await response.json();
-    updateDetailsSummary(store);
+    const data = await response.json();
+    applyDressPhotoChange(
+      currentDressPhotos.filter((photo) => photo.photo_path !== data.photo_path),
+      data.photo_count,
+      storeId,
+    );
     setDressPhotoMessage('Photo removed.', 'success');
   } catch (error) {
     setDressPhotoMessage('Unable to remove this photo right now.', 'error');
@@ -776,7 +718,6 @@ const renderTagOptions = (selectedTags = []) => {
   }
   dressTagOptionsContainer.innerHTML = '';
   const options = tagOptions;
-  const locale = getActiveLocale();
   if (!options || !Array.isArray(options.categories)) {
     const empty = document.createElement('p');
     empty.className = 'store-detail-location';
@@ -790,7 +731,7 @@ const renderTagOptions = (selectedTags = []) => {
     fieldset.className = 'dress-tag-category';
 
     const legend = document.createElement('legend');
-    legend.textContent = getLocalizedValue(category.label, locale, options.defaultLocale || 'en') || category.id;
+    legend.textContent = category.label;
     fieldset.appendChild(legend);
 
     const group = document.createElement('div');
@@ -807,7 +748,7 @@ const renderTagOptions = (selectedTags = []) => {
       checkbox.disabled = !activeStoreCanManagePhotos;
 
       const text = document.createElement('span');
-      text.textContent = getLocalizedValue(tag.label, locale, options.defaultLocale || 'en') || tag.id;
+      text.textContent = tag.label;
 
       optionLabel.appendChild(checkbox);
       optionLabel.appendChild(text);
@@ -819,6 +760,50 @@ const renderTagOptions = (selectedTags = []) => {
   });
 };
 
+const DRESS_PAGE_SIZE = 50;
+
+const fetchStoreDressPage = async (storeId, cursor = null) => {
+  const params = new URLSearchParams({ limit: String(DRESS_PAGE_SIZE) });
+  if (cursor) {
+    params.set('cursor', cursor);
+  }
+  const response = await fetch(`/api/stores/${encodeURIComponent(storeId)}/dresses?${params}`);
+  if (!response.ok) {
+    throw new Error('Unable to load dress photos.');
+  }
+  const data = await response.json();
+  return {
+    photos: Array.isArray(data.photos) ? data.photos : [],
+    nextCursor: data.next_cursor || null,
+  };
+};
+
+const loadNextDressPage = (storeId) => {
+  if (dressPageRequest) {
+    return dressPageRequest;
+  }
+  const cursor = currentDressNextCursor;
+  dressPageRequest = fetchStoreDressPage(storeId, cursor)
+    .then((page) => {
+      if (storeId !== selectedStoreId || cursor !== currentDressNextCursor) {
+        return;
+      }
+      currentDressNextCursor = page.nextCursor;
+      const loadedPaths = new Set(currentDressPhotos.map((photo) => photo.photo_path));
+      renderDetailsGallery(
+        [...currentDressPhotos, ...page.photos.filter((photo) => !loadedPaths.has(photo.photo_path))],
+        storeId,
+      );
+    })
+    .catch(() => {
+      setDressPhotoMessage('Unable to load more photos right now.', 'error');
+    })
+    .finally(() => {
+      dressPageRequest = null;
+    });
+  return dressPageRequest;
+};
+
 const getCurrentDressPhoto = () => currentDressPhotos.find((photo) => photo.photo_path === selectedDressPhotoPath) || null;
 
 const selectDressPhoto = (photoPath) => {
@@ -865,7 +850,25 @@ const renderDetailsGallery = (dressPhotos, storeId) => {
     image.src = photoUrl;
     image.alt = `Dress ${index + 1}`;
 
-    previewButton.appendChild(image);
+    const srcset = photo.srcset || {};
+    if (srcset.webp || srcset.jpg) {
+      const picture = document.createElement('picture');
+      if (srcset.webp) {
+        const webpSource = document.createElement('source');
+        webpSource.type = 'image/webp';
+        webpSource.srcset = srcset.webp;
+        webpSource.sizes = '160px';
+        picture.appendChild(webpSource);
+      }
+      if (srcset.jpg) {
+        image.srcset = srcset.jpg;
+        image.sizes = '160px';
+      }
+      picture.appendChild(image);
+      previewButton.appendChild(picture);
+    } else {
+      previewButton.appendChild(image);
+    }
     previewButton.addEventListener('click', () => {
       selectDressPhoto(photoUrl);
       const allButtons = detailMiniatures.querySelectorAll('.store-miniature-button');
@@ -892,6 +895,29 @@ const renderDetailsGallery = (dressPhotos, storeId) => {
 
     detailMiniatures.appendChild(tile);
   });
+
+  if (currentDressNextCursor) {
+    const moreButton = document.createElement('button');
+    moreButton.type = 'button';
+    moreButton.className = 'text-link dress-more-button';
+    moreButton.textContent = 'Show more pictures';
+    moreButton.addEventListener('click', () => {
+      moreButton.disabled = true;
+      loadNextDressPage(storeId);
+    });
+    detailMiniatures.appendChild(moreButton);
+  }
+};
+
+const setDetailsPhotoCount = (count) => {
+  if (detailsPhotoCount) {
+    detailsPhotoCount.textContent = `${count} picture${count === 1 ? '' : 's'}`;
+  }
+};
+
+const applyDressPhotoChange = (dressPhotos, photoCount, storeId) => {
+  setDetailsPhotoCount(photoCount);
+  renderDetailsGallery(dressPhotos, storeId);
 };
 
 const updateDetailsSummary = (store) => {
@@ -936,12 +962,11 @@ const updateDetailsSummary = (store) => {
     return;
   }
 
-  const dressPhotos = Array.isArray(store.dress_photos) ? store.dress_photos : [];
   const currentUser = getSessionUser();
   activeStoreCanManagePhotos = Boolean(currentUser && store.owner_email === currentUser);
   detailsName.textContent = store.name || '';
   detailsAddress.textContent = store.location || '';
-  detailsPhotoCount.textContent = `${dressPhotos.length} picture${dressPhotos.length === 1 ? '' : 's'}`;
+  setDetailsPhotoCount(store.photo_count || 0);
   if (detailsOwner) {
     detailsOwner.textContent = `Owner: ${store.owner_email || ''}`;
   }
@@ -983,7 +1008,10 @@ const updateDetailsSummary = (store) => {
   } else {
     setSessionMessage('', '');
   }
-  renderDetailsGallery(dressPhotos, String(store.id));
+  // The gallery is filled by loadNextDressPage once the first page of photos arrives.
+  selectedStoreId = String(store.id);
+  currentDressPhotos = [];
+  currentDressNextCursor = null;
 };
 
 const loadStoreDetailsPage = async () => {
@@ -1012,7 +1040,7 @@ const loadStoreDetailsPage = async () => {
   }
 
   try {
-    const response = await fetch(`/api/stores?owner=${encodeURIComponent(currentUser)}`);
+    const response = await fetch(`/api/stores?owner=${encodeURIComponent(currentUser)}&photos=0`);
     if (!response.ok) {
       updateDetailsSummary(null);
       return;
@@ -1022,6 +1050,9 @@ const loadStoreDetailsPage = async () => {
     const stores = Array.isArray(data.stores) ? data.stores : [];
     const store = stores.find((candidate) => String(candidate.id) === storeId);
     updateDetailsSummary(store || null);
+    if (store) {
+      await loadNextDressPage(String(store.id));
+    }
   } catch (error) {
     updateDetailsSummary(null);
   }
@@ -1057,8 +1088,13 @@ if (dressPhotoForm) {
         return;
       }
 
-      const store = await response.json();
-      updateDetailsSummary(store);
+      const data = await response.json();
+      // Re-uploading an existing image returns that photo, so drop the old entry before prepending.
+      applyDressPhotoChange(
+        [data.photo, ...currentDressPhotos.filter((photo) => photo.photo_path !== data.photo.photo_path)],
+        data.photo_count,
+        storeId,
+      );
       if (dressPhotoInput) {
         dressPhotoInput.value = '';
       }
@@ -1107,8 +1143,12 @@ if (dressMetadataForm) {
         setDressMetadataMessage(errorData.error || 'Unable to save metadata right now.', 'error');
         return;
       }
-      const store = await response.json();
-      updateDetailsSummary(store);
+      const data = await response.json();
+      applyDressPhotoChange(
+        currentDressPhotos.map((photo) => (photo.photo_path === data.photo.photo_path ? data.photo : photo)),
+        currentDressPhotos.length,
+        selectedStoreId,
+      );
       setDressMetadataMessage('Metadata saved.', 'success');
     } catch (error) {
       setDressMetadataMessage('Unable to save metadata right now.', 'error');
@@ -1321,11 +1361,7 @@ if (storeForm && storeGrid) {
     tile.dataset.location = store.location;
     tile.dataset.manager = `Owner: ${store.owner_email}`;
     tile.dataset.invite = store.invite_code;
-    const dressPhotos = Array.isArray(store.dress_photos) ? store.dress_photos : [];
-    const photoUrls = dressPhotos
-      .map((photo) => photo?.photo_path)
-      .filter((photoPath) => typeof photoPath === 'string' && photoPath.trim());
-    tile.dataset.photoUrls = JSON.stringify(photoUrls);
+    tile.dataset.photoCount = String(store.photo_count || 0);
     tile.dataset.photoUrl = store.dress_photo_url || 'images/default-dress.svg';
     if (store.id) {
       tile.dataset.storeId = store.id;
@@ -1364,7 +1400,7 @@ if (storeForm && storeGrid) {
       return;
     }
     try {
-      const response = await fetch(`/api/stores?owner=${encodeURIComponent(owner)}`);
+      const response = await fetch(`/api/stores?owner=${encodeURIComponent(owner)}&photos=0`);
       if (!response.ok) {
         return;
       }
@@ -1488,7 +1524,6 @@ const renderAdminTagOptions = (container, selectedTags = []) => {
   }
   container.innerHTML = '';
   const options = tagOptions;
-  const locale = getActiveLocale();
   if (!options || !Array.isArray(options.categories)) {
     container.textContent = 'Tag options unavailable.';
     return;
@@ -1497,7 +1532,7 @@ const renderAdminTagOptions = (container, selectedTags = []) => {
     const fieldset = document.createElement('fieldset');
     fieldset.className = 'dress-tag-category';
     const legend = document.createElement('legend');
-    legend.textContent = getLocalizedValue(category.label, locale, options.defaultLocale || 'en') || category.id;
+    legend.textContent = category.label;
     fieldset.appendChild(legend);
     const group = document.createElement('div');
     group.className = 'dress-tag-group';
@@ -1509,7 +1544,7 @@ const renderAdminTagOptions = (container, selectedTags = []) => {
       checkbox.value = tag.id;
       checkbox.checked = selectedTags.includes(tag.id);
       const text = document.createElement('span');
-      text.textContent = getLocalizedValue(tag.label, locale, options.defaultLocale || 'en') || tag.id;
+      text.textContent = tag.label;
       label.appendChild(checkbox);
       label.appendChild(text);
       group.appendChild(label);
@@ -1627,8 +1662,15 @@ if (sessionRankingPrev) {
 }
 
 if (sessionRankingNext) {
-  sessionRankingNext.addEventListener('click', () => {
+  sessionRankingNext.addEventListener('click', async () => {
+    if (rankedStoreDressIndex >= rankedStoreDressTotal - 1) {
+      return;
+    }
+    if (rankedStoreDressIndex >= rankedStoreDresses.length - 1) {
+      await loadNextRankingPage();
+    }
     if (rankedStoreDressIndex >= rankedStoreDresses.length - 1) {
+      renderRankedStoreDress();
       return;
     }
     rankedStoreDressIndex += 1;
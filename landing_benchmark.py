@@ -0,0 +1,1052 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import http.client
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import timeit
+import zlib
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent
+WORKSPACE_FILES = ("index.html", "app.js", "styles.css", "landing-content.json", "tag-options.json")
+BENCH_EMAIL_DOMAIN = "bench.test"
+MULTIPART_BOUNDARY = "landing-benchmark-boundary"
+UPLOAD_STORE_NAME = "Benchmark upload target"
+PAGE_LOAD_NAME = "GET /details page load"
+REPEAT_VISIT_NAME = "GET /details repeat visit"
+BROWSER_HEADERS = {"Accept-Encoding": "gzip"}
+COMPRESSION_ENCODINGS = {"identity": "identity", "compressed": "br, gzip"}
+LARGE_FILE_NAME = "GET large photo"
+LARGE_FILE_PATH = "images/bench-large-photo.jpg"
+IMPORT_NAME = "POST photo import"
+DISPATCH_NAME = "route dispatch"
+DISPATCH_STATIC_PATHS = ("/app.js", "/images/hero.svg")
+INSTRUMENTATION_NAME = "instrumentation overhead"
+
+
+def make_png(seed: int, size: int = 8) -> bytes:
+    # Tiny but valid and unique per seed, so every upload is a new blob.
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    pixel = struct.pack(">I", seed & 0xFFFFFFFF)[1:]
+    row = b"\x00" + pixel * size
+    header = struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", header)
+        + chunk(b"tEXt", b"seed\x00" + str(seed).encode())
+        + chunk(b"IDAT", zlib.compress(row * size))
+        + chunk(b"IEND", b"")
+    )
+
+
+def make_svg(seed: int) -> bytes:
+    color = f"#{seed * 2654435761 & 0xFFFFFF:06x}"
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="60" height="90">'
+        f'<rect width="60" height="90" fill="{color}"/><!-- {seed} --></svg>'
+    ).encode("utf-8")
+
+
+def build_multipart(fields: dict[str, str], files: list[tuple[str, str, bytes]]) -> tuple[bytes, str]:
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{MULTIPART_BOUNDARY}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode()
+        )
+    for name, filename, content in files:
+        parts.append(
+            (
+                f"--{MULTIPART_BOUNDARY}\r\n"
+                f'Content-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                "Content-Type: application/octet-stream\r\n\r\n"
+            ).encode()
+            + content
+            + b"\r\n"
+        )
+    parts.append(f"--{MULTIPART_BOUNDARY}--\r\n".encode())
+    return b"".join(parts), f"multipart/form-data; boundary={MULTIPART_BOUNDARY}"
+
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def git_revision() -> str | None:
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=REPO_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return f"{revision}-dirty" if dirty else revision
+
+
+def prepare_workspace(workspace: Path, server_path: Path) -> None:
+    # The server derives every path from its own location, so a copy keeps the real tree untouched.
+    shutil.copy2(server_path, workspace / "landing_server.py")
+    for name in WORKSPACE_FILES:
+        shutil.copy2(REPO_DIR / name, workspace / name)
+    shutil.copytree(
+        REPO_DIR / "images", workspace / "images", ignore=shutil.ignore_patterns("stores", "blobs")
+    )
+
+
+def load_server(workspace: Path, access_log: str, metrics: str = "on"):
+    os.environ["LANDING_ACCESS_LOG"] = access_log
+    os.environ["LANDING_METRICS"] = "1" if metrics == "on" else "0"
+    sys.path.insert(0, str(workspace))
+    import landing_server
+
+    if Path(landing_server.__file__).resolve().parent != workspace.resolve():
+        raise RuntimeError(f"landing_server was already imported from {landing_server.__file__}")
+    return landing_server
+
+
+def load_tag_ids(server) -> list[str]:
+    return [tag["id"] for category in server.load_tag_options()["categories"] for tag in category["tags"]]
+
+
+def wait_for_image_jobs(server, timeout: float = 600.0) -> None:
+    deadline = time.monotonic() + timeout
+    while server.image_job_stats()["queued"] > 0:
+        if time.monotonic() > deadline:
+            raise RuntimeError("Image jobs did not drain before the benchmark started.")
+        time.sleep(0.05)
+
+
+def seed_dataset(server, args: argparse.Namespace, rng: random.Random) -> dict:
+    server.init_db()
+    tag_ids = load_tag_ids(server)
+
+    default_dir = server.DEFAULT_DRESS_PHOTO_DIR
+    default_paths = []
+    for index in range(args.default_photos):
+        directory = default_dir / f"collection-{index % args.default_collections:02d}"
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"dress-{index:05d}.svg"
+        path.write_bytes(make_svg(index))
+        default_paths.append(path.relative_to(server.BASE_DIR).as_posix())
+    for photo_path in default_paths:
+        if rng.random() < args.default_tagged_fraction:
+            server.update_default_dress_metadata(photo_path, rng.sample(tag_ids, rng.randint(1, 4)))
+
+    stores = []
+    for store_index in range(args.stores):
+        owner = f"owner{store_index % args.owners}@{BENCH_EMAIL_DOMAIN}"
+        store = server.create_store(f"Bench Bridal {store_index}", f"City {store_index % 7}", owner)
+        for member_index in range(args.members_per_store):
+            server.join_store(store["invite_code"], f"member{store_index}-{member_index}@{BENCH_EMAIL_DOMAIN}")
+        upload_dir = server.get_store_photo_dir(store["id"])
+        staged = []
+        metadata = {}
+        for photo_index in range(args.photos_per_store):
+            filename = f"dress-{store_index}-{photo_index}.png"
+            seed = store_index * 1_000_000 + photo_index
+            staged.append(server.stage_import_file(io.BytesIO(make_png(seed)), filename, upload_dir))
+            metadata[filename] = {
+                "tags": rng.sample(tag_ids, rng.randint(2, 6)),
+                "price": float(rng.randrange(400, 6000, 50)),
+            }
+        result = server.import_store_dress_photos(store["id"], staged, metadata)
+        stores.append(
+            {
+                "id": store["id"],
+                "owner_email": owner,
+                "invite_code": store["invite_code"],
+                "photo_paths": [photo["photo_path"] for photo in result["imported"]],
+            }
+        )
+    upload_store = server.create_store(UPLOAD_STORE_NAME, "Upload City", f"uploader@{BENCH_EMAIL_DOMAIN}")
+    wait_for_image_jobs(server)
+    # Older servers (--server) have no tag-options ETag; their revalidation route just expects a 200.
+    tag_options_response = getattr(server, "get_tag_options_response", None)
+    return {
+        "tag_ids": tag_ids,
+        "default_paths": default_paths,
+        "stores": stores,
+        "upload_store": {"id": upload_store["id"], "owner_email": upload_store["owner_email"]},
+        "uploaded_paths": [],
+        "tag_options_etag": tag_options_response("fr")[1] if tag_options_response else None,
+    }
+
+
+class Scenario:
+    def __init__(
+        self, name: str, build, expected=(200,), idempotent: bool = True, on_response=None, available=None
+    ) -> None:
+        self.name = name
+        self.build = build
+        self.expected = set(expected)
+        self.idempotent = idempotent
+        self.on_response = on_response
+        self.available = available
+
+
+def json_request(method: str, path: str, payload: dict) -> tuple[str, str, bytes, dict]:
+    return method, path, json.dumps(payload).encode("utf-8"), {"Content-Type": "application/json"}
+
+
+def build_scenarios(fixture: dict, rng: random.Random) -> list[Scenario]:
+    store = fixture["stores"][0]
+    store_id = store["id"]
+    tag_ids = fixture["tag_ids"]
+    upload_store = fixture["upload_store"]
+    uploaded = fixture["uploaded_paths"]
+    uploaded_lock = threading.Lock()
+    tag_options_etag = fixture["tag_options_etag"]
+    revalidate_headers = {"If-None-Match": f"W/{tag_options_etag}"} if tag_options_etag else {}
+    tag_pairs = [rng.sample(tag_ids, 2) for _ in range(64)]
+    preferences = [
+        {
+            "likes": [rng.sample(tag_ids, 3) for _ in range(rng.randint(3, 12))],
+            "dislikes": [rng.sample(tag_ids, 3) for _ in range(rng.randint(1, 6))],
+        }
+        for _ in range(64)
+    ]
+
+    def get(path: str):
+        return lambda index: ("GET", path, None, {})
+
+    def record_upload(index: int, status: int, payload: bytes) -> None:
+        if status == 200:
+            with uploaded_lock:
+                uploaded.append(json.loads(payload)["photo"]["photo_path"])
+
+    def upload(index: int):
+        body, content_type = build_multipart(
+            {"owner_email": upload_store["owner_email"]},
+            [("dress_photo", f"upload-{index}.png", make_png(900_000_000 + index, size=16))],
+        )
+        return "POST", f"/api/stores/{upload_store['id']}/dress-photo", body, {"Content-Type": content_type}
+
+    def delete(index: int):
+        with uploaded_lock:
+            photo_path = uploaded.pop()
+        return json_request(
+            "DELETE",
+            f"/api/stores/{upload_store['id']}/dress-photo",
+            {"owner_email": upload_store["owner_email"], "photo_path": photo_path},
+        )
+
+    return [
+        Scenario("GET /", get("/")),
+        Scenario("GET /?lang=fr", get("/?lang=fr")),
+        Scenario("GET /stores", get("/stores")),
+        Scenario("GET /stores/details", get("/stores/details")),
+        Scenario("GET /app.js (static)", get("/app.js")),
+        Scenario("GET /api/stores?owner=", get(f"/api/stores?owner={store['owner_email']}")),
+        Scenario("GET /api/default-dress-photos", get("/api/default-dress-photos")),
+        Scenario("GET /api/default-dress-metadata", get("/api/default-dress-metadata")),
+        Scenario(
+            "GET /api/default-dress-metadata?tag=",
+            lambda index: ("GET", f"/api/default-dress-metadata?tag={tag_pairs[index % 64][0]}", None, {}),
+        ),
+        Scenario("GET /api/sessions/deck", get("/api/sessions/deck")),
+        Scenario("GET /api/tag-options", get("/api/tag-options")),
+        Scenario("GET /api/tag-options?lang=fr", get("/api/tag-options?lang=fr")),
+        Scenario(
+            "GET /api/tag-options?lang=fr (If-None-Match)",
+            lambda index: ("GET", "/api/tag-options?lang=fr", None, revalidate_headers),
+            expected=(304,) if tag_options_etag else (200,),
+        ),
+        Scenario("GET /api/stores/{id}/dresses", get(f"/api/stores/{store_id}/dresses")),
+        Scenario(
+            "GET /api/stores/{id}/dresses?tag=&tag=",
+            lambda index: (
+                "GET",
+                f"/api/stores/{store_id}/dresses?tag={tag_pairs[index % 64][0]}&tag={tag_pairs[index % 64][1]}",
+                None,
+                {},
+            ),
+        ),
+        Scenario(
+            "POST /api/stores/{id}/rank",
+            lambda index: json_request("POST", f"/api/stores/{store_id}/rank", preferences[index % 64]),
+        ),
+        Scenario("GET /api/image-jobs", get("/api/image-jobs")),
+        Scenario(
+            "POST /api/stores",
+            lambda index: json_request(
+                "POST",
+                "/api/stores",
+                {"name": f"Walk-in {index}", "location": "Bench", "owner_email": f"new{index}@{BENCH_EMAIL_DOMAIN}"},
+            ),
+            expected=(201,),
+            idempotent=False,
+        ),
+        Scenario(
+            "POST /api/stores/join",
+            lambda index: json_request(
+                "POST",
+                "/api/stores/join",
+                {
+                    "invite_code": fixture["stores"][index % len(fixture["stores"])]["invite_code"],
+                    "member_email": f"walkin{index}@{BENCH_EMAIL_DOMAIN}",
+                },
+            ),
+            idempotent=False,
+        ),
+        Scenario(
+            "PUT /api/stores/{id}/dress-photo-metadata",
+            lambda index: json_request(
+                "PUT",
+                f"/api/stores/{store_id}/dress-photo-metadata",
+                {
+                    "owner_email": store["owner_email"],
+                    "photo_path": store["photo_paths"][index % len(store["photo_paths"])],
+                    "tags": tag_pairs[index % 64],
+                    "price": 500 + index % 40 * 25,
+                },
+            ),
+            idempotent=False,
+        ),
+        Scenario(
+            "POST /api/stores/{id}/dress-photo (upload)",
+            upload,
+            # A full derivative queue answers 503 by design; it is reported, not treated as a failure.
+            expected=(200, 503),
+            idempotent=False,
+            on_response=record_upload,
+        ),
+        Scenario(
+            "DELETE /api/stores/{id}/dress-photo",
+            delete,
+            idempotent=False,
+            available=lambda: len(uploaded),
+        ),
+    ]
+
+
+class StatCounter:
+    # Path.exists() and Path.is_file() call os.stat(), so one wrapper counts every probe.
+    def __init__(self) -> None:
+        self.calls = 0
+        self.lock = threading.Lock()
+        self.original = os.stat
+
+    def counting_stat(self, *args, **kwargs):
+        with self.lock:
+            self.calls += 1
+        return self.original(*args, **kwargs)
+
+    def __enter__(self) -> StatCounter:
+        os.stat = self.counting_stat
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        os.stat = self.original
+
+
+def run_scenario(
+    port: int, scenario: Scenario, requests: int, concurrency: int, timeout: float = 120.0
+) -> dict:
+    counter = itertools.count()
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    received = [0]
+    lock = threading.Lock()
+    failures: list[str] = []
+
+    def worker() -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=timeout)
+        try:
+            while (index := next(counter)) < requests:
+                method, path, body, headers = scenario.build(index)
+                started = time.perf_counter()
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                payload = response.read()
+                elapsed = time.perf_counter() - started
+                if scenario.on_response is not None:
+                    scenario.on_response(index, response.status, payload)
+                with lock:
+                    latencies.append(elapsed)
+                    statuses[str(response.status)] = statuses.get(str(response.status), 0) + 1
+                    received[0] += len(payload)
+        except (OSError, http.client.HTTPException) as error:
+            with lock:
+                failures.append(f"{type(error).__name__}: {error}")
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, concurrency))]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+    latencies.sort()
+    errors = sum(count for status, count in statuses.items() if int(status) not in scenario.expected)
+    return {
+        "requests": len(latencies),
+        "errors": errors + len(failures),
+        "statuses": statuses,
+        "connection_failures": failures[:5],
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "body_bytes_per_request": round(received[0] / len(latencies)) if latencies else 0,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+            "p50": round(percentile(latencies, 0.50) * 1000, 3),
+            "p90": round(percentile(latencies, 0.90) * 1000, 3),
+            "p99": round(percentile(latencies, 0.99) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+        },
+    }
+
+
+def with_accept_encoding(scenario: Scenario, encoding: str) -> Scenario:
+    def build(index: int):
+        method, path, body, headers = scenario.build(index)
+        return method, path, body, {**headers, "Accept-Encoding": encoding}
+
+    return Scenario(scenario.name, build, scenario.expected, scenario.idempotent, scenario.on_response)
+
+
+def run_compression_comparison(
+    port: int, scenario: Scenario, requests: int, warmup: int, concurrency: int, timeout: float
+) -> dict:
+    # The client threads share this process, but they do the same work for both encodings,
+    # so the CPU difference between the runs is what compressing costs the server.
+    comparison = {}
+    for label, encoding in COMPRESSION_ENCODINGS.items():
+        variant = with_accept_encoding(scenario, encoding)
+        if warmup:
+            run_scenario(port, variant, warmup, concurrency, timeout)
+        cpu_started = time.process_time()
+        stats = run_scenario(port, variant, requests, concurrency, timeout)
+        cpu = time.process_time() - cpu_started
+        comparison[label] = {
+            "body_bytes_per_request": stats["body_bytes_per_request"],
+            "cpu_ms_per_request": round(cpu / requests * 1000, 3) if requests else 0.0,
+            "p50_ms": stats["latency_ms"]["p50"],
+            "errors": stats["errors"],
+        }
+    identity = comparison["identity"]["body_bytes_per_request"]
+    compressed = comparison["compressed"]["body_bytes_per_request"]
+    comparison["bytes_saved"] = round(1 - compressed / identity, 3) if identity else 0.0
+    comparison["errors"] = comparison["identity"]["errors"] + comparison["compressed"]["errors"]
+    return comparison
+
+
+def run_large_file_comparison(server, port: int, args: argparse.Namespace, rng: random.Random) -> dict:
+    size = int(args.large_file_mb * 1024 * 1024)
+    (server.BASE_DIR / LARGE_FILE_PATH).write_bytes(rng.randbytes(size))
+    scenario = Scenario(LARGE_FILE_NAME, lambda index: ("GET", "/" + LARGE_FILE_PATH, None, {}))
+    # Servers from before the switch only have the sendfile path.
+    modes = (True, False) if hasattr(server, "SENDFILE_ENABLED") else (True,)
+    comparison = {"bytes": size, "clients": args.large_file_clients}
+    try:
+        for enabled in modes:
+            server.SENDFILE_ENABLED = enabled
+            run_scenario(port, scenario, args.large_file_clients, args.large_file_clients, args.timeout)
+            cpu_started = time.process_time()
+            stats = run_scenario(
+                port, scenario, args.large_file_requests, args.large_file_clients, args.timeout
+            )
+            cpu = time.process_time() - cpu_started
+            comparison["sendfile" if enabled else "copy"] = {
+                "requests": stats["requests"],
+                "errors": stats["errors"],
+                "mb_per_second": round(stats["throughput_rps"] * size / 1024 / 1024, 1),
+                "cpu_ms_per_request": round(cpu / stats["requests"] * 1000, 3) if stats["requests"] else 0.0,
+                "latency_ms": stats["latency_ms"],
+            }
+    finally:
+        if hasattr(server, "SENDFILE_ENABLED"):
+            server.SENDFILE_ENABLED = True
+    comparison["errors"] = sum(comparison[mode]["errors"] for mode in ("sendfile", "copy") if mode in comparison)
+    return comparison
+
+
+def upload_photos_one_by_one(port: int, store: dict, files: list[tuple[str, bytes]], args) -> dict:
+    # A 503 means the image queue is full; like a client honouring Retry-After, retry once it drains.
+    counter = itertools.count()
+    statuses: dict[str, int] = {}
+    retries = [0]
+    lock = threading.Lock()
+
+    def worker() -> None:
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=args.timeout)
+        try:
+            while (index := next(counter)) < len(files):
+                body, content_type = build_multipart(
+                    {"owner_email": store["owner_email"]}, [("dress_photo", *files[index])]
+                )
+                while True:
+                    conn.request(
+                        "POST", f"/api/stores/{store['id']}/dress-photo", body=body,
+                        headers={"Content-Type": content_type},
+                    )
+                    response = conn.getresponse()
+                    response.read()
+                    if response.status != 503:
+                        break
+                    with lock:
+                        retries[0] += 1
+                    time.sleep(0.05)
+                with lock:
+                    statuses[str(response.status)] = statuses.get(str(response.status), 0) + 1
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(max(1, args.concurrency))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {"statuses": statuses, "retries": retries[0]}
+
+
+def run_import_comparison(server, port: int, args: argparse.Namespace) -> dict:
+    # Separate seeds per method, so neither run reuses the other's blobs or derivatives.
+    comparison = {"photos": args.import_photos}
+    for method, seed in (("bulk", 800_000_000), ("per_file", 810_000_000)):
+        owner = f"importer-{method}@{BENCH_EMAIL_DOMAIN}"
+        store = server.create_store(f"Benchmark {method} import", "Import City", owner)
+        store = {"id": store["id"], "owner_email": owner}
+        files = [(f"import-{index}.png", make_png(seed + index, size=16)) for index in range(args.import_photos)]
+        wait_for_image_jobs(server)
+        started = time.perf_counter()
+        if method == "bulk":
+            body, content_type = build_multipart({}, [("dress_photos", *file) for file in files])
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=args.timeout)
+            try:
+                conn.request(
+                    "POST", f"/api/stores/{store['id']}/dress-photos/import?owner_email={owner}",
+                    body=body, headers={"Content-Type": content_type},
+                )
+                response = conn.getresponse()
+                response.read()
+            finally:
+                conn.close()
+            outcome = {"statuses": {str(response.status): 1}, "retries": 0}
+        else:
+            outcome = upload_photos_one_by_one(port, store, files, args)
+        uploaded = time.perf_counter() - started
+        wait_for_image_jobs(server)
+        ready = time.perf_counter() - started
+        comparison[method] = {
+            **outcome,
+            "errors": sum(count for status, count in outcome["statuses"].items() if status != "200"),
+            "upload_seconds": round(uploaded, 3),
+            "ready_seconds": round(ready, 3),
+            "photos_per_second": round(args.import_photos / uploaded, 1) if uploaded else 0.0,
+            "photo_count": server.count_store_dress_photos(store["id"]),
+        }
+    comparison["errors"] = comparison["bulk"]["errors"] + comparison["per_file"]["errors"]
+    return comparison
+
+
+def best_microseconds(func, iterations: int) -> float:
+    # Best of five, so a scheduler hiccup in one repeat does not count.
+    return round(min(timeit.repeat(func, number=iterations, repeat=5)) / iterations * 1_000_000, 3)
+
+
+def run_dispatch_benchmark(server, fixture: dict, iterations: int) -> dict:
+    # Times Router.resolve() alone: the urlparse() in front of it and the handler behind it are excluded.
+    router = server.LANDING_ROUTER
+    store_id = str(fixture["stores"][0]["id"])
+    groups: dict[str, list[tuple[str, str]]] = {"pages": [], "fixed API": [], "parameterised": [], "static": []}
+    for method, path in router.static:
+        groups["fixed API" if path.startswith("/api/") else "pages"].append((method, path))
+    for method, routes in router.dynamic.items():
+        groups["parameterised"].extend((method, path.replace("{store_id}", store_id)) for path, _ in routes)
+    groups["static"] = [("GET", path) for path in DISPATCH_STATIC_PATHS]
+    results = {}
+    for group, requests in groups.items():
+        timings = {
+            f"{method} {path}": best_microseconds(lambda: router.resolve(method, path), iterations)
+            for method, path in requests
+        }
+        results[group] = {
+            "mean_us": round(sum(timings.values()) / len(timings), 3) if timings else 0.0,
+            "max_us": max(timings.values(), default=0.0),
+            "paths": timings,
+        }
+    return results
+
+
+def run_instrumentation_benchmark(server, iterations: int) -> dict:
+    # Recorded under a route and cache name no real request uses, so /metrics stays readable.
+    def operation() -> None:
+        pass
+
+    timed_operation = server.timed(operation)
+    return {
+        "metrics_enabled": server.METRICS_ENABLED,
+        "timed_call_us": round(
+            max(0.0, best_microseconds(timed_operation, iterations) - best_microseconds(operation, iterations)), 3
+        ),
+        "record_request_us": best_microseconds(
+            lambda: server.record_request("GET", "benchmark", "200", 0.001, 0, 1024), iterations
+        ),
+        "record_cache_lookup_us": best_microseconds(
+            lambda: server.record_cache_lookup("benchmark", True), iterations
+        ),
+    }
+
+
+class BrowserConnection(http.client.HTTPConnection):
+    # http.client reconnects on its own when the server closes, so connect() counts every socket.
+    def __init__(self, port: int, timeout: float, opened: list[int], rtt: float) -> None:
+        super().__init__("127.0.0.1", port, timeout=timeout)
+        self.opened = opened
+        self.rtt = rtt
+
+    def connect(self) -> None:
+        self.opened[0] += 1
+        # Loopback has no round trip to speak of; charge the TCP handshake explicitly.
+        time.sleep(self.rtt)
+        super().connect()
+
+    def getresponse(self) -> http.client.HTTPResponse:
+        time.sleep(self.rtt)
+        return super().getresponse()
+
+
+def pick_photo_urls(payload: bytes) -> list[str]:
+    # The smallest derivative is what a tablet gallery fetches; the original is the fallback.
+    try:
+        photos = json.loads(payload).get("photos", [])
+    except ValueError:
+        return []
+    urls = []
+    for photo in photos:
+        srcset = photo.get("srcset") or {}
+        candidate = srcset.get("webp") or srcset.get("jpg")
+        urls.append(candidate.split(",")[0].split()[0] if candidate else photo["photo_path"])
+    return ["/" + url.lstrip("/") for url in urls]
+
+
+def count_response_bytes(response: http.client.HTTPResponse, body: bytes) -> int:
+    # Status line, header lines and the blank line as sent, plus the (still compressed) body.
+    headers = sum(len(name) + len(value) + 4 for name, value in response.getheaders())
+    return len(f"HTTP/1.1 {response.status} {response.reason}\r\n") + headers + 2 + len(body)
+
+
+def load_details_page(
+    port: int, store: dict, parallel: int, timeout: float, rtt: float, cache: dict | None = None
+) -> dict:
+    # With a cache, responses carrying validators are kept and revalidated like a browser would.
+    opened = [0]
+    connections: list[BrowserConnection] = []
+    statuses: dict[str, int] = {}
+    received = [0]
+    lock = threading.Lock()
+
+    def fetch_all(paths: list[str]) -> list[bytes]:
+        bodies: list[bytes] = [b""] * len(paths)
+        counter = itertools.count()
+        while len(connections) < min(parallel, len(paths)):
+            connections.append(BrowserConnection(port, timeout, opened, rtt))
+
+        def worker(connection: BrowserConnection) -> None:
+            while (index := next(counter)) < len(paths):
+                headers = dict(BROWSER_HEADERS)
+                cached = cache.get(paths[index]) if cache is not None else None
+                if cached:
+                    headers.update(cached["validators"])
+                size = 0
+                try:
+                    connection.request("GET", paths[index], headers=headers)
+                    response = connection.getresponse()
+                    body = response.read()
+                    size = count_response_bytes(response, body)
+                    if response.getheader("Content-Encoding") == "gzip":
+                        body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+                    status = str(response.status)
+                    if response.status == 304 and cached:
+                        body = cached["body"]
+                    elif cache is not None and response.status == 200:
+                        validators = {
+                            request_header: response.getheader(response_header)
+                            for request_header, response_header in (
+                                ("If-None-Match", "ETag"),
+                                ("If-Modified-Since", "Last-Modified"),
+                            )
+                            if response.getheader(response_header)
+                        }
+                        if validators:
+                            cache[paths[index]] = {"validators": validators, "body": body}
+                    bodies[index] = body
+                except (OSError, http.client.HTTPException) as error:
+                    connection.close()
+                    status = type(error).__name__
+                with lock:
+                    statuses[status] = statuses.get(status, 0) + 1
+                    received[0] += size
+
+        threads = [threading.Thread(target=worker, args=(connection,)) for connection in connections[: len(paths)]]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return bodies
+
+    # Same order as a browser: document, then its subresources, then app.js's awaited API calls, then the gallery.
+    started = time.perf_counter()
+    fetch_all([f"/details?store={store['id']}"])
+    fetch_all(["/styles.css", "/app.js"])
+    fetch_all(["/api/tag-options?lang=en"])
+    fetch_all([f"/api/stores?owner={store['owner_email']}&photos=0"])
+    dresses_body = fetch_all([f"/api/stores/{store['id']}/dresses?limit=50"])[0]
+    fetch_all(pick_photo_urls(dresses_body) if dresses_body else [])
+    elapsed = time.perf_counter() - started
+    for connection in connections:
+        connection.close()
+    return {"seconds": elapsed, "connections": opened[0], "statuses": statuses, "bytes": received[0]}
+
+
+def run_page_loads(
+    port: int, fixture: dict, loads: int, parallel: int, timeout: float, rtt: float = 0.0
+) -> dict:
+    store = fixture["stores"][0]
+    timings: list[float] = []
+    connections = 0
+    total_bytes = 0
+    statuses: dict[str, int] = {}
+    for _ in range(loads):
+        load = load_details_page(port, store, parallel, timeout, rtt)
+        timings.append(load["seconds"])
+        connections += load["connections"]
+        total_bytes += load["bytes"]
+        for status, count in load["statuses"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    timings.sort()
+    requests = sum(statuses.values())
+    return {
+        "loads": loads,
+        "requests_per_load": round(requests / loads, 1) if loads else 0.0,
+        "connections_per_load": round(connections / loads, 1) if loads else 0.0,
+        "errors": sum(count for status, count in statuses.items() if status != "200"),
+        "statuses": statuses,
+        "bytes_per_load": round(total_bytes / loads) if loads else 0,
+        "load_ms": {
+            "mean": round(sum(timings) / len(timings) * 1000, 3) if timings else 0.0,
+            "p50": round(percentile(timings, 0.50) * 1000, 3),
+            "p90": round(percentile(timings, 0.90) * 1000, 3),
+            "max": round(timings[-1] * 1000, 3) if timings else 0.0,
+        },
+    }
+
+
+def run_repeat_visit(port: int, fixture: dict, parallel: int, timeout: float) -> dict:
+    # The second load sends back the ETag / Last-Modified of every cached response.
+    store = fixture["stores"][0]
+    cache: dict[str, dict] = {}
+    visits = {}
+    for visit in ("first", "repeat"):
+        load = load_details_page(port, store, parallel, timeout, 0.0, cache)
+        visits[visit] = {
+            "requests": sum(load["statuses"].values()),
+            "bytes": load["bytes"],
+            "statuses": load["statuses"],
+        }
+    return {
+        **visits,
+        "errors": sum(
+            count
+            for visit in visits.values()
+            for status, count in visit["statuses"].items()
+            if status not in ("200", "304")
+        ),
+    }
+
+
+def print_results(results: dict, baseline: dict | None) -> None:
+    print(f"{'route':46} {'rps':>9} {'p50 ms':>9} {'p90 ms':>9} {'p99 ms':>9} {'errors':>7}")
+    for name, stats in results["routes"].items():
+        latency = stats["latency_ms"]
+        line = (
+            f"{name:46} {stats['throughput_rps']:9.1f} {latency['p50']:9.3f} "
+            f"{latency['p90']:9.3f} {latency['p99']:9.3f} {stats['errors']:7d}"
+        )
+        previous = (baseline or {}).get("routes", {}).get(name)
+        if previous and previous["throughput_rps"] and previous["latency_ms"]["p50"]:
+            rps_change = stats["throughput_rps"] / previous["throughput_rps"] - 1
+            p50_change = latency["p50"] / previous["latency_ms"]["p50"] - 1
+            line += f"   rps {rps_change:+.1%}  p50 {p50_change:+.1%}"
+        if "stat_calls_per_request" in stats:
+            line += f"   stat() {stats['stat_calls_per_request']:g}/request"
+        print(line)
+    for name, comparison in results.get("compression", {}).items():
+        identity, compressed = comparison["identity"], comparison["compressed"]
+        print(
+            f"{name} compression: {identity['body_bytes_per_request']} -> "
+            f"{compressed['body_bytes_per_request']} bytes/request ({comparison['bytes_saved']:.1%} saved), "
+            f"CPU {identity['cpu_ms_per_request']:.3f} -> {compressed['cpu_ms_per_request']:.3f} ms/request, "
+            f"errors {comparison['errors']}"
+        )
+    large_file = results.get("large_file")
+    for mode in ("sendfile", "copy"):
+        if large_file and mode in large_file:
+            stats = large_file[mode]
+            print(
+                f"{LARGE_FILE_NAME} ({large_file['bytes'] / 1024 / 1024:g} MB, {large_file['clients']} clients, "
+                f"{mode}): {stats['mb_per_second']:.1f} MB/s, p50 {stats['latency_ms']['p50']:.1f} ms, "
+                f"p99 {stats['latency_ms']['p99']:.1f} ms, CPU {stats['cpu_ms_per_request']:.3f} ms/request, "
+                f"errors {stats['errors']}"
+            )
+    imports = results.get("import")
+    for method in ("bulk", "per_file") if imports else ():
+        stats = imports[method]
+        print(
+            f"{IMPORT_NAME} ({imports['photos']} photos, {method.replace('_', '-')}): "
+            f"uploaded in {stats['upload_seconds']:.2f}s ({stats['photos_per_second']:.1f} photos/s), "
+            f"derivatives ready after {stats['ready_seconds']:.2f}s, {stats['retries']} retries, "
+            f"errors {stats['errors']}"
+        )
+    for group, stats in results.get("dispatch", {}).items():
+        print(
+            f"{DISPATCH_NAME} ({group}, {len(stats['paths'])} paths): "
+            f"mean {stats['mean_us']:.3f} us, max {stats['max_us']:.3f} us per resolve"
+        )
+    instrumentation = results.get("instrumentation")
+    if instrumentation:
+        print(
+            f"{INSTRUMENTATION_NAME} (metrics {'on' if instrumentation['metrics_enabled'] else 'off'}): "
+            f"@timed call {instrumentation['timed_call_us']:.3f} us, "
+            f"request record {instrumentation['record_request_us']:.3f} us, "
+            f"cache lookup record {instrumentation['record_cache_lookup_us']:.3f} us"
+        )
+    page_load = results.get("page_load")
+    if page_load:
+        load_ms = page_load["load_ms"]
+        line = (
+            f"{PAGE_LOAD_NAME}: {page_load['loads']} loads, {page_load['requests_per_load']} requests and "
+            f"{page_load['connections_per_load']} connections per load, "
+            f"mean {load_ms['mean']:.1f} ms, p90 {load_ms['p90']:.1f} ms, errors {page_load['errors']}"
+        )
+        previous = (baseline or {}).get("page_load")
+        if previous and previous["load_ms"]["mean"]:
+            line += f"   mean {load_ms['mean'] / previous['load_ms']['mean'] - 1:+.1%}"
+        print(line)
+    repeat_visit = results.get("repeat_visit")
+    if repeat_visit:
+        first, repeat = repeat_visit["first"], repeat_visit["repeat"]
+        line = (
+            f"{REPEAT_VISIT_NAME}: first {first['bytes']} bytes in {first['requests']} requests, "
+            f"repeat {repeat['bytes']} bytes ({repeat['statuses'].get('304', 0)} of "
+            f"{repeat['requests']} answered 304), errors {repeat_visit['errors']}"
+        )
+        previous = (baseline or {}).get("repeat_visit")
+        if previous and previous["repeat"]["bytes"]:
+            line += f"   repeat bytes {repeat['bytes'] / previous['repeat']['bytes'] - 1:+.1%}"
+        print(line)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Seed a throwaway copy of the landing server and benchmark every route."
+    )
+    parser.add_argument("--server", type=Path, default=REPO_DIR / "landing_server.py",
+                        help="landing_server.py to benchmark, e.g. one extracted with git show.")
+    parser.add_argument("--output", type=Path, help="Write JSON results here (default: benchmark-results/<commit>.json).")
+    parser.add_argument("--compare", type=Path, help="Earlier JSON results to print changes against.")
+    parser.add_argument("--mode", default="threaded", help="Server mode passed to build_server (threaded, single or asyncio).")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=400, help="Measured requests per read route.")
+    parser.add_argument("--write-requests", type=int, default=200, help="Measured requests per write route.")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests before each read route.")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument(
+        "--idle-connections", type=int, default=0,
+        help="Connections held open without sending a request while routes are measured.",
+    )
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client socket timeout in seconds.")
+    parser.add_argument(
+        "--page-loads", type=int, default=20,
+        help="Simulated browser loads of /details (HTML, CSS, JS, API calls, photos); 0 skips them.",
+    )
+    parser.add_argument(
+        "--browser-connections", type=int, default=6, help="Parallel connections per simulated browser."
+    )
+    parser.add_argument(
+        "--simulated-rtt-ms", type=float, default=0.0,
+        help="Network round trip added per request and per new connection in page loads.",
+    )
+    parser.add_argument("--stores", type=int, default=20)
+    parser.add_argument("--owners", type=int, default=5)
+    parser.add_argument("--members-per-store", type=int, default=3)
+    parser.add_argument("--photos-per-store", type=int, default=250)
+    parser.add_argument("--default-photos", type=int, default=2000)
+    parser.add_argument("--default-collections", type=int, default=20)
+    parser.add_argument("--default-tagged-fraction", type=float, default=0.5)
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--route", action="append", help="Only run routes whose name contains this text.")
+    parser.add_argument(
+        "--count-stat-calls", action="store_true",
+        help="Count os.stat() calls (including Path.exists/is_file) made while each route runs.",
+    )
+    parser.add_argument(
+        "--large-file-requests", type=int, default=0,
+        help="Requests for one large static photo, served once with sendfile() and once copied; 0 skips it.",
+    )
+    parser.add_argument("--large-file-mb", type=float, default=5.0)
+    parser.add_argument("--large-file-clients", type=int, default=32)
+    parser.add_argument(
+        "--import-photos", type=int, default=0,
+        help="Photos imported into a new store in one bulk request and again one upload at a time; 0 skips it.",
+    )
+    parser.add_argument(
+        "--dispatch-iterations", type=int, default=0,
+        help="Time the route table's resolve() for every route, best of 5 x N calls; 0 skips it.",
+    )
+    parser.add_argument(
+        "--instrumentation-iterations", type=int, default=0,
+        help="Time @timed, record_request and record_cache_lookup, best of 5 x N calls; 0 skips it.",
+    )
+    parser.add_argument(
+        "--metrics", choices=("on", "off"), default="on",
+        help="Start the server with LANDING_METRICS on or off, e.g. to --compare the two runs.",
+    )
+    parser.add_argument(
+        "--compare-compression", action="store_true",
+        help="Also run each GET route with Accept-Encoding identity and br/gzip and report bytes and CPU per request.",
+    )
+    parser.add_argument("--access-log", choices=("off", "text", "json"), default="off")
+    parser.add_argument("--workspace", type=Path, help="Seed into this empty directory instead of a temp dir.")
+    parser.add_argument("--keep-workspace", action="store_true")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    rng = random.Random(args.seed)
+    workspace = args.workspace or Path(tempfile.mkdtemp(prefix="landing-bench-"))
+    workspace.mkdir(parents=True, exist_ok=True)
+    prepare_workspace(workspace, args.server.resolve())
+    server = load_server(workspace, args.access_log, args.metrics)
+    httpd = None
+    idle: list[socket.socket] = []
+    try:
+        seed_started = time.perf_counter()
+        fixture = seed_dataset(server, args, rng)
+        seed_seconds = time.perf_counter() - seed_started
+        print(
+            f"Seeded {args.stores} stores x {args.photos_per_store} photos and "
+            f"{args.default_photos} default photos in {seed_seconds:.1f}s ({workspace})"
+        )
+
+        httpd = server.build_server(0, args.mode, args.workers)
+        port = httpd.server_address[1]
+        threading.Thread(target=httpd.serve_forever, daemon=True).start()
+        idle = [socket.create_connection(("127.0.0.1", port)) for _ in range(args.idle_connections)]
+
+        revision = git_revision()
+        results = {
+            "meta": {
+                "revision": revision,
+                "server": str(args.server),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "started_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+                "seed_seconds": round(seed_seconds, 3),
+                "config": {key: str(value) if isinstance(value, Path) else value for key, value in vars(args).items()},
+            },
+            "routes": {},
+        }
+        for scenario in build_scenarios(fixture, rng):
+            if args.route and not any(text in scenario.name for text in args.route):
+                continue
+            if scenario.idempotent and args.warmup:
+                run_scenario(port, scenario, args.warmup, args.concurrency, args.timeout)
+            requests = args.requests if scenario.idempotent else args.write_requests
+            if scenario.available is not None:
+                requests = min(requests, scenario.available())
+            counter = StatCounter() if args.count_stat_calls else None
+            if counter is not None:
+                with counter:
+                    stats = run_scenario(port, scenario, requests, args.concurrency, args.timeout)
+                stats["stat_calls_per_request"] = round(counter.calls / requests, 2) if requests else 0.0
+            else:
+                stats = run_scenario(port, scenario, requests, args.concurrency, args.timeout)
+            results["routes"][scenario.name] = stats
+            wait_for_image_jobs(server)
+            if args.compare_compression and scenario.idempotent and scenario.build(0)[0] == "GET":
+                results.setdefault("compression", {})[scenario.name] = run_compression_comparison(
+                    port, scenario, requests, args.warmup, args.concurrency, args.timeout
+                )
+        if args.large_file_requests and (not args.route or any(text in LARGE_FILE_NAME for text in args.route)):
+            results["large_file"] = run_large_file_comparison(server, port, args, rng)
+        if args.import_photos and (not args.route or any(text in IMPORT_NAME for text in args.route)):
+            results["import"] = run_import_comparison(server, port, args)
+        # Servers from before the route table have nothing to time here.
+        if (
+            args.dispatch_iterations
+            and hasattr(server, "LANDING_ROUTER")
+            and (not args.route or any(text in DISPATCH_NAME for text in args.route))
+        ):
+            results["dispatch"] = run_dispatch_benchmark(server, fixture, args.dispatch_iterations)
+        if (
+            args.instrumentation_iterations
+            and hasattr(server, "record_request")
+            and (not args.route or any(text in INSTRUMENTATION_NAME for text in args.route))
+        ):
+            results["instrumentation"] = run_instrumentation_benchmark(server, args.instrumentation_iterations)
+        if args.page_loads and (not args.route or any(text in PAGE_LOAD_NAME for text in args.route)):
+            results["page_load"] = run_page_loads(
+                port,
+                fixture,
+                args.page_loads,
+                args.browser_connections,
+                args.timeout,
+                args.simulated_rtt_ms / 1000,
+            )
+        if args.page_loads and (not args.route or any(text in REPEAT_VISIT_NAME for text in args.route)):
+            results["repeat_visit"] = run_repeat_visit(port, fixture, args.browser_connections, args.timeout)
+
+        baseline = json.loads(args.compare.read_text("utf-8")) if args.compare else None
+        print_results(results, baseline)
+        output = args.output or REPO_DIR / "benchmark-results" / f"{revision or 'unknown'}.json"
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2) + "\n", "utf-8")
+        print(f"Wrote {output}")
+        errors = [stats["errors"] for stats in results["routes"].values()]
+        errors.append(results.get("page_load", {}).get("errors", 0))
+        errors.append(results.get("repeat_visit", {}).get("errors", 0))
+        errors.append(results.get("large_file", {}).get("errors", 0))
+        errors.append(results.get("import", {}).get("errors", 0))
+        errors.extend(comparison["errors"] for comparison in results.get("compression", {}).values())
+        return 1 if any(errors) else 0
+    finally:
+        for connection in idle:
+            connection.close()
+        if httpd is not None:
+            httpd.shutdown()
+            httpd.server_close()
+        server.shutdown_image_jobs()
+        if not args.keep_workspace and not args.workspace:
+            shutil.rmtree(workspace, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
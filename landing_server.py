@@ -1,26 +1,88 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import asyncio
+import base64
+import csv
+import functools
+import gzip
+import hashlib
+import heapq
 import html
+import io
 import json
+import multiprocessing
+import os
 import secrets
+import shutil
+import signal
+import socket
 import sqlite3
-from cgi import FieldStorage
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import unicodedata
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timezone
+from email.message import Message
+from email.utils import parsedate_to_datetime
 from http.server import SimpleHTTPRequestHandler
 from pathlib import Path
 import re
-from socketserver import TCPServer
+import select
+from bisect import bisect_left
+from collections import Counter, OrderedDict, defaultdict
+from socketserver import TCPServer, ThreadingMixIn
+from stat import S_ISREG
 from string import Template
 from urllib.parse import parse_qs, urlparse
 
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip.
+    brotli = None
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # Pillow is optional; uploads are served without derivatives.
+    Image = None
+    ImageOps = None
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; ranking falls back to sparse Python scoring.
+    numpy = None
+
+try:
+    import rcssmin
+    import rjsmin
+except ImportError:  # Only build-assets needs rjsmin/rcssmin; it refuses to run without them.
+    rcssmin = None
+    rjsmin = None
+
 BASE_DIR = Path(__file__).resolve().parent
 CONTENT_PATH = BASE_DIR / "landing-content.json"
 TAG_OPTIONS_PATH = BASE_DIR / "tag-options.json"
 TEMPLATE_PATH = BASE_DIR / "index.html"
+ASSET_BUILD_DIR = BASE_DIR / "build"
+ASSET_MANIFEST_PATH = ASSET_BUILD_DIR / "manifest.json"
+ASSET_SOURCES = ("app.js", "styles.css")
+ASSET_IMAGE_DIR = BASE_DIR / "images"
+ASSET_IMAGE_EXTENSIONS = {".png", ".jpg", ".jpeg", ".svg", ".webp"}
 DB_PATH = BASE_DIR / "stores.db"
 DEFAULT_DRESS_PHOTO_PATH = "images/default/default-dress.svg"
+DEFAULT_DRESS_PHOTO_CANDIDATES = tuple(
+    str(Path(path).with_suffix(suffix))
+    for path in (DEFAULT_DRESS_PHOTO_PATH, "images/default-dress.svg")
+    for suffix in (".svg", ".png", ".jpg", ".jpeg")
+)
 STORE_DRESS_PHOTO_BASE_DIR = BASE_DIR / "images" / "stores"
+PHOTO_BLOB_BASE_DIR = BASE_DIR / "images" / "blobs"
+DEFAULT_DRESS_PHOTO_DIR = BASE_DIR / "images" / "default"
 ALLOWED_DRESS_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp"}
 DEFAULT_SESSION_EXTENSIONS = {
     ".png",
@@ -33,10 +95,194 @@ DEFAULT_SESSION_EXTENSIONS = {
     ".bmp",
     ".jfif",
 }
+DERIVATIVE_WIDTHS = (320, 640, 1280)
+DERIVATIVE_FORMATS = {"webp": "WEBP", "jpg": "JPEG"}
+DERIVATIVE_QUALITY = 82
+IMAGE_JOB_WORKERS = int(os.environ.get("LANDING_IMAGE_WORKERS", "2"))
+IMAGE_JOB_QUEUE_LIMIT = int(os.environ.get("LANDING_IMAGE_QUEUE_LIMIT", "64"))
+IMAGE_JOB_STATS = {
+    "queued": 0,
+    "completed": 0,
+    "failed": 0,
+    "rejected": 0,
+    "total_seconds": 0.0,
+    "max_seconds": 0.0,
+}
+IMAGE_JOB_LOCK = threading.Lock()
+_image_job_executor: ProcessPoolExecutor | None = None
+MAX_UPLOAD_BYTES = int(os.environ.get("LANDING_MAX_UPLOAD_BYTES", str(64 * 1024 * 1024)))
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_MULTIPART_HEADER_BYTES = 16 * 1024
+MAX_MULTIPART_FIELD_BYTES = 64 * 1024
+MAX_IMPORT_BYTES = int(os.environ.get("LANDING_MAX_IMPORT_BYTES", str(256 * 1024 * 1024)))
+MAX_IMPORT_FILES = 5000
+IMPORT_TAGS_CSV_NAME = "tags.csv"
+STATIC_CACHE_CONTROL = "no-cache"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+IMMUTABLE_ASSET_PATTERN = re.compile(
+    r"(?:dress-[0-9a-f]{16}|[0-9a-f]{64}|[\w-]+\.[0-9a-f]{16})(?:-\d+w)?\.[a-z0-9]+"
+)
+STATIC_ETAGS: dict[str, tuple[tuple[int, int], str]] = {}
+STATIC_FILE_CACHE_LIMIT = 128
+SENDFILE_CHUNK_SIZE = 1024 * 1024
+# LANDING_SENDFILE=0 copies static files through user space instead, e.g. to compare the two.
+SENDFILE_ENABLED = os.environ.get("LANDING_SENDFILE", "1") != "0"
+BYTE_RANGE_PATTERN = re.compile(r"bytes=(\d*)-(\d*)")
+STATIC_ETAG_LOCK = threading.Lock()
+COMPRESSIBLE_CONTENT_TYPES = {
+    "application/javascript",
+    "application/json",
+    "image/svg+xml",
+    "text/css",
+    "text/html",
+    "text/javascript",
+    "text/plain",
+}
+COMPRESSION_MIN_BYTES = 1024
+COMPRESSION_CACHE_LIMIT = 256
+COMPRESSION_CACHE_MAX_BYTES = 32 * 1024 * 1024
+COMPRESSION_CACHE: OrderedDict[tuple, tuple[object, bytes]] = OrderedDict()
+COMPRESSION_CACHE_LOCK = threading.Lock()
+_compression_cache_bytes = 0
+# Directory mtimes this close to "now" may hide a same-tick change, so they are re-checked.
+DIRECTORY_INDEX_RACY_NS = 2_000_000_000
+DEFAULT_PHOTO_INDEX = {"dirs": {}, "photos": [], "photo_set": frozenset(), "version": 0}
+DEFAULT_PHOTO_INDEX_LOCK = threading.Lock()
+FALLBACK_PHOTO_CATEGORY = "General Style"
+FILE_PROBE_TTL = float(os.environ.get("LANDING_FILE_PROBE_TTL", "2"))
+FILE_PROBE_CACHE: dict[tuple[str, ...], tuple[float, str | None]] = {}
+FILE_PROBE_LOCK = threading.Lock()
+ASSET_MANIFEST = {"signature": None, "assets": {}}
+ASSET_MANIFEST_LOCK = threading.Lock()
+SESSION_DECK_CACHE = {"signature": None, "body": None}
+SESSION_DECK_LOCK = threading.Lock()
+TAG_OPTIONS_CACHE: dict = {"signature": None, "options": None, "locales": frozenset(), "views": {}}
+TAG_OPTIONS_LOCK = threading.Lock()
+STORE_TAG_INDEX: dict[int, dict] = {}
+STORE_TAG_INDEX_LOCK = threading.Lock()
+DRESS_PAGE_DEFAULT_LIMIT = 50
+SQLITE_MAX_INTEGER = 2**63 - 1
+DRESS_PAGE_MAX_LIMIT = 200
+RANKING_DEFAULT_LIMIT = 50
+# Unicode root-collation order of ASCII whitespace, punctuation and symbols; all sort before digits.
+COLLATION_SYMBOLS = "\t\n\v\f\r _-,;:!?.'\"()[]{}@*/\\&#%`^+<=>|~$"
+RANKING_MAX_LIMIT = 500
+RANKING_INDEX_CACHE_LIMIT = 64
+RANKING_INDEX_CACHE: OrderedDict[int, dict] = OrderedDict()
+RANKING_INDEX_LOCK = threading.Lock()
+SERVER_MODES = ("single", "threaded", "prefork", "asyncio")
+IDLE_CONNECTION_TIMEOUT = float(os.environ.get("LANDING_IDLE_TIMEOUT", "15"))
+KEEP_ALIVE_TIMEOUT = float(os.environ.get("LANDING_KEEPALIVE_TIMEOUT", "5"))
+KEEP_ALIVE_MAX_REQUESTS = int(os.environ.get("LANDING_KEEPALIVE_REQUESTS", "1000"))
+ASYNC_LISTEN_BACKLOG = 1024
+ASYNC_MAX_HEADER_BYTES = 64 * 1024
+ASYNC_BODY_BUFFER_BYTES = 64 * 1024
+ASYNC_WRITE_FLUSH_BYTES = 256 * 1024
+CONTENT_LENGTH_PATTERN = re.compile(rb"\r\ncontent-length:[ \t]*(\d+)[ \t]*\r\n", re.IGNORECASE)
+EXPECT_CONTINUE_PATTERN = re.compile(rb"\r\nexpect:[ \t]*100-continue", re.IGNORECASE)
+DEFAULT_SERVER_MODE = "threaded"
+DEFAULT_SERVER_WORKERS = 16
+DEFAULT_SERVER_PROCESSES = os.cpu_count() or 2
+PAGE_CACHE: dict[tuple[str, str], bytes] = {}
+PAGE_CACHE_STATS = {"hits": 0, "misses": 0}
+PAGE_CACHE_LOCK = threading.Lock()
+_page_cache_signature: tuple | None = None
+_page_cache_content: dict | None = None
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=67108864",
+    "PRAGMA temp_store=MEMORY",
+)
+SQLITE_STATEMENT_CACHE_SIZE = 256
+_db_local = threading.local()
+METRICS_ENABLED = os.environ.get("LANDING_METRICS", "1") != "0"
+ACCESS_LOG_FORMATS = ("text", "json", "off")
+ACCESS_LOG_FORMAT = os.environ.get("LANDING_ACCESS_LOG", "text")
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+REQUEST_LATENCY: dict[tuple[str, str], list] = {}
+REQUEST_COUNTS: defaultdict[tuple[str, str, str], int] = defaultdict(int)
+OPERATION_LATENCY: dict[str, list] = {}
+CACHE_LOOKUPS: defaultdict[tuple[str, str], int] = defaultdict(int)
+TRAFFIC_BYTES: defaultdict[tuple[str, str], int] = defaultdict(int)
+METRICS_LOCK = threading.Lock()
+METRICS_STARTED_AT = time.time()
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def get_db_connection() -> sqlite3.Connection:
+    # One connection per server thread; WAL lets readers proceed while a writer commits.
+    conn = getattr(_db_local, "conn", None)
+    if conn is not None and _db_local.path == DB_PATH:
+        return conn
+    if conn is not None:
+        conn.close()
+    conn = sqlite3.connect(DB_PATH, cached_statements=SQLITE_STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    for pragma in SQLITE_PRAGMAS:
+        conn.execute(pragma)
+    _db_local.conn = conn
+    _db_local.path = DB_PATH
+    return conn
+
+
+def reset_db_connections() -> None:
+    global _db_local
+    _db_local = threading.local()
+
+
+os.register_at_fork(after_in_child=reset_db_connections)
+
+
+def observe_latency(histograms: dict, key: object, seconds: float) -> None:
+    # Callers hold METRICS_LOCK. Slots are per-bucket counts, then +Inf, then the running sum.
+    histogram = histograms.get(key)
+    if histogram is None:
+        histogram = histograms[key] = [0] * (len(LATENCY_BUCKETS) + 1) + [0.0]
+    histogram[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+    histogram[-1] += seconds
+
+
+def record_request(
+    method: str, route: str, status: str, seconds: float, bytes_in: int, bytes_out: int
+) -> None:
+    with METRICS_LOCK:
+        observe_latency(REQUEST_LATENCY, (method, route), seconds)
+        REQUEST_COUNTS[(method, route, status)] += 1
+        TRAFFIC_BYTES[(route, "in")] += bytes_in
+        TRAFFIC_BYTES[(route, "out")] += bytes_out
+
+
+def record_cache_lookup(cache: str, hit: bool, count: int = 1) -> None:
+    if METRICS_ENABLED and count:
+        with METRICS_LOCK:
+            CACHE_LOOKUPS[(cache, "hit" if hit else "miss")] += count
+
+
+def timed(func):
+    if not METRICS_ENABLED:
+        return func
+    operation = func.__name__
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            with METRICS_LOCK:
+                observe_latency(OPERATION_LATENCY, operation, elapsed)
+
+    return wrapper
 
 
 def init_db() -> None:
+    legacy_photo_paths: list[str] = []
     with sqlite3.connect(DB_PATH) as conn:
+        conn.execute("PRAGMA journal_mode=WAL")
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS stores (
@@ -46,7 +292,8 @@ def init_db() -> None:
               owner_email TEXT NOT NULL,
               dress_photo_path TEXT,
               invite_code TEXT NOT NULL,
-              created_at TEXT NOT NULL
+              created_at TEXT NOT NULL,
+              photos_version INTEGER NOT NULL DEFAULT 0
             )
             """
         )
@@ -58,6 +305,8 @@ def init_db() -> None:
             conn.execute("ALTER TABLE stores ADD COLUMN invite_code TEXT")
         if "created_at" not in column_names:
             conn.execute("ALTER TABLE stores ADD COLUMN created_at TEXT")
+        if "photos_version" not in column_names:
+            conn.execute("ALTER TABLE stores ADD COLUMN photos_version INTEGER NOT NULL DEFAULT 0")
 
         # Backfill newly added columns for stores created before these fields existed.
         existing_codes = {
@@ -116,6 +365,22 @@ def init_db() -> None:
             conn.execute("ALTER TABLE store_dress_photos ADD COLUMN price REAL")
         if "tags_json" not in photo_column_names:
             conn.execute("ALTER TABLE store_dress_photos ADD COLUMN tags_json TEXT")
+        if "derivatives_json" not in photo_column_names:
+            conn.execute("ALTER TABLE store_dress_photos ADD COLUMN derivatives_json TEXT")
+        if "status" not in photo_column_names:
+            conn.execute("ALTER TABLE store_dress_photos ADD COLUMN status TEXT")
+        if "content_hash" not in photo_column_names:
+            conn.execute("ALTER TABLE store_dress_photos ADD COLUMN content_hash TEXT")
+        conn.execute("UPDATE store_dress_photos SET status = 'ready' WHERE status IS NULL")
+        conn.execute(
+            """
+            CREATE INDEX IF NOT EXISTS idx_store_dress_photos_store_created
+            ON store_dress_photos (store_id, created_at DESC, id DESC)
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_store_dress_photos_path ON store_dress_photos (photo_path)"
+        )
         conn.execute(
             """
             CREATE TABLE IF NOT EXISTS default_dress_metadata (
@@ -126,6 +391,164 @@ def init_db() -> None:
             )
             """
         )
+        existing_tables = {
+            row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        }
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS dress_tags (
+              photo_id INTEGER NOT NULL,
+              tag_id TEXT NOT NULL,
+              store_id INTEGER NOT NULL,
+              PRIMARY KEY(photo_id, tag_id),
+              FOREIGN KEY(photo_id) REFERENCES store_dress_photos(id),
+              FOREIGN KEY(store_id) REFERENCES stores(id)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_dress_tags_store_tag ON dress_tags (store_id, tag_id, photo_id)"
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS default_dress_tags (
+              photo_path TEXT NOT NULL,
+              tag_id TEXT NOT NULL,
+              PRIMARY KEY(photo_path, tag_id)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_default_dress_tags_tag ON default_dress_tags (tag_id, photo_path)"
+        )
+
+        # Backfill the tag tables from tags_json the first time they are created.
+        if "dress_tags" not in existing_tables:
+            for photo_id, store_id, tags_json in conn.execute(
+                "SELECT id, store_id, tags_json FROM store_dress_photos"
+            ).fetchall():
+                replace_dress_tags(conn, store_id, photo_id, parse_tags(tags_json))
+        if "default_dress_tags" not in existing_tables:
+            for photo_path, tags_json in conn.execute(
+                "SELECT photo_path, tags_json FROM default_dress_metadata"
+            ).fetchall():
+                replace_default_dress_tags(conn, photo_path, parse_tags(tags_json))
+
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS photo_blobs (
+              content_hash TEXT PRIMARY KEY,
+              photo_path TEXT NOT NULL,
+              refcount INTEGER NOT NULL,
+              created_at TEXT NOT NULL
+            )
+            """
+        )
+        if "photo_blobs" not in existing_tables:
+            legacy_photo_paths = migrate_store_photos_to_blobs(conn)
+        # Each store references a blob at most once; older databases may hold duplicates.
+        merge_duplicate_store_photos(conn)
+        conn.execute("DROP INDEX IF EXISTS idx_store_dress_photos_store_hash")
+        conn.execute(
+            """
+            CREATE UNIQUE INDEX IF NOT EXISTS idx_store_dress_photos_store_blob
+            ON store_dress_photos (store_id, content_hash)
+            """
+        )
+
+    # Legacy files are only removed once their rows point at the blob store.
+    for photo_path in legacy_photo_paths:
+        (BASE_DIR / photo_path).unlink(missing_ok=True)
+        remove_dress_photo_derivatives(photo_path)
+
+
+def merge_duplicate_store_photos(conn: sqlite3.Connection) -> None:
+    # The oldest row is kept with the tags of every copy and the first price that was set.
+    duplicates = conn.execute(
+        """
+        SELECT store_id, content_hash
+        FROM store_dress_photos
+        WHERE content_hash IS NOT NULL
+        GROUP BY store_id, content_hash
+        HAVING COUNT(*) > 1
+        """
+    ).fetchall()
+    for store_id, content_hash in duplicates:
+        rows = conn.execute(
+            """
+            SELECT id, price, tags_json
+            FROM store_dress_photos
+            WHERE store_id = ? AND content_hash = ?
+            ORDER BY id
+            """,
+            (store_id, content_hash),
+        ).fetchall()
+        kept_id = rows[0][0]
+        removed_ids = [(row[0],) for row in rows[1:]]
+        tags = list(dict.fromkeys(tag for row in rows for tag in parse_tags(row[2])))
+        price = next((row[1] for row in rows if row[1] is not None), None)
+        conn.execute(
+            "UPDATE store_dress_photos SET price = ?, tags_json = ? WHERE id = ?",
+            (price, json.dumps(tags), kept_id),
+        )
+        replace_dress_tags(conn, store_id, kept_id, tags)
+        conn.executemany("DELETE FROM dress_tags WHERE photo_id = ?", removed_ids)
+        conn.executemany("DELETE FROM store_dress_photos WHERE id = ?", removed_ids)
+        conn.execute(
+            "UPDATE photo_blobs SET refcount = refcount - ? WHERE content_hash = ?",
+            (len(removed_ids), content_hash),
+        )
+        bump_store_photos_version(conn, store_id)
+
+
+def migrate_store_photos_to_blobs(conn: sqlite3.Connection) -> list[str]:
+    legacy_photo_paths = []
+    status = "ready" if Image is None else "processing"
+    created_at = datetime.now(timezone.utc).isoformat()
+    for photo_id, photo_path in conn.execute(
+        "SELECT id, photo_path FROM store_dress_photos ORDER BY id"
+    ).fetchall():
+        source = BASE_DIR / photo_path
+        if not source.is_file():
+            continue
+        content_hash = hash_file(source)
+        existing = conn.execute(
+            "SELECT photo_path FROM photo_blobs WHERE content_hash = ?", (content_hash,)
+        ).fetchone()
+        if existing:
+            blob_path = existing[0]
+            conn.execute(
+                "UPDATE photo_blobs SET refcount = refcount + 1 WHERE content_hash = ?",
+                (content_hash,),
+            )
+        else:
+            blob_path = get_blob_path(content_hash, source.suffix)
+            (BASE_DIR / blob_path).parent.mkdir(parents=True, exist_ok=True)
+            try:
+                os.link(source, BASE_DIR / blob_path)
+            except FileExistsError:
+                pass
+            except OSError:
+                shutil.copyfile(source, BASE_DIR / blob_path)
+            conn.execute(
+                "INSERT INTO photo_blobs (content_hash, photo_path, refcount, created_at) VALUES (?, ?, 1, ?)",
+                (content_hash, blob_path, created_at),
+            )
+        # Derivatives are regenerated under the blob name by resume_image_jobs().
+        conn.execute(
+            """
+            UPDATE store_dress_photos
+            SET photo_path = ?, content_hash = ?, status = ?, derivatives_json = NULL
+            WHERE id = ?
+            """,
+            (blob_path, content_hash, status, photo_id),
+        )
+        conn.execute(
+            "UPDATE stores SET dress_photo_path = ? WHERE dress_photo_path = ?",
+            (blob_path, photo_path),
+        )
+        legacy_photo_paths.append(photo_path)
+    return legacy_photo_paths
 
 
 def generate_invite_code() -> str:
@@ -138,43 +561,109 @@ def normalize_photo_path(photo_path: str | None) -> str:
     return get_default_dress_photo_path()
 
 
+def find_existing_file(candidates: tuple[str, ...]) -> str | None:
+    # Results are reused for FILE_PROBE_TTL seconds, so serializing many stores probes the disk once.
+    now = time.monotonic()
+    with FILE_PROBE_LOCK:
+        cached = FILE_PROBE_CACHE.get(candidates)
+    hit = cached is not None and now - cached[0] < FILE_PROBE_TTL
+    record_cache_lookup("file_probe", hit)
+    if hit:
+        return cached[1]
+    found = next((candidate for candidate in candidates if (BASE_DIR / candidate).exists()), None)
+    with FILE_PROBE_LOCK:
+        FILE_PROBE_CACHE[candidates] = (now, found)
+    return found
+
+
 def get_default_dress_photo_path() -> str:
-    source_path = Path(DEFAULT_DRESS_PHOTO_PATH)
-    default_candidates = [
-        source_path,
-        source_path.with_suffix(".png"),
-        source_path.with_suffix(".jpg"),
-        source_path.with_suffix(".jpeg"),
-        Path("images/default-dress.svg"),
-        Path("images/default-dress.png"),
-        Path("images/default-dress.jpg"),
-        Path("images/default-dress.jpeg"),
-    ]
-    for candidate in default_candidates:
-        relative_candidate = str(candidate)
-        if (BASE_DIR / relative_candidate).exists():
-            return relative_candidate
-    return DEFAULT_DRESS_PHOTO_PATH
+    return find_existing_file(DEFAULT_DRESS_PHOTO_CANDIDATES) or DEFAULT_DRESS_PHOTO_PATH
+
+
+@timed
+def scan_default_photo_dir(directory: str) -> tuple[list[str], list[str]]:
+    files = []
+    subdirs = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.path)
+            elif entry.is_file() and os.path.splitext(entry.name)[1].lower() in DEFAULT_SESSION_EXTENSIONS:
+                files.append(os.path.relpath(entry.path, BASE_DIR).replace("\\", "/"))
+    return files, subdirs
+
+
+def refresh_default_photo_index() -> None:
+    # Only directories whose mtime changed are rescanned; unchanged ones cost a single stat().
+    directories = DEFAULT_PHOTO_INDEX["dirs"]
+    now_ns = time.time_ns()
+    changed = False
+    rescanned = 0
+    seen = set()
+    pending = [str(DEFAULT_DRESS_PHOTO_DIR)]
+    while pending:
+        directory = pending.pop()
+        try:
+            mtime_ns = os.stat(directory).st_mtime_ns
+        except OSError:
+            continue
+        seen.add(directory)
+        entry = directories.get(directory)
+        if entry is None or entry[0] != mtime_ns:
+            try:
+                files, subdirs = scan_default_photo_dir(directory)
+            except OSError:
+                continue
+            recorded_mtime = mtime_ns if now_ns - mtime_ns > DIRECTORY_INDEX_RACY_NS else None
+            entry = directories[directory] = (recorded_mtime, files, subdirs)
+            changed = True
+            rescanned += 1
+        pending.extend(entry[2])
+    record_cache_lookup("default_photo_dir", True, len(seen) - rescanned)
+    record_cache_lookup("default_photo_dir", False, rescanned)
+    for directory in set(directories) - seen:
+        del directories[directory]
+        changed = True
+    if changed:
+        photos = sorted(
+            (photo for entry in directories.values() for photo in entry[1]),
+            key=lambda photo: photo.split("/"),
+        )
+        if photos != DEFAULT_PHOTO_INDEX["photos"]:
+            DEFAULT_PHOTO_INDEX["photos"] = photos
+            DEFAULT_PHOTO_INDEX["photo_set"] = frozenset(photos)
+            DEFAULT_PHOTO_INDEX["version"] += 1
 
 
+@timed
 def list_default_dress_photos() -> list[str]:
-    default_dir = BASE_DIR / "images" / "default"
-    if not default_dir.exists() or not default_dir.is_dir():
-        return [get_default_dress_photo_path()]
-
-    photos = [
-        str(path.relative_to(BASE_DIR)).replace("\\", "/")
-        for path in sorted(default_dir.rglob("*"))
-        if path.is_file() and path.suffix.lower() in DEFAULT_SESSION_EXTENSIONS
-    ]
-    return photos or [get_default_dress_photo_path()]
+    return get_default_photo_snapshot()[0]
+
+
+def get_default_photo_snapshot() -> tuple[list[str], int]:
+    # The photo list and its version are read under one lock so caches never pair them wrongly.
+    with DEFAULT_PHOTO_INDEX_LOCK:
+        refresh_default_photo_index()
+        photos = DEFAULT_PHOTO_INDEX["photos"]
+        version = DEFAULT_PHOTO_INDEX["version"]
+    return photos or [get_default_dress_photo_path()], version
 
 
-def fetch_default_dress_metadata() -> list[dict]:
-    photos = list_default_dress_photos()
+def is_default_dress_photo(photo_path: str) -> bool:
+    with DEFAULT_PHOTO_INDEX_LOCK:
+        refresh_default_photo_index()
+        photo_set = DEFAULT_PHOTO_INDEX["photo_set"]
+    if not photo_set:
+        return photo_path == get_default_dress_photo_path()
+    return photo_path in photo_set
+
+
+@timed
+def fetch_default_dress_metadata(photos: list[str] | None = None) -> list[dict]:
+    photos = list_default_dress_photos() if photos is None else photos
     if not photos:
         return []
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_db_connection() as conn:
         rows = conn.execute(
             """
             SELECT photo_path, tags_json
@@ -187,15 +676,15 @@ def fetch_default_dress_metadata() -> list[dict]:
     return [{"photo_path": photo, "tags": tags_by_photo.get(photo, [])} for photo in photos]
 
 
+@timed
 def update_default_dress_metadata(photo_path: str, tags: list[str]) -> bool:
     normalized_path = (photo_path or "").strip()
     if not normalized_path:
         return False
-    available_photos = set(list_default_dress_photos())
-    if normalized_path not in available_photos:
+    if not is_default_dress_photo(normalized_path):
         return False
     updated_at = datetime.now(timezone.utc).isoformat()
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_db_connection() as conn:
         conn.execute(
             """
             INSERT INTO default_dress_metadata (photo_path, tags_json, updated_at)
@@ -206,9 +695,144 @@ def update_default_dress_metadata(photo_path: str, tags: list[str]) -> bool:
             """,
             (normalized_path, json.dumps(tags), updated_at),
         )
+        replace_default_dress_tags(conn, normalized_path, tags)
     return True
 
 
+def normalize_tag_ids(tags: list[str]) -> list[str]:
+    return sorted({normalize_token(tag) for tag in tags} - {""})
+
+
+def replace_dress_tags(
+    conn: sqlite3.Connection, store_id: int, photo_id: int, tags: list[str]
+) -> list[str]:
+    tag_ids = normalize_tag_ids(tags)
+    conn.execute("DELETE FROM dress_tags WHERE photo_id = ?", (photo_id,))
+    conn.executemany(
+        "INSERT INTO dress_tags (photo_id, tag_id, store_id) VALUES (?, ?, ?)",
+        [(photo_id, tag_id, store_id) for tag_id in tag_ids],
+    )
+    return tag_ids
+
+
+def replace_default_dress_tags(conn: sqlite3.Connection, photo_path: str, tags: list[str]) -> None:
+    conn.execute("DELETE FROM default_dress_tags WHERE photo_path = ?", (photo_path,))
+    conn.executemany(
+        "INSERT INTO default_dress_tags (photo_path, tag_id) VALUES (?, ?)",
+        [(photo_path, tag_id) for tag_id in normalize_tag_ids(tags)],
+    )
+
+
+@timed
+def filter_default_dress_metadata(tag_ids: list[str]) -> list[dict]:
+    photos = fetch_default_dress_metadata()
+    if not tag_ids:
+        return photos
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            """
+            SELECT photo_path
+            FROM default_dress_tags
+            WHERE tag_id IN ({placeholders})
+            GROUP BY photo_path
+            HAVING COUNT(*) = ?
+            """.format(placeholders=",".join("?" for _ in tag_ids)),
+            (*tag_ids, len(tag_ids)),
+        ).fetchall()
+    matches = {row[0] for row in rows}
+    return [photo for photo in photos if photo["photo_path"] in matches]
+
+
+def normalize_token(value: object) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", str(value or "").strip().lower())
+
+
+def get_localized_value(labels: object, locale: str, fallback: str = "en") -> str:
+    if not isinstance(labels, dict):
+        return ""
+    return labels.get(locale) or labels.get(fallback) or next(iter(labels.values()), "") or ""
+
+
+def build_tag_category_map(tag_options: dict) -> dict[str, str]:
+    tag_map: dict[str, str] = {}
+    default_locale = tag_options.get("defaultLocale") or "en"
+    for category in tag_options.get("categories") or []:
+        label = get_localized_value(category.get("label"), "en", default_locale) or category.get("id")
+        for tag in category.get("tags") or []:
+            tag_map[normalize_token(tag.get("id"))] = label
+            tag_map[normalize_token(get_localized_value(tag.get("label"), "en", default_locale))] = label
+    return tag_map
+
+
+def resolve_photo_category(
+    photo_path: str, tag_map: dict[str, str], fallback_categories: list[str]
+) -> str:
+    tokens = [token for token in normalize_token(photo_path).split("-") if token]
+    for token in tokens:
+        if token in tag_map:
+            return tag_map[token]
+    for first, second in zip(tokens, tokens[1:]):
+        if f"{first}-{second}" in tag_map:
+            return tag_map[f"{first}-{second}"]
+    if fallback_categories:
+        seed = sum(ord(char) for char in "".join(tokens))
+        return fallback_categories[seed % len(fallback_categories)]
+    return FALLBACK_PHOTO_CATEGORY
+
+
+def build_session_deck(photos: list[dict], tag_options: dict) -> list[dict]:
+    tag_map = build_tag_category_map(tag_options)
+    fallback_categories = list(dict.fromkeys(tag_map.values()))
+    deck = []
+    for photo in photos:
+        photo_path = photo["photo_path"]
+        tags = photo.get("tags") or []
+        category = next(
+            (tag_map[normalize_token(tag)] for tag in tags if tag_map.get(normalize_token(tag))),
+            None,
+        )
+        deck.append(
+            {
+                "photo_path": photo_path,
+                "file_name": photo_path.split("/")[-1] or photo_path,
+                "tags": tags,
+                "category": category
+                or resolve_photo_category(photo_path, tag_map, fallback_categories),
+            }
+        )
+    return deck
+
+
+def get_default_metadata_signature() -> tuple:
+    with get_db_connection() as conn:
+        row = conn.execute(
+            "SELECT COUNT(*), MAX(updated_at) FROM default_dress_metadata"
+        ).fetchone()
+    return tuple(row)
+
+
+@timed
+def get_session_deck_bytes() -> bytes:
+    # Photo index, metadata table and tag options together determine the deck.
+    photos, photos_version = get_default_photo_snapshot()
+    signature = (
+        photos_version,
+        get_default_metadata_signature(),
+        get_file_signature(TAG_OPTIONS_PATH),
+    )
+    with SESSION_DECK_LOCK:
+        body = SESSION_DECK_CACHE["body"] if SESSION_DECK_CACHE["signature"] == signature else None
+    record_cache_lookup("session_deck", body is not None)
+    if body is not None:
+        return body
+    deck = build_session_deck(fetch_default_dress_metadata(photos), get_cached_tag_options()[0])
+    body = json.dumps({"deck": deck}).encode("utf-8")
+    with SESSION_DECK_LOCK:
+        SESSION_DECK_CACHE["signature"] = signature
+        SESSION_DECK_CACHE["body"] = body
+    return body
+
+
 def normalize_store_payload(store: dict) -> dict:
     payload = dict(store)
     dress_photos = payload.get("dress_photos") or []
@@ -235,31 +859,113 @@ def parse_tags(raw_tags: str | None) -> list[str]:
     return [str(tag) for tag in tags if str(tag).strip()]
 
 
+def parse_derivatives(raw_derivatives: str | None) -> list[dict]:
+    if not raw_derivatives:
+        return []
+    try:
+        derivatives = json.loads(raw_derivatives)
+    except json.JSONDecodeError:
+        return []
+    if not isinstance(derivatives, list):
+        return []
+    return [item for item in derivatives if isinstance(item, dict) and item.get("path")]
+
+
+def build_srcset(derivatives: list[dict]) -> dict[str, str]:
+    srcset: dict[str, str] = {}
+    for extension in DERIVATIVE_FORMATS:
+        candidates = sorted(
+            (item for item in derivatives if item.get("format") == extension),
+            key=lambda item: item.get("width") or 0,
+        )
+        if candidates:
+            srcset[extension] = ", ".join(
+                f"{item['path']} {item['width']}w" for item in candidates
+            )
+    return srcset
+
+
+def build_store_dress_photo(
+    photo_path: str,
+    price: float | None,
+    tags_json: str | None,
+    derivatives_json: str | None,
+    status: str | None,
+) -> dict:
+    derivatives = parse_derivatives(derivatives_json)
+    return {
+        "photo_path": photo_path,
+        "price": price,
+        "tags": parse_tags(tags_json),
+        "derivatives": derivatives,
+        "srcset": build_srcset(derivatives),
+        "status": status or "ready",
+    }
+
+
 def fetch_store_dress_photos(conn: sqlite3.Connection, store_id: int) -> list[dict]:
     rows = conn.execute(
         """
-        SELECT photo_path, price, tags_json
+        SELECT photo_path, price, tags_json, derivatives_json, status
         FROM store_dress_photos
         WHERE store_id = ?
         ORDER BY created_at DESC, id DESC
         """,
         (store_id,),
     ).fetchall()
-    photos = []
-    for row in rows:
-        photos.append(
-            {
-                "photo_path": row[0],
-                "price": row[1],
-                "tags": parse_tags(row[2]),
-            }
-        )
-    return photos
+    return [build_store_dress_photo(*row) for row in rows]
 
 
-def fetch_stores(user_email: str) -> list[dict]:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+def fetch_dress_photos_for_stores(
+    conn: sqlite3.Connection, store_ids: list[int]
+) -> dict[int, list[dict]]:
+    photos_by_store: dict[int, list[dict]] = {store_id: [] for store_id in store_ids}
+    # Chunk to stay under SQLite's bound-parameter limit on older builds.
+    for start in range(0, len(store_ids), 500):
+        chunk = store_ids[start : start + 500]
+        rows = conn.execute(
+            """
+            SELECT store_id, photo_path, price, tags_json, derivatives_json, status
+            FROM store_dress_photos
+            WHERE store_id IN ({placeholders})
+            ORDER BY store_id, created_at DESC, id DESC
+            """.format(placeholders=",".join("?" for _ in chunk)),
+            chunk,
+        ).fetchall()
+        for row in rows:
+            photos_by_store[row[0]].append(build_store_dress_photo(*row[1:]))
+    return photos_by_store
+
+
+def fetch_photo_summaries_for_stores(
+    conn: sqlite3.Connection, store_ids: list[int]
+) -> dict[int, tuple[int, str | None]]:
+    summaries: dict[int, tuple[int, str | None]] = {store_id: (0, None) for store_id in store_ids}
+    for start in range(0, len(store_ids), 500):
+        chunk = store_ids[start : start + 500]
+        rows = conn.execute(
+            """
+            SELECT store_id, COUNT(*), (
+                SELECT newest.photo_path
+                FROM store_dress_photos AS newest
+                WHERE newest.store_id = photos.store_id
+                ORDER BY newest.created_at DESC, newest.id DESC
+                LIMIT 1
+            )
+            FROM store_dress_photos AS photos
+            WHERE store_id IN ({placeholders})
+            GROUP BY store_id
+            """.format(placeholders=",".join("?" for _ in chunk)),
+            chunk,
+        ).fetchall()
+        for store_id, count, photo_path in rows:
+            summaries[store_id] = (count, photo_path)
+    return summaries
+
+
+@timed
+def fetch_stores(user_email: str, include_photos: bool = True) -> list[dict]:
+    with get_db_connection() as conn:
         rows = conn.execute(
             """
             SELECT DISTINCT stores.id, stores.name, stores.location, stores.owner_email,
@@ -271,18 +977,32 @@ def fetch_stores(user_email: str) -> list[dict]:
             """,
             (user_email, user_email),
         ).fetchall()
+        store_ids = [row["id"] for row in rows]
+        if not include_photos:
+            # Pages that list stores only show a count and a cover; photos come from /dresses.
+            summaries = fetch_photo_summaries_for_stores(conn, store_ids)
+            stores = []
+            for row in rows:
+                store = dict(row)
+                store["photo_count"], cover_path = summaries[store["id"]]
+                store["dress_photo_url"] = normalize_photo_path(cover_path or store["dress_photo_path"])
+                stores.append(store)
+            return stores
+        photos_by_store = fetch_dress_photos_for_stores(conn, store_ids)
         stores = []
         for row in rows:
             store = dict(row)
-            store["dress_photos"] = fetch_store_dress_photos(conn, store["id"])
+            store["dress_photos"] = photos_by_store[store["id"]]
+            store["photo_count"] = len(store["dress_photos"])
             stores.append(normalize_store_payload(store))
     return stores
 
 
+@timed
 def create_store(name: str, location: str, owner_email: str) -> dict:
     invite_code = generate_invite_code()
     created_at = datetime.now(timezone.utc).isoformat()
-    with sqlite3.connect(DB_PATH) as conn:
+    with get_db_connection() as conn:
         cursor = conn.execute(
             """
             INSERT INTO stores (name, location, owner_email, invite_code, created_at)
@@ -304,13 +1024,13 @@ def create_store(name: str, location: str, owner_email: str) -> dict:
     }
 
 
+@timed
 def join_store(invite_code: str, member_email: str) -> dict | None:
     invite_code = invite_code.strip().upper()
     member_email = member_email.strip().lower()
     if not invite_code or not member_email:
         return None
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+    with get_db_connection() as conn:
         store = conn.execute(
             """
             SELECT id, name, location, owner_email, dress_photo_path, invite_code, created_at
@@ -336,46 +1056,642 @@ def join_store(invite_code: str, member_email: str) -> dict | None:
     return normalize_store_payload(normalized_store)
 
 
-def save_store_dress_photo(store_id: int, filename: str, content: bytes) -> str | None:
-    extension = Path(filename).suffix.lower()
-    if extension not in ALLOWED_DRESS_EXTENSIONS:
+class MultipartError(ValueError):
+    pass
+
+
+def get_multipart_boundary(content_type: str) -> bytes | None:
+    message = Message()
+    message["Content-Type"] = content_type
+    boundary = message.get_param("boundary")
+    if message.get_content_type() != "multipart/form-data" or not isinstance(boundary, str):
         return None
+    return boundary.encode("latin-1")
+
+
+def parse_multipart_upload(
+    stream, content_type: str, content_length: int, file_field: str, upload_dir: Path
+) -> tuple[dict[str, str], dict | None]:
+    fields, uploads = parse_multipart_uploads(
+        stream, content_type, content_length, {file_field: 1}, upload_dir
+    )
+    return fields, (uploads[0] if uploads else None)
+
+
+@timed
+def parse_multipart_uploads(
+    stream, content_type: str, content_length: int, file_limits: dict[str, int], upload_dir: Path
+) -> tuple[dict[str, str], list[dict]]:
+    boundary = get_multipart_boundary(content_type)
+    if not boundary:
+        raise MultipartError("multipart/form-data boundary is missing.")
+    delimiter = b"--" + boundary
+    marker = b"\r\n" + delimiter
+    remaining = content_length
+    buffer = bytearray()
+
+    def fill() -> None:
+        nonlocal remaining
+        chunk = stream.read(min(UPLOAD_CHUNK_SIZE, remaining)) if remaining > 0 else b""
+        if not chunk:
+            raise MultipartError("Upload ended before the multipart body was complete.")
+        remaining -= len(chunk)
+        buffer.extend(chunk)
+
+    while (index := buffer.find(delimiter)) < 0:
+        del buffer[: max(0, len(buffer) - len(delimiter))]
+        fill()
+    del buffer[: index + len(delimiter)]
+
+    fields: dict[str, str] = {}
+    uploads: list[dict] = []
+    try:
+        while True:
+            while len(buffer) < 2:
+                fill()
+            if buffer[:2] == b"--":
+                break
+            while (header_end := buffer.find(b"\r\n\r\n")) < 0:
+                if len(buffer) > MAX_MULTIPART_HEADER_BYTES:
+                    raise MultipartError("Multipart part headers are too large.")
+                fill()
+            disposition = Message()
+            for line in bytes(buffer[:header_end]).decode("utf-8", "replace").split("\r\n"):
+                name, _, value = line.partition(":")
+                if name.strip().lower() == "content-disposition":
+                    disposition["Content-Disposition"] = value.strip()
+            del buffer[: header_end + 4]
+            field_name = disposition.get_param("name", header="content-disposition")
+            filename = disposition.get_filename()
+
+            handle = None
+            value = bytearray()
+            if filename is not None and field_name in file_limits:
+                limit = file_limits[field_name]
+                if sum(1 for item in uploads if item["field"] == field_name) >= limit:
+                    raise MultipartError(f"At most {limit} {field_name} files are allowed.")
+                handle = tempfile.NamedTemporaryFile(
+                    dir=upload_dir, prefix=".upload-", suffix=".part", delete=False
+                )
+                digest = hashlib.sha256()
+                upload = {"field": field_name, "filename": filename, "path": Path(handle.name), "size": 0}
+                uploads.append(upload)
+
+            def write(data: bytearray) -> None:
+                if handle is not None:
+                    handle.write(data)
+                    digest.update(data)
+                    upload["size"] += len(data)
+                elif filename is None:
+                    value.extend(data)
+                    if len(value) > MAX_MULTIPART_FIELD_BYTES:
+                        raise MultipartError("Multipart form field is too large.")
+
+            try:
+                while (index := buffer.find(marker)) < 0:
+                    flushable = len(buffer) - len(marker) + 1
+                    if flushable > 0:
+                        write(buffer[:flushable])
+                        del buffer[:flushable]
+                    fill()
+                write(buffer[:index])
+                del buffer[: index + len(marker)]
+            finally:
+                if handle is not None:
+                    handle.close()
+            if handle is not None:
+                upload["sha256"] = digest.hexdigest()
+            if filename is None and isinstance(field_name, str):
+                fields[field_name] = value.decode("utf-8", "replace")
+
+        # Drain the epilogue so the connection is left at a request boundary.
+        while remaining > 0:
+            chunk = stream.read(min(UPLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+    except BaseException:
+        for upload in uploads:
+            discard_upload(upload)
+        raise
+    return fields, uploads
+
+
+def discard_upload(upload: dict | None) -> None:
+    if upload:
+        upload["path"].unlink(missing_ok=True)
+
+
+def get_store_photo_dir(store_id: int) -> Path:
     store_dir = STORE_DRESS_PHOTO_BASE_DIR / f"store-{store_id}"
     store_dir.mkdir(parents=True, exist_ok=True)
-    unique_suffix = secrets.token_hex(8)
-    relative_path = Path("images") / "stores" / f"store-{store_id}" / f"dress-{unique_suffix}{extension}"
-    full_path = BASE_DIR / relative_path
-    full_path.write_bytes(content)
-    created_at = datetime.now(timezone.utc).isoformat()
-    with sqlite3.connect(DB_PATH) as conn:
+    return store_dir
+
+
+def save_store_dress_photo(store_id: int, filename: str, content: bytes) -> str | None:
+    if Path(filename).suffix.lower() not in ALLOWED_DRESS_EXTENSIONS:
+        return None
+    with tempfile.NamedTemporaryFile(
+        dir=get_store_photo_dir(store_id), prefix=".upload-", suffix=".part", delete=False
+    ) as handle:
+        handle.write(content)
+    return save_store_dress_photo_file(
+        store_id, filename, Path(handle.name), hashlib.sha256(content).hexdigest()
+    )
+
+
+def get_derivative_path(photo_path: str, width: int, extension: str) -> str:
+    path = Path(photo_path)
+    return str(path.with_name(f"{path.stem}-{width}w.{extension}"))
+
+
+def generate_dress_photo_derivatives(photo_path: str) -> list[dict]:
+    if Image is None:
+        return []
+    derivatives = []
+    try:
+        with Image.open(BASE_DIR / photo_path) as source:
+            source.verify()
+        with Image.open(BASE_DIR / photo_path) as source:
+            image = ImageOps.exif_transpose(source)
+            if image.mode != "RGB":
+                image = image.convert("RGB")
+            for width in DERIVATIVE_WIDTHS:
+                if width >= image.width:
+                    break
+                height = max(1, round(image.height * width / image.width))
+                resized = image.resize((width, height), Image.LANCZOS)
+                for extension, image_format in DERIVATIVE_FORMATS.items():
+                    relative_path = get_derivative_path(photo_path, width, extension)
+                    resized.save(BASE_DIR / relative_path, image_format, quality=DERIVATIVE_QUALITY)
+                    derivatives.append({"width": width, "format": extension, "path": relative_path})
+    except BaseException:
+        remove_dress_photo_derivatives(photo_path)
+        raise
+    return derivatives
+
+
+def remove_dress_photo_derivatives(photo_path: str) -> None:
+    for width in DERIVATIVE_WIDTHS:
+        for extension in DERIVATIVE_FORMATS:
+            derivative = BASE_DIR / get_derivative_path(photo_path, width, extension)
+            derivative.unlink(missing_ok=True)
+            forget_static_file(str(derivative))
+
+
+def get_image_job_executor() -> ProcessPoolExecutor:
+    global _image_job_executor
+    with IMAGE_JOB_LOCK:
+        if _image_job_executor is None:
+            # spawn keeps worker processes free of the server's threads and open sockets.
+            _image_job_executor = ProcessPoolExecutor(
+                max_workers=max(1, IMAGE_JOB_WORKERS),
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _image_job_executor
+
+
+def image_job_queue_full() -> bool:
+    with IMAGE_JOB_LOCK:
+        full = Image is not None and IMAGE_JOB_STATS["queued"] >= IMAGE_JOB_QUEUE_LIMIT
+        if full:
+            IMAGE_JOB_STATS["rejected"] += 1
+    return full
+
+
+def submit_image_job(photo_path: str) -> None:
+    # Jobs are keyed by blob path: every row sharing the blob picks up the same derivatives.
+    with IMAGE_JOB_LOCK:
+        IMAGE_JOB_STATS["queued"] += 1
+    started = time.monotonic()
+    future = get_image_job_executor().submit(generate_dress_photo_derivatives, photo_path)
+    future.add_done_callback(lambda done: finish_image_job(photo_path, started, done))
+
+
+def record_image_job_result(photo_path: str, status: str, derivatives: list[dict]) -> bool:
+    with get_db_connection() as conn:
+        updated = conn.execute(
+            "UPDATE store_dress_photos SET status = ?, derivatives_json = ? WHERE photo_path = ?",
+            (status, json.dumps(derivatives), photo_path),
+        )
         conn.execute(
             """
-            INSERT INTO store_dress_photos (store_id, photo_path, created_at)
-            VALUES (?, ?, ?)
+            UPDATE stores SET photos_version = photos_version + 1
+            WHERE id IN (SELECT store_id FROM store_dress_photos WHERE photo_path = ?)
             """,
-            (store_id, str(relative_path), created_at),
+            (photo_path,),
+        )
+    return updated.rowcount > 0
+
+
+def finish_image_job(photo_path: str, started: float, future) -> None:
+    elapsed = time.monotonic() - started
+    failed = future.exception() is not None
+    derivatives = [] if failed else future.result()
+    try:
+        found = record_image_job_result(photo_path, "failed" if failed else "ready", derivatives)
+    except sqlite3.Error:
+        # Runs in a future callback, where an exception would only be logged and the
+        # photo would stay 'processing'; drop the derivatives and mark it failed instead.
+        sys.stderr.write(f"Saving image job result for {photo_path} failed\n")
+        traceback.print_exc()
+        failed = True
+        found = False
+        try:
+            record_image_job_result(photo_path, "failed", [])
+        except sqlite3.Error:
+            # Still 'processing'; resume_image_jobs retries it on the next start.
+            traceback.print_exc()
+    with IMAGE_JOB_LOCK:
+        IMAGE_JOB_STATS["queued"] -= 1
+        IMAGE_JOB_STATS["failed" if failed else "completed"] += 1
+        IMAGE_JOB_STATS["total_seconds"] += elapsed
+        IMAGE_JOB_STATS["max_seconds"] = max(IMAGE_JOB_STATS["max_seconds"], elapsed)
+    if not found:
+        # The photo was removed while its derivatives were being generated, or they were not saved.
+        remove_dress_photo_derivatives(photo_path)
+
+
+def resume_image_jobs() -> None:
+    if Image is None:
+        return
+    with get_db_connection() as conn:
+        rows = conn.execute(
+            "SELECT DISTINCT photo_path FROM store_dress_photos WHERE status = 'processing'"
+        ).fetchall()
+    for row in rows:
+        submit_image_job(row[0])
+
+
+def image_job_stats() -> dict:
+    with IMAGE_JOB_LOCK:
+        stats = dict(IMAGE_JOB_STATS)
+    finished = stats["completed"] + stats["failed"]
+    stats["average_seconds"] = stats["total_seconds"] / finished if finished else 0.0
+    stats["workers"] = IMAGE_JOB_WORKERS if Image is not None else 0
+    return stats
+
+
+def shutdown_image_jobs() -> None:
+    global _image_job_executor
+    with IMAGE_JOB_LOCK:
+        executor, _image_job_executor = _image_job_executor, None
+    if executor is not None:
+        executor.shutdown(wait=True)
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        while chunk := handle.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_blob_path(content_hash: str, extension: str) -> str:
+    blob_dir = PHOTO_BLOB_BASE_DIR.relative_to(BASE_DIR) / content_hash[:2]
+    return str(blob_dir / f"{content_hash}{extension.lower()}")
+
+
+def acquire_photo_blob(
+    conn: sqlite3.Connection, content_hash: str, extension: str, temp_path: Path
+) -> tuple[str, str, str | None, bool]:
+    # Callers hold a write transaction, so the refcount and the file move are serialized
+    # with release_photo_blob() across threads and processes.
+    existing = conn.execute(
+        "SELECT photo_path FROM photo_blobs WHERE content_hash = ?", (content_hash,)
+    ).fetchone()
+    if existing:
+        conn.execute(
+            "UPDATE photo_blobs SET refcount = refcount + 1 WHERE content_hash = ?", (content_hash,)
         )
+        if (BASE_DIR / existing[0]).is_file():
+            temp_path.unlink(missing_ok=True)
+        else:
+            (BASE_DIR / existing[0]).parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp_path, BASE_DIR / existing[0])
+        state = conn.execute(
+            "SELECT status, derivatives_json FROM store_dress_photos WHERE photo_path = ? LIMIT 1",
+            (existing[0],),
+        ).fetchone()
+        if state:
+            return existing[0], state[0], state[1], False
+        photo_path = existing[0]
+    else:
+        photo_path = get_blob_path(content_hash, extension)
+        (BASE_DIR / photo_path).parent.mkdir(parents=True, exist_ok=True)
+        os.replace(temp_path, BASE_DIR / photo_path)
         conn.execute(
-            "UPDATE stores SET dress_photo_path = ? WHERE id = ?",
-            (str(relative_path), store_id),
+            "INSERT INTO photo_blobs (content_hash, photo_path, refcount, created_at) VALUES (?, ?, 1, ?)",
+            (content_hash, photo_path, datetime.now(timezone.utc).isoformat()),
         )
-    return str(relative_path)
+    return photo_path, ("ready" if Image is None else "processing"), None, True
 
 
-def remove_store_dress_photo(store_id: int, photo_path: str) -> bool:
+def release_photo_blob(conn: sqlite3.Connection, content_hash: str | None) -> bool:
+    # True when the caller holds the last reference and should unlink the file.
+    blob = conn.execute(
+        "SELECT refcount FROM photo_blobs WHERE content_hash = ?", (content_hash,)
+    ).fetchone()
+    if not blob:
+        return True
+    if blob[0] > 1:
+        conn.execute(
+            "UPDATE photo_blobs SET refcount = refcount - 1 WHERE content_hash = ?", (content_hash,)
+        )
+        return False
+    conn.execute("DELETE FROM photo_blobs WHERE content_hash = ?", (content_hash,))
+    return True
+
+
+@timed
+def save_store_dress_photo_file(
+    store_id: int, filename: str, temp_path: Path, content_hash: str | None = None
+) -> str | None:
+    extension = Path(filename).suffix.lower()
+    if extension not in ALLOWED_DRESS_EXTENSIONS:
+        return None
+    content_hash = content_hash or hash_file(temp_path)
+    created_at = datetime.now(timezone.utc).isoformat()
+    created_blob = None
+    conn = get_db_connection()
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            duplicate = conn.execute(
+                "SELECT photo_path FROM store_dress_photos WHERE store_id = ? AND content_hash = ? LIMIT 1",
+                (store_id, content_hash),
+            ).fetchone()
+            if duplicate:
+                temp_path.unlink(missing_ok=True)
+                return duplicate[0]
+            photo_path, status, derivatives_json, needs_job = acquire_photo_blob(
+                conn, content_hash, extension, temp_path
+            )
+            if needs_job:
+                created_blob = BASE_DIR / photo_path
+            cursor = conn.execute(
+                """
+                INSERT INTO store_dress_photos
+                  (store_id, photo_path, status, derivatives_json, content_hash, created_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                """,
+                (store_id, photo_path, status, derivatives_json, content_hash, created_at),
+            )
+            conn.execute(
+                "UPDATE stores SET dress_photo_path = ? WHERE id = ?",
+                (photo_path, store_id),
+            )
+            version = bump_store_photos_version(conn, store_id)
+    except BaseException:
+        # The transaction rolled back, so a blob first created by this upload is unreferenced.
+        if created_blob is not None:
+            created_blob.unlink(missing_ok=True)
+        temp_path.unlink(missing_ok=True)
+        raise
+    update_store_tag_index(store_id, version, cursor.lastrowid, [])
+    if needs_job and status == "processing":
+        submit_image_job(photo_path)
+    return photo_path
+
+
+class PhotoImportError(ValueError):
+    pass
+
+
+def stage_import_file(source, filename: str, upload_dir: Path) -> dict:
+    digest = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(
+        dir=upload_dir, prefix=".upload-", suffix=".part", delete=False
+    ) as handle:
+        staged = {"filename": filename, "path": Path(handle.name), "size": 0}
+        try:
+            while chunk := source.read(UPLOAD_CHUNK_SIZE):
+                handle.write(chunk)
+                digest.update(chunk)
+                staged["size"] += len(chunk)
+        except BaseException:
+            discard_upload(staged)
+            raise
+    staged["sha256"] = digest.hexdigest()
+    return staged
+
+
+@timed
+def stage_import_archive(archive_path: Path, upload_dir: Path) -> tuple[list[dict], list[dict], str | None]:
+    staged: list[dict] = []
+    skipped: list[dict] = []
+    tags_csv = None
+    total_bytes = 0
+    try:
+        with zipfile.ZipFile(archive_path) as archive:
+            for info in archive.infolist():
+                name = Path(info.filename).name
+                if info.is_dir() or not name or name.startswith(".") or "__MACOSX" in info.filename:
+                    continue
+                total_bytes += info.file_size
+                if total_bytes > MAX_IMPORT_BYTES:
+                    raise PhotoImportError("Archive is too large once extracted.")
+                if name.lower() == IMPORT_TAGS_CSV_NAME:
+                    tags_csv = archive.read(info).decode("utf-8-sig")
+                elif Path(name).suffix.lower() not in ALLOWED_DRESS_EXTENSIONS:
+                    skipped.append({"filename": name, "reason": "unsupported file type"})
+                elif len(staged) >= MAX_IMPORT_FILES:
+                    raise PhotoImportError(f"At most {MAX_IMPORT_FILES} photos can be imported at once.")
+                else:
+                    with archive.open(info) as source:
+                        staged.append(stage_import_file(source, name, upload_dir))
+    except (zipfile.BadZipFile, UnicodeDecodeError) as error:
+        for item in staged:
+            discard_upload(item)
+        raise PhotoImportError("archive must be a valid zip file.") from error
+    except BaseException:
+        for item in staged:
+            discard_upload(item)
+        raise
+    return staged, skipped, tags_csv
+
+
+def stage_import_directory(directory: Path, upload_dir: Path) -> tuple[list[dict], list[dict]]:
+    staged: list[dict] = []
+    skipped: list[dict] = []
+    try:
+        for path in sorted(directory.rglob("*")):
+            if not path.is_file() or path.name.startswith(".") or path.name.lower() == IMPORT_TAGS_CSV_NAME:
+                continue
+            if path.suffix.lower() not in ALLOWED_DRESS_EXTENSIONS:
+                skipped.append({"filename": path.name, "reason": "unsupported file type"})
+                continue
+            with path.open("rb") as source:
+                staged.append(stage_import_file(source, path.name, upload_dir))
+    except BaseException:
+        for item in staged:
+            discard_upload(item)
+        raise
+    return staged, skipped
+
+
+def parse_import_tags_csv(text: str) -> dict[str, dict]:
+    # Sidecar columns: filename, tags (separated by ";" or "|") and an optional price.
+    metadata: dict[str, dict] = {}
+    for line_number, row in enumerate(csv.DictReader(io.StringIO(text)), start=2):
+        filename = Path((row.get("filename") or "").strip()).name
+        if not filename:
+            continue
+        tags = [tag.strip() for tag in re.split(r"[;|]", row.get("tags") or "") if tag.strip()]
+        raw_price = (row.get("price") or "").strip()
+        try:
+            price = float(raw_price) if raw_price else None
+        except ValueError:
+            raise PhotoImportError(f"{IMPORT_TAGS_CSV_NAME} line {line_number}: price must be a number.") from None
+        if price is not None and price < 0:
+            raise PhotoImportError(f"{IMPORT_TAGS_CSV_NAME} line {line_number}: price must be positive.")
+        metadata[filename] = {"tags": tags, "price": price}
+    return metadata
+
+
+@timed
+def import_store_dress_photos(
+    store_id: int, staged: list[dict], metadata: dict[str, dict] | None = None
+) -> dict:
+    metadata = metadata or {}
+    created_at = datetime.now(timezone.utc).isoformat()
+    rows = []
+    tags_by_path: dict[str, list[str]] = {}
+    skipped = []
+    created_blobs: list[Path] = []
+    jobs: list[str] = []
+    conn = get_db_connection()
+    try:
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            known_hashes = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT content_hash FROM store_dress_photos WHERE store_id = ? AND content_hash IS NOT NULL",
+                    (store_id,),
+                ).fetchall()
+            }
+            for item in staged:
+                extension = Path(item["filename"]).suffix.lower()
+                if extension not in ALLOWED_DRESS_EXTENSIONS:
+                    skipped.append({"filename": item["filename"], "reason": "unsupported file type"})
+                    discard_upload(item)
+                    continue
+                if not item["size"] or item["sha256"] in known_hashes:
+                    reason = "duplicate" if item["size"] else "empty file"
+                    skipped.append({"filename": item["filename"], "reason": reason})
+                    discard_upload(item)
+                    continue
+                known_hashes.add(item["sha256"])
+                photo_path, status, derivatives_json, needs_job = acquire_photo_blob(
+                    conn, item["sha256"], extension, item["path"]
+                )
+                if needs_job:
+                    created_blobs.append(BASE_DIR / photo_path)
+                    if status == "processing":
+                        jobs.append(photo_path)
+                photo_metadata = metadata.get(Path(item["filename"]).name) or {}
+                tags = photo_metadata.get("tags") or []
+                tags_by_path[photo_path] = tags
+                rows.append(
+                    (
+                        store_id,
+                        photo_path,
+                        photo_metadata.get("price"),
+                        json.dumps(tags),
+                        status,
+                        derivatives_json,
+                        item["sha256"],
+                        created_at,
+                    )
+                )
+            if rows:
+                conn.executemany(
+                    """
+                    INSERT INTO store_dress_photos
+                      (store_id, photo_path, price, tags_json, status, derivatives_json, content_hash, created_at)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    rows,
+                )
+                inserted = conn.execute(
+                    """
+                    SELECT id, photo_path
+                    FROM store_dress_photos
+                    WHERE store_id = ? AND photo_path IN (SELECT value FROM json_each(?))
+                    """,
+                    (store_id, json.dumps(list(tags_by_path))),
+                ).fetchall()
+                conn.executemany(
+                    "INSERT INTO dress_tags (photo_id, tag_id, store_id) VALUES (?, ?, ?)",
+                    [
+                        (photo_id, tag_id, store_id)
+                        for photo_id, photo_path in inserted
+                        for tag_id in normalize_tag_ids(tags_by_path[photo_path])
+                    ],
+                )
+                conn.execute(
+                    "UPDATE stores SET dress_photo_path = ? WHERE id = ?",
+                    (rows[-1][1], store_id),
+                )
+                bump_store_photos_version(conn, store_id)
+    except BaseException:
+        # The transaction rolled back, so blobs first created by this import are unreferenced.
+        for path in created_blobs:
+            path.unlink(missing_ok=True)
+        for item in staged:
+            discard_upload(item)
+        raise
+    for photo_path in jobs:
+        submit_image_job(photo_path)
+    return {
+        "imported": [build_store_dress_photo(*row[1:6]) for row in rows],
+        "skipped": skipped,
+    }
+
+
+def import_photos_command(store_id: int, directory: Path, tags_csv: Path | None) -> int:
+    init_db()
+    if not fetch_store_by_id(store_id, include_photos=False):
+        print(f"Store {store_id} not found.")
+        return 1
+    if not directory.is_dir():
+        print(f"{directory} is not a directory.")
+        return 1
+    tags_csv = tags_csv or directory / IMPORT_TAGS_CSV_NAME
+    try:
+        metadata = parse_import_tags_csv(tags_csv.read_text("utf-8-sig")) if tags_csv.is_file() else {}
+        staged, skipped = stage_import_directory(directory, get_store_photo_dir(store_id))
+        result = import_store_dress_photos(store_id, staged, metadata)
+    except PhotoImportError as error:
+        print(error)
+        return 1
+    finally:
+        # Derivatives are generated here, so wait for the pool before exiting.
+        shutdown_image_jobs()
+    for item in skipped + result["skipped"]:
+        print(f"skipped {item['filename']}: {item['reason']}")
+    print(f"Imported {len(result['imported'])} photos into store {store_id}.")
+    return 0
+
+
+@timed
+def remove_store_dress_photo(store_id: int, photo_path: str) -> bool:
     normalized_photo_path = (photo_path or "").strip()
     if not normalized_photo_path:
         return False
-    with sqlite3.connect(DB_PATH) as conn:
-        deleted = conn.execute(
-            """
-            DELETE FROM store_dress_photos
-            WHERE store_id = ? AND photo_path = ?
-            """,
+    conn = get_db_connection()
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        photo_row = conn.execute(
+            "SELECT id, content_hash FROM store_dress_photos WHERE store_id = ? AND photo_path = ?",
             (store_id, normalized_photo_path),
-        )
-        if deleted.rowcount < 1:
+        ).fetchone()
+        if not photo_row:
             return False
+        conn.execute("DELETE FROM store_dress_photos WHERE id = ?", (photo_row[0],))
+        conn.execute("DELETE FROM dress_tags WHERE photo_id = ?", (photo_row[0],))
         latest_photo_row = conn.execute(
             """
             SELECT photo_path
@@ -390,16 +1706,77 @@ def remove_store_dress_photo(store_id: int, photo_path: str) -> bool:
             "UPDATE stores SET dress_photo_path = ? WHERE id = ?",
             ((latest_photo_row[0] if latest_photo_row else None), store_id),
         )
-
-    full_photo_path = BASE_DIR / normalized_photo_path
-    if full_photo_path.exists() and full_photo_path.is_file():
-        full_photo_path.unlink()
+        version = bump_store_photos_version(conn, store_id)
+        # Shared blobs stay on disk until their last reference is removed.
+        last_reference = release_photo_blob(conn, photo_row[1])
+    update_store_tag_index(store_id, version, photo_row[0], None)
+    if last_reference:
+        delete_unreferenced_blob(conn, normalized_photo_path, photo_row[1])
     return True
 
 
-def fetch_store_by_id(store_id: int) -> dict | None:
-    with sqlite3.connect(DB_PATH) as conn:
-        conn.row_factory = sqlite3.Row
+def delete_unreferenced_blob(
+    conn: sqlite3.Connection, photo_path: str, content_hash: str | None
+) -> None:
+    # Runs after the release has committed, so a failed transaction never loses the file.
+    # The new write lock orders the unlink with an upload that re-creates the same blob.
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if conn.execute("SELECT 1 FROM photo_blobs WHERE content_hash = ?", (content_hash,)).fetchone():
+            return
+        (BASE_DIR / photo_path).unlink(missing_ok=True)
+        forget_static_file(str(BASE_DIR / photo_path))
+        remove_dress_photo_derivatives(photo_path)
+        blob_dir = (BASE_DIR / photo_path).parent
+        if blob_dir.parent == PHOTO_BLOB_BASE_DIR:
+            try:
+                # Fails while other blobs share the hash prefix, which is fine.
+                blob_dir.rmdir()
+            except OSError:
+                pass
+
+
+def get_photo_storage_report() -> dict:
+    # Logical bytes are what storing every store's photos separately would take.
+    report = {"blobs": 0, "references": 0, "blob_bytes": 0, "logical_bytes": 0, "missing_files": 0}
+    with get_db_connection() as conn:
+        rows = conn.execute("SELECT photo_path, refcount FROM photo_blobs").fetchall()
+    for photo_path, refcount in rows:
+        paths = [photo_path] + [
+            get_derivative_path(photo_path, width, extension)
+            for width in DERIVATIVE_WIDTHS
+            for extension in DERIVATIVE_FORMATS
+        ]
+        size = 0
+        for index, path in enumerate(paths):
+            try:
+                size += (BASE_DIR / path).stat().st_size
+            except FileNotFoundError:
+                # Derivatives are optional; only a missing original counts.
+                report["missing_files"] += index == 0
+        report["blobs"] += 1
+        report["references"] += refcount
+        report["blob_bytes"] += size
+        report["logical_bytes"] += size * refcount
+    return report
+
+
+def storage_report_command() -> int:
+    init_db()
+    report = get_photo_storage_report()
+    saved = report["logical_bytes"] - report["blob_bytes"]
+    share = saved / report["logical_bytes"] if report["logical_bytes"] else 0.0
+    print(f"Store photos: {report['references']}; distinct blobs: {report['blobs']}.")
+    print(f"Blob bytes on disk: {report['blob_bytes']} (originals and resized copies).")
+    print(f"Logical bytes: {report['logical_bytes']}; deduplication saves {saved} bytes ({share:.1%}).")
+    if report["missing_files"]:
+        print(f"{report['missing_files']} blobs have no file on disk.")
+    return 0
+
+
+@timed
+def fetch_store_by_id(store_id: int, include_photos: bool = True) -> dict | None:
+    with get_db_connection() as conn:
         store = conn.execute(
             """
             SELECT id, name, location, owner_email, dress_photo_path, invite_code, created_at
@@ -411,10 +1788,13 @@ def fetch_store_by_id(store_id: int) -> dict | None:
         if not store:
             return None
         payload = dict(store)
+        if not include_photos:
+            return payload
         payload["dress_photos"] = fetch_store_dress_photos(conn, store_id)
     return normalize_store_payload(payload)
 
 
+@timed
 def update_store_dress_photo_metadata(
     store_id: int, photo_path: str, price: float | None, tags: list[str]
 ) -> bool:
@@ -422,23 +1802,379 @@ def update_store_dress_photo_metadata(
     if not normalized_photo_path:
         return False
     tags_json = json.dumps(tags)
-    with sqlite3.connect(DB_PATH) as conn:
-        result = conn.execute(
+    with get_db_connection() as conn:
+        photo_row = conn.execute(
+            "SELECT id FROM store_dress_photos WHERE store_id = ? AND photo_path = ?",
+            (store_id, normalized_photo_path),
+        ).fetchone()
+        if not photo_row:
+            return False
+        conn.execute(
+            "UPDATE store_dress_photos SET price = ?, tags_json = ? WHERE id = ?",
+            (price, tags_json, photo_row[0]),
+        )
+        tag_ids = replace_dress_tags(conn, store_id, photo_row[0], tags)
+        version = bump_store_photos_version(conn, store_id)
+    update_store_tag_index(store_id, version, photo_row[0], tag_ids)
+    return True
+
+
+def bump_store_photos_version(conn: sqlite3.Connection, store_id: int) -> int:
+    # Tag and ranking indexes are keyed on this counter, so every photo mutation must bump it.
+    conn.execute("UPDATE stores SET photos_version = photos_version + 1 WHERE id = ?", (store_id,))
+    return conn.execute("SELECT photos_version FROM stores WHERE id = ?", (store_id,)).fetchone()[0]
+
+
+def update_store_tag_index(
+    store_id: int, version: int, photo_id: int, tag_ids: list[str] | None
+) -> None:
+    # Apply a committed write to the cached inverted index; tag_ids=None removes the photo.
+    with STORE_TAG_INDEX_LOCK:
+        cached = STORE_TAG_INDEX.get(store_id)
+        if cached is None:
+            return
+        if cached["version"] >= version:
+            return
+        if cached["version"] != version - 1:
+            # Another writer got in between; the next read rebuilds from dress_tags.
+            del STORE_TAG_INDEX[store_id]
+            return
+        tags = cached["tags"]
+        for tag_id in [tag_id for tag_id, photo_ids in tags.items() if photo_id in photo_ids]:
+            tags[tag_id].discard(photo_id)
+            if not tags[tag_id]:
+                del tags[tag_id]
+        for tag_id in tag_ids or []:
+            tags.setdefault(tag_id, set()).add(photo_id)
+        cached["version"] = version
+
+
+@timed
+def find_store_photo_ids_by_tags(store_id: int, tag_ids: list[str]) -> set[int] | None:
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT photos_version FROM stores WHERE id = ?", (store_id,)).fetchone()
+        if not row:
+            return None
+        version = row[0]
+        with STORE_TAG_INDEX_LOCK:
+            cached = STORE_TAG_INDEX.get(store_id)
+            if cached is None or cached["version"] != version:
+                cached = None
+        record_cache_lookup("store_tag_index", cached is not None)
+        if cached is None:
+            tags: dict[str, set[int]] = {}
+            for tag_id, photo_id in conn.execute(
+                "SELECT tag_id, photo_id FROM dress_tags WHERE store_id = ?", (store_id,)
+            ).fetchall():
+                tags.setdefault(tag_id, set()).add(photo_id)
+            cached = {"version": version, "tags": tags}
+            with STORE_TAG_INDEX_LOCK:
+                STORE_TAG_INDEX[store_id] = cached
+    with STORE_TAG_INDEX_LOCK:
+        postings = sorted((cached["tags"].get(tag_id, set()) for tag_id in tag_ids), key=len)
+        return set.intersection(*postings) if postings else set()
+
+
+def encode_dress_cursor(created_at: str, photo_id: int) -> str:
+    raw = json.dumps([created_at, photo_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_dress_cursor(cursor: str) -> tuple[str, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, photo_id = json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("cursor is invalid.") from None
+    if not isinstance(created_at, str) or not isinstance(photo_id, int):
+        raise ValueError("cursor is invalid.")
+    return created_at, photo_id
+
+
+@timed
+def fetch_store_dress_page(
+    store_id: int,
+    tag_ids: list[str],
+    min_price: float | None,
+    max_price: float | None,
+    cursor: tuple[str, int] | None,
+    limit: int,
+) -> dict | None:
+    photo_ids = find_store_photo_ids_by_tags(store_id, tag_ids)
+    if photo_ids is None:
+        return None
+    if tag_ids and not photo_ids:
+        return {"photos": [], "next_cursor": None}
+    clauses = ["store_id = ?"]
+    params: list = [store_id]
+    if tag_ids:
+        # One JSON parameter keeps large tag matches under SQLite's bound-parameter limit.
+        clauses.append("id IN (SELECT value FROM json_each(?))")
+        params.append(json.dumps(sorted(photo_ids)))
+    if min_price is not None:
+        clauses.append("price >= ?")
+        params.append(min_price)
+    if max_price is not None:
+        clauses.append("price <= ?")
+        params.append(max_price)
+    if cursor is not None:
+        clauses.append("(created_at < ? OR (created_at = ? AND id < ?))")
+        params.extend((cursor[0], cursor[0], cursor[1]))
+    with get_db_connection() as conn:
+        rows = conn.execute(
             """
-            UPDATE store_dress_photos
-            SET price = ?, tags_json = ?
+            SELECT id, created_at, photo_path, price, tags_json, derivatives_json, status
+            FROM store_dress_photos
+            WHERE {clauses}
+            ORDER BY created_at DESC, id DESC
+            LIMIT ?
+            """.format(clauses=" AND ".join(clauses)),
+            (*params, limit + 1),
+        ).fetchall()
+    next_cursor = encode_dress_cursor(rows[limit - 1][1], rows[limit - 1][0]) if len(rows) > limit else None
+    return {
+        "photos": [build_store_dress_photo(*row[2:]) for row in rows[:limit]],
+        "next_cursor": next_cursor,
+    }
+
+
+@timed
+def fetch_store_dress_photo(store_id: int, photo_path: str) -> dict | None:
+    with get_db_connection() as conn:
+        row = conn.execute(
+            """
+            SELECT photo_path, price, tags_json, derivatives_json, status
+            FROM store_dress_photos
             WHERE store_id = ? AND photo_path = ?
             """,
-            (price, tags_json, store_id, normalized_photo_path),
+            (store_id, photo_path),
+        ).fetchone()
+    return build_store_dress_photo(*row) if row else None
+
+
+@timed
+def count_store_dress_photos(store_id: int) -> int:
+    with get_db_connection() as conn:
+        return conn.execute(
+            "SELECT COUNT(*) FROM store_dress_photos WHERE store_id = ?", (store_id,)
+        ).fetchone()[0]
+
+
+def get_collation_key(text: str) -> tuple[list, list, list]:
+    # Mirrors String.prototype.localeCompare: base characters, then accents, then case.
+    primary, secondary, tertiary = [], [], []
+    for char in text:
+        symbol = COLLATION_SYMBOLS.find(char)
+        if symbol >= 0:
+            primary.append((0, symbol))
+            secondary.append(())
+            tertiary.append(0)
+            continue
+        decomposed = unicodedata.normalize("NFD", char)
+        base = decomposed[0]
+        if base.isdigit():
+            primary.append((1, int(base)))
+        elif base.isalpha():
+            primary.append((2, base.lower()))
+        else:
+            primary.append((3, ord(base)))
+        secondary.append(tuple(ord(mark) for mark in decomposed[1:]))
+        tertiary.append(int(base.isupper()))
+    return primary, secondary, tertiary
+
+
+def build_ranking_index(photos: list[dict], version: int) -> dict:
+    vocabulary: dict[str, int] = {}
+    postings: dict[str, list[tuple[int, int]]] = {}
+    normalized_tags = []
+    for row, photo in enumerate(photos):
+        tags = [normalize_token(tag) for tag in photo.get("tags") or []]
+        tags = [tag for tag in tags if tag]
+        normalized_tags.append(tags)
+        # Repeated tags count once per occurrence, matching the client-side score sum.
+        for tag, count in Counter(tags).items():
+            vocabulary.setdefault(tag, len(vocabulary))
+            postings.setdefault(tag, []).append((row, count))
+    paths = [photo.get("photo_path") or "" for photo in photos]
+    # Ties break on the path in the order the client's localeCompare sort used; sorted() is
+    # stable like Array.prototype.sort, so identical keys keep the photo order.
+    path_rank = [0] * len(paths)
+    for rank, row in enumerate(sorted(range(len(paths)), key=lambda row: get_collation_key(paths[row]))):
+        path_rank[row] = rank
+    index = {
+        "version": version,
+        "photos": photos,
+        "normalized_tags": normalized_tags,
+        "path_rank": path_rank,
+        "vocabulary": vocabulary,
+        "postings": postings,
+    }
+    if numpy is not None:
+        # Dress x tag matrix in coordinate form: scoring is a sparse mat-vec via bincount.
+        entries = [(row, vocabulary[tag], count) for tag, items in postings.items() for row, count in items]
+        coords = numpy.array(entries, dtype=numpy.int64).reshape(-1, 3)
+        index["rows"] = coords[:, 0]
+        index["cols"] = coords[:, 1]
+        index["counts"] = coords[:, 2].astype(numpy.float64)
+        index["path_rank_array"] = numpy.array(path_rank, dtype=numpy.int64)
+    return index
+
+
+@timed
+def get_store_ranking_index(store_id: int) -> dict | None:
+    with get_db_connection() as conn:
+        row = conn.execute("SELECT photos_version FROM stores WHERE id = ?", (store_id,)).fetchone()
+        if not row:
+            return None
+        version = row[0]
+        with RANKING_INDEX_LOCK:
+            cached = RANKING_INDEX_CACHE.get(store_id)
+            hit = cached is not None and cached["version"] == version
+            if hit:
+                RANKING_INDEX_CACHE.move_to_end(store_id)
+        record_cache_lookup("ranking_index", hit)
+        if hit:
+            return cached
+        photos = fetch_store_dress_photos(conn, store_id)
+    index = build_ranking_index(photos, version)
+    with RANKING_INDEX_LOCK:
+        RANKING_INDEX_CACHE[store_id] = index
+        RANKING_INDEX_CACHE.move_to_end(store_id)
+        while len(RANKING_INDEX_CACHE) > RANKING_INDEX_CACHE_LIMIT:
+            RANKING_INDEX_CACHE.popitem(last=False)
+    return index
+
+
+def build_preference_scores(likes: list[list], dislikes: list[list]) -> dict[str, int]:
+    scores: dict[str, int] = {}
+    for items, delta in ((likes, 1), (dislikes, -1)):
+        for tags in items:
+            for tag in {normalize_token(tag) for tag in tags} - {""}:
+                scores[tag] = scores.get(tag, 0) + delta
+    return scores
+
+
+@timed
+def rank_store_dresses(
+    index: dict, preferences: dict[str, int], limit: int, offset: int = 0
+) -> list[dict]:
+    photos = index["photos"]
+    count = len(photos)
+    # Pages are slices of the full ordering, so the top offset + limit dresses are ranked.
+    limit = min(offset + limit, count)
+    if offset >= limit:
+        return []
+    if numpy is not None:
+        weights = numpy.zeros(len(index["vocabulary"]) or 1)
+        for tag, score in preferences.items():
+            column = index["vocabulary"].get(tag)
+            if column is not None:
+                weights[column] = score
+        scores = numpy.bincount(
+            index["rows"], weights=index["counts"] * weights[index["cols"]], minlength=count
         )
-    return result.rowcount > 0
+        candidates = numpy.arange(count)
+        if limit < count:
+            # Keep everything tied with the k-th best score so path order breaks ties exactly.
+            threshold = numpy.partition(scores, count - limit)[count - limit]
+            candidates = numpy.flatnonzero(scores >= threshold)
+        order = numpy.lexsort((index["path_rank_array"][candidates], -scores[candidates]))
+        ranked = [(int(row), int(scores[row])) for row in candidates[order[offset:limit]]]
+    else:
+        totals = [0] * count
+        for tag, score in preferences.items():
+            for row, occurrences in index["postings"].get(tag, ()):
+                totals[row] += score * occurrences
+        path_rank = index["path_rank"]
+        rows = heapq.nsmallest(limit, range(count), key=lambda row: (-totals[row], path_rank[row]))
+        ranked = [(row, totals[row]) for row in rows[offset:]]
+    return [
+        {**photos[row], "score": score, "normalized_tags": index["normalized_tags"][row]}
+        for row, score in ranked
+    ]
 
 
+@timed
 def load_tag_options() -> dict:
     with TAG_OPTIONS_PATH.open("r", encoding="utf-8") as file:
         return json.load(file)
 
 
+def get_tag_options_locales(tag_options: dict) -> frozenset[str]:
+    locales = set()
+    for category in tag_options.get("categories") or []:
+        for labels in [category.get("label")] + [tag.get("label") for tag in category.get("tags") or []]:
+            if isinstance(labels, dict):
+                locales.update(labels)
+    return frozenset(locales)
+
+
+def get_cached_tag_options() -> tuple[dict, frozenset[str]]:
+    signature = get_file_signature(TAG_OPTIONS_PATH)
+    with TAG_OPTIONS_LOCK:
+        if TAG_OPTIONS_CACHE["signature"] == signature and TAG_OPTIONS_CACHE["options"] is not None:
+            return TAG_OPTIONS_CACHE["options"], TAG_OPTIONS_CACHE["locales"]
+    options = load_tag_options()
+    locales = get_tag_options_locales(options)
+    with TAG_OPTIONS_LOCK:
+        if TAG_OPTIONS_CACHE["signature"] != signature:
+            TAG_OPTIONS_CACHE["views"] = {}
+        TAG_OPTIONS_CACHE.update(signature=signature, options=options, locales=locales)
+    return options, locales
+
+
+def build_tag_options_view(tag_options: dict, locale: str) -> dict:
+    default_locale = tag_options.get("defaultLocale") or "en"
+    categories = []
+    tag_categories: dict[str, str] = {}
+    for category in tag_options.get("categories") or []:
+        tags = []
+        for tag in category.get("tags") or []:
+            normalized_id = normalize_token(tag.get("id"))
+            tags.append(
+                {
+                    "id": tag.get("id"),
+                    "normalizedId": normalized_id,
+                    "label": get_localized_value(tag.get("label"), locale, default_locale) or tag.get("id"),
+                }
+            )
+            tag_categories.setdefault(normalized_id, category.get("id"))
+        categories.append(
+            {
+                "id": category.get("id"),
+                "label": get_localized_value(category.get("label"), locale, default_locale)
+                or category.get("id"),
+                "tags": tags,
+            }
+        )
+    return {
+        "locale": locale,
+        "defaultLocale": default_locale,
+        "categories": categories,
+        "tagCategories": tag_categories,
+    }
+
+
+def get_tag_options_response(locale: str) -> tuple[bytes, str]:
+    # "" is the raw file; any other value gets the localized view, unknown locales the default one.
+    options, locales = get_cached_tag_options()
+    if locale and locale not in locales:
+        locale = options.get("defaultLocale") or "en"
+    with TAG_OPTIONS_LOCK:
+        views = TAG_OPTIONS_CACHE["views"]
+        cached = views.get(locale)
+    record_cache_lookup("tag_options", cached is not None)
+    if cached is not None:
+        return cached
+    payload = build_tag_options_view(options, locale) if locale else options
+    body = json.dumps(payload).encode("utf-8")
+    cached = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    with TAG_OPTIONS_LOCK:
+        # A reload while this view was built swaps the dict, so a stale view is simply dropped.
+        views[locale] = cached
+    return cached
+
+
 def load_content() -> dict:
     with CONTENT_PATH.open("r", encoding="utf-8") as file:
         return json.load(file)
@@ -457,11 +2193,7 @@ def resolve_image_src(src: str | None) -> str | None:
     if source_path.suffix.lower() in {".png", ".jpg", ".jpeg"}:
         return src
     base = source_path.with_suffix("")
-    for suffix in (".png", ".jpg", ".jpeg"):
-        candidate = f"{base}{suffix}"
-        if (BASE_DIR / candidate).exists():
-            return candidate
-    return None
+    return find_existing_file(tuple(f"{base}{suffix}" for suffix in (".png", ".jpg", ".jpeg")))
 
 
 def render_language_switcher(locales: dict, active_locale: str, base_path: str) -> str:
@@ -485,7 +2217,7 @@ def render_hero(copy: dict) -> str:
     if image_src:
         image_html = (
             f'<div class="hero-media">'
-            f'<img src="{escape(image_src)}" '
+            f'<img src="{escape(asset_url(image_src))}" '
             f'alt="{escape(image.get("alt"))}" loading="lazy" />'
             f"</div>"
         )
@@ -564,7 +2296,7 @@ def render_split(copy: dict) -> str:
     if image_src:
         image_html = (
             f'<div class="split-media">'
-            f'<img src="{escape(image_src)}" '
+            f'<img src="{escape(asset_url(image_src))}" '
             f'alt="{escape(image.get("alt"))}" loading="lazy" />'
             f"</div>"
         )
@@ -749,7 +2481,7 @@ def render_dashboard(copy: dict) -> str:
                 data-manager="{manager}"
                 data-invite="{invite}"
                 data-photo-url="{photo_url}"
-                data-photo-urls='{photo_urls}'
+                data-photo-count="{photo_count}"
                 data-store-id="{store_id}"
               >
                 <span class="store-name">{name}</span>
@@ -761,7 +2493,7 @@ def render_dashboard(copy: dict) -> str:
                 manager=escape(store.get("manager")),
                 invite=escape(store.get("inviteCode")),
                 photo_url=escape(store.get("photoUrl") or get_default_dress_photo_path()),
-                photo_urls=escape(json.dumps(store.get("dress_photo_urls") or [])),
+                photo_count=escape(len(store.get("dress_photo_urls") or [])),
                 store_id=escape(store.get("id")),
             )
         )
@@ -1068,8 +2800,10 @@ def build_sections(content: dict, locale: str, page_id: str) -> str:
     return "".join(sections)
 
 
-def render_page(locale: str, page_id: str) -> str:
-    content = load_content()
+@timed
+def render_page(locale: str, page_id: str, content: dict | None = None) -> str:
+    if content is None:
+        content = load_content()
     default_locale = content.get("defaultLocale")
     if locale not in content.get("locales", {}):
         locale = default_locale
@@ -1091,492 +2825,1588 @@ def render_page(locale: str, page_id: str) -> str:
         language_switcher=language_switcher,
         sections=sections,
         html_lang=locale,
+        styles_url=asset_url("/styles.css"),
+        app_url=asset_url("/app.js"),
     )
 
 
-class LandingHandler(SimpleHTTPRequestHandler):
-    def do_POST(self) -> None:
-        parsed = urlparse(self.path)
-        dress_photo_match = re.fullmatch(r"/api/stores/(\d+)/dress-photo", parsed.path)
-        if dress_photo_match:
-            store_id = int(dress_photo_match.group(1))
-            store = fetch_store_by_id(store_id)
-            if not store:
-                self.send_response(404)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Store not found."}).encode("utf-8"))
-                return
-            content_type = self.headers.get("Content-Type") or ""
-            if "multipart/form-data" not in content_type:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "multipart/form-data is required."}).encode("utf-8")
-                )
-                return
-
-            form = FieldStorage(
-                fp=self.rfile,
-                headers=self.headers,
-                environ={
-                    "REQUEST_METHOD": "POST",
-                    "CONTENT_TYPE": content_type,
-                    "CONTENT_LENGTH": self.headers.get("Content-Length", "0"),
-                },
-            )
-            upload = form["dress_photo"] if "dress_photo" in form else None
-            owner_email = (
-                form["owner_email"].value.strip().lower()
-                if "owner_email" in form and getattr(form["owner_email"], "value", "")
-                else ""
-            )
-            if owner_email != (store.get("owner_email") or "").strip().lower():
-                self.send_response(403)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps(
-                        {"error": "Only the store owner can upload dress photos."}
-                    ).encode("utf-8")
-                )
-                return
-            if upload is None or not getattr(upload, "filename", ""):
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "dress_photo is required."}).encode("utf-8")
-                )
-                return
-            content = upload.file.read() if upload.file else b""
-            if not content:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Uploaded file is empty."}).encode("utf-8")
-                )
-                return
-            photo_path = save_store_dress_photo(store_id, upload.filename, content)
-            if not photo_path:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps(
-                        {
-                            "error": "Only .png, .jpg, .jpeg, and .webp files are supported.",
-                        }
-                    ).encode("utf-8")
-                )
-                return
-            updated_store = fetch_store_by_id(store_id)
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(updated_store).encode("utf-8"))
-            return
+def get_file_signature(*paths: Path) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            signature.append(None)
+            continue
+        signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
 
-        if parsed.path == "/api/stores":
-            try:
-                length = int(self.headers.get("Content-Length", "0"))
-            except ValueError:
-                length = 0
-            payload = self.rfile.read(length).decode("utf-8") if length else ""
-            try:
-                data = json.loads(payload) if payload else {}
-            except json.JSONDecodeError:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Invalid JSON payload."}).encode("utf-8")
-                )
-                return
-
-            name = (data.get("name") or "").strip()
-            location = (data.get("location") or "").strip()
-            owner_email = (data.get("owner_email") or "").strip().lower()
-            if not name or not location or not owner_email:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps(
-                        {"error": "name, location, and owner_email are required."}
-                    ).encode("utf-8")
-                )
-                return
 
-            store = create_store(name, location, owner_email)
-            self.send_response(201)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(store).encode("utf-8"))
+def load_asset_manifest() -> dict[str, str]:
+    signature = get_file_signature(ASSET_MANIFEST_PATH)
+    with ASSET_MANIFEST_LOCK:
+        if ASSET_MANIFEST["signature"] == signature:
+            return ASSET_MANIFEST["assets"]
+    try:
+        assets = json.loads(ASSET_MANIFEST_PATH.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        assets = {}
+    with ASSET_MANIFEST_LOCK:
+        ASSET_MANIFEST["signature"] = signature
+        ASSET_MANIFEST["assets"] = assets
+    return assets
+
+
+def asset_url(path: str) -> str:
+    # Without a build, pages keep pointing at the editable sources.
+    fingerprinted = load_asset_manifest().get(path.lstrip("/"))
+    return f"/{fingerprinted}" if fingerprinted else path
+
+
+def minify_asset(name: str, data: bytes) -> bytes:
+    if name.endswith(".js") and rjsmin is not None:
+        return rjsmin.jsmin(data.decode("utf-8")).encode("utf-8")
+    if name.endswith(".css") and rcssmin is not None:
+        return rcssmin.cssmin(data.decode("utf-8")).encode("utf-8")
+    return data
+
+
+def list_asset_sources() -> list[str]:
+    # Store uploads and their blobs change at runtime and are served under their own names.
+    skipped = (STORE_DRESS_PHOTO_BASE_DIR, PHOTO_BLOB_BASE_DIR)
+    images = sorted(
+        path.relative_to(BASE_DIR).as_posix()
+        for path in ASSET_IMAGE_DIR.rglob("*")
+        if path.is_file()
+        and path.suffix.lower() in ASSET_IMAGE_EXTENSIONS
+        and not any(path.is_relative_to(directory) for directory in skipped)
+    )
+    return [*ASSET_SOURCES, *images]
+
+
+def write_file_atomically(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=".build-", delete=False) as handle:
+        handle.write(data)
+    os.replace(handle.name, path)
+
+
+def build_assets() -> dict[str, str]:
+    previous = load_asset_manifest()
+    manifest = {}
+    for source in list_asset_sources():
+        data = minify_asset(source, (BASE_DIR / source).read_bytes())
+        path = Path(source)
+        digest = hashlib.sha256(data).hexdigest()[:16]
+        target = ASSET_BUILD_DIR / path.parent / f"{path.stem}.{digest}{path.suffix}"
+        if not target.exists():
+            write_file_atomically(target, data)
+        manifest[source] = target.relative_to(BASE_DIR).as_posix()
+    # The previous build stays so pages rendered before this one still load; anything older goes.
+    keep = {*manifest.values(), *previous.values()}
+    for path in ASSET_BUILD_DIR.rglob("*"):
+        if path.is_file() and path != ASSET_MANIFEST_PATH and path.relative_to(BASE_DIR).as_posix() not in keep:
+            path.unlink()
+    write_file_atomically(ASSET_MANIFEST_PATH, (json.dumps(manifest, indent=2) + "\n").encode("utf-8"))
+    return manifest
+
+
+def build_assets_command() -> int:
+    if rjsmin is None or rcssmin is None:
+        print("build-assets needs rjsmin and rcssmin; run `pip install -r requirements.txt`.")
+        return 1
+    manifest = build_assets()
+    for source, target in manifest.items():
+        before = (BASE_DIR / source).stat().st_size
+        after = (BASE_DIR / target).stat().st_size
+        print(f"{source} -> {target} ({before} -> {after} bytes)")
+    print(f"Wrote {ASSET_MANIFEST_PATH.relative_to(BASE_DIR)}.")
+    return 0
+
+
+def render_page_bytes(locale: str, page_id: str) -> tuple[bytes, bool]:
+    global _page_cache_signature, _page_cache_content
+    # The manifest is part of the signature so a new build re-renders pages with the new URLs.
+    signature = get_file_signature(CONTENT_PATH, TEMPLATE_PATH, ASSET_MANIFEST_PATH)
+    with PAGE_CACHE_LOCK:
+        if signature != _page_cache_signature:
+            PAGE_CACHE.clear()
+            _page_cache_signature = signature
+            _page_cache_content = None
+        content = _page_cache_content
+    if content is None:
+        content = load_content()
+        with PAGE_CACHE_LOCK:
+            if signature == _page_cache_signature:
+                _page_cache_content = content
+    if locale not in content.get("locales", {}):
+        locale = content.get("defaultLocale")
+    key = (locale, page_id)
+    with PAGE_CACHE_LOCK:
+        body = PAGE_CACHE.get(key)
+        PAGE_CACHE_STATS["hits" if body is not None else "misses"] += 1
+    record_cache_lookup("page", body is not None)
+    if body is not None:
+        return body, True
+    body = render_page(locale, page_id, content).encode("utf-8")
+    with PAGE_CACHE_LOCK:
+        # Skip storing if the files changed while rendering; the next request re-renders.
+        if signature == _page_cache_signature:
+            PAGE_CACHE[key] = body
+    return body, False
+
+
+def page_cache_stats() -> dict:
+    with PAGE_CACHE_LOCK:
+        return {**PAGE_CACHE_STATS, "entries": len(PAGE_CACHE)}
+
+
+def choose_content_encoding(accept_encoding: str | None) -> str | None:
+    accepted = {}
+    for item in (accept_encoding or "").split(","):
+        coding, _, params = item.strip().partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            accepted[coding.lower()] = quality
+    for coding in ("br", "gzip"):
+        if coding == "br" and brotli is None:
+            continue
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def compress_body(body: bytes, encoding: str, cached: bool) -> bytes:
+    # Cached variants are compressed once, so they get the slow, dense settings.
+    if encoding == "br":
+        return brotli.compress(body, quality=11 if cached else 4)
+    return gzip.compress(body, compresslevel=9 if cached else 5, mtime=0)
+
+
+def get_compressed_variant(key: tuple, token: object, encoding: str, load_body) -> bytes:
+    cache_key = (key, encoding)
+    global _compression_cache_bytes
+    with COMPRESSION_CACHE_LOCK:
+        cached = COMPRESSION_CACHE.get(cache_key)
+        if cached is not None:
+            COMPRESSION_CACHE.move_to_end(cache_key)
+    hit = bool(cached) and (cached[0] is token or cached[0] == token)
+    record_cache_lookup("compression", hit)
+    if hit:
+        return cached[1]
+    compressed = compress_body(load_body(), encoding, cached=True)
+    with COMPRESSION_CACHE_LOCK:
+        previous = COMPRESSION_CACHE.pop(cache_key, None)
+        if previous is not None:
+            _compression_cache_bytes -= len(previous[1])
+        COMPRESSION_CACHE[cache_key] = (token, compressed)
+        _compression_cache_bytes += len(compressed)
+        # Evicting least recently used variants one at a time keeps hot assets compressed.
+        while COMPRESSION_CACHE and (
+            len(COMPRESSION_CACHE) > COMPRESSION_CACHE_LIMIT
+            or _compression_cache_bytes > COMPRESSION_CACHE_MAX_BYTES
+        ):
+            _compression_cache_bytes -= len(COMPRESSION_CACHE.popitem(last=False)[1][1])
+    return compressed
+
+
+class RangeNotSatisfiable(ValueError):
+    pass
+
+
+def parse_byte_range(header: str | None, size: int) -> tuple[int, int] | None:
+    # Only a single range is supported; anything else falls back to a full 200 response.
+    match = BYTE_RANGE_PATTERN.fullmatch((header or "").strip())
+    if not match or not (match.group(1) or match.group(2)):
+        return None
+    if not match.group(1):
+        length = int(match.group(2))
+        if length == 0 or size == 0:
+            raise RangeNotSatisfiable()
+        return max(0, size - length), size - 1
+    start = int(match.group(1))
+    end = int(match.group(2)) if match.group(2) else size - 1
+    if match.group(2) and end < start:
+        return None
+    if start >= size:
+        raise RangeNotSatisfiable()
+    return start, min(end, size - 1)
+
+
+class StaticFileHandle:
+    def __init__(self, path: str, fd: int, signature: tuple) -> None:
+        self.path = path
+        self.fd = fd
+        self.signature = signature
+        self.refs = 0
+        self.retired = False
+
+
+STATIC_FILE_CACHE: OrderedDict[str, StaticFileHandle] = OrderedDict()
+STATIC_FILE_CACHE_LOCK = threading.Lock()
+
+
+def acquire_static_file(path: str) -> tuple[StaticFileHandle, os.stat_result]:
+    # Keeps hot files open so repeat requests skip open()/close(); one stat() validates the entry.
+    stat = os.stat(path)
+    if not S_ISREG(stat.st_mode):
+        raise IsADirectoryError(path)
+    signature = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    with STATIC_FILE_CACHE_LOCK:
+        handle = STATIC_FILE_CACHE.get(path)
+        if handle is not None and handle.signature == signature:
+            STATIC_FILE_CACHE.move_to_end(path)
+            handle.refs += 1
+        else:
+            handle = None
+    record_cache_lookup("static_file", handle is not None)
+    if handle is not None:
+        return handle, stat
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    stat = os.fstat(fd)
+    handle = StaticFileHandle(path, fd, (stat.st_ino, stat.st_mtime_ns, stat.st_size))
+    handle.refs = 1
+    with STATIC_FILE_CACHE_LOCK:
+        previous = STATIC_FILE_CACHE.pop(path, None)
+        if previous is not None:
+            retire_static_file(previous)
+        STATIC_FILE_CACHE[path] = handle
+        while len(STATIC_FILE_CACHE) > STATIC_FILE_CACHE_LIMIT:
+            retire_static_file(STATIC_FILE_CACHE.popitem(last=False)[1])
+    return handle, stat
+
+
+def retire_static_file(handle: StaticFileHandle) -> None:
+    handle.retired = True
+    if handle.refs == 0:
+        os.close(handle.fd)
+
+
+def forget_static_file(path: str) -> None:
+    # A cached descriptor would keep an unlinked file's disk space in use until eviction.
+    with STATIC_FILE_CACHE_LOCK:
+        handle = STATIC_FILE_CACHE.pop(path, None)
+        if handle is not None:
+            retire_static_file(handle)
+    with STATIC_ETAG_LOCK:
+        STATIC_ETAGS.pop(path, None)
+
+
+def release_static_file(handle: StaticFileHandle) -> None:
+    with STATIC_FILE_CACHE_LOCK:
+        handle.refs -= 1
+        if handle.retired and handle.refs == 0:
+            os.close(handle.fd)
+
+
+class StaticFileBody:
+    def __init__(self, handle: StaticFileHandle, offset: int, count: int) -> None:
+        self.handle = handle
+        self.offset = offset
+        self.count = count
+        self.closed = False
+
+    def send_to(self, sock: socket.socket) -> None:
+        offset, remaining = self.offset, self.count
+        if not SENDFILE_ENABLED or not hasattr(os, "sendfile"):
+            with open(self.handle.path, "rb") as file:
+                file.seek(offset)
+                while remaining > 0:
+                    chunk = file.read(min(UPLOAD_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        break
+                    sock.sendall(chunk)
+                    remaining -= len(chunk)
             return
-        if parsed.path == "/api/stores/join":
-            try:
-                length = int(self.headers.get("Content-Length", "0"))
-            except ValueError:
-                length = 0
-            payload = self.rfile.read(length).decode("utf-8") if length else ""
+        timeout = sock.gettimeout()
+        while remaining > 0:
             try:
-                data = json.loads(payload) if payload else {}
-            except json.JSONDecodeError:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Invalid JSON payload."}).encode("utf-8")
+                # Explicit offsets keep the shared descriptor safe across threads.
+                sent = os.sendfile(
+                    sock.fileno(), self.handle.fd, offset, min(remaining, SENDFILE_CHUNK_SIZE)
                 )
-                return
+            except BlockingIOError:
+                if not select.select([], [sock], [], timeout)[1]:
+                    raise TimeoutError("Timed out sending static file.")
+                continue
+            if sent == 0:
+                raise ConnectionError("Static file ended before Content-Length was sent.")
+            offset += sent
+            remaining -= sent
 
-            invite_code = (data.get("invite_code") or "").strip().upper()
-            member_email = (data.get("member_email") or "").strip().lower()
-            if not invite_code or not member_email:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps(
-                        {"error": "invite_code and member_email are required."}
-                    ).encode("utf-8")
-                )
-                return
+    def close(self) -> None:
+        if not self.closed:
+            self.closed = True
+            release_static_file(self.handle)
 
-            store = join_store(invite_code, member_email)
-            if not store:
-                self.send_response(404)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Invite code not found."}).encode("utf-8")
-                )
-                return
 
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(store).encode("utf-8"))
-            return
+def get_static_etag(path: str, stat: os.stat_result) -> str:
+    signature = (stat.st_mtime_ns, stat.st_size)
+    with STATIC_ETAG_LOCK:
+        cached = STATIC_ETAGS.get(path)
+    record_cache_lookup("static_etag", bool(cached) and cached[0] == signature)
+    if cached and cached[0] == signature:
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    etag = f'"{digest.hexdigest()[:32]}"'
+    with STATIC_ETAG_LOCK:
+        STATIC_ETAGS[path] = (signature, etag)
+    return etag
 
-        self.send_response(404)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps({"error": "Not found."}).encode("utf-8"))
 
-    def do_PUT(self) -> None:
-        parsed = urlparse(self.path)
-        if parsed.path == "/api/default-dress-metadata":
-            try:
-                length = int(self.headers.get("Content-Length", "0"))
-            except ValueError:
-                length = 0
-            payload = self.rfile.read(length).decode("utf-8") if length else ""
+def get_static_cache_control(path: str) -> str:
+    if IMMUTABLE_ASSET_PATTERN.fullmatch(os.path.basename(path)):
+        return IMMUTABLE_CACHE_CONTROL
+    return STATIC_CACHE_CONTROL
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def is_not_modified(headers, etag: str, mtime: float) -> bool:
+    if_none_match = headers.get("If-None-Match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("If-Modified-Since")
+    if not if_modified_since:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return int(mtime) <= since.timestamp()
+
+
+def format_metric_labels(labels: dict) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        )
+        for name, value in labels.items()
+    )
+
+
+def format_histogram(lines: list[str], name: str, labels: dict, histogram: list) -> None:
+    label_text = format_metric_labels(labels)
+    prefix = f"{label_text}," if label_text else ""
+    cumulative = 0
+    for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), histogram):
+        cumulative += count
+        lines.append(f'{name}_bucket{{{prefix}le="{bound}"}} {cumulative}')
+    lines.append(f"{name}_sum{{{label_text}}} {histogram[-1]:.6f}")
+    lines.append(f"{name}_count{{{label_text}}} {cumulative}")
+
+
+def render_metrics() -> bytes:
+    # Counters are per process; in prefork mode each worker reports its own.
+    with METRICS_LOCK:
+        request_latency = {key: list(value) for key, value in REQUEST_LATENCY.items()}
+        request_counts = dict(REQUEST_COUNTS)
+        operation_latency = {key: list(value) for key, value in OPERATION_LATENCY.items()}
+        cache_lookups = dict(CACHE_LOOKUPS)
+        traffic = dict(TRAFFIC_BYTES)
+    jobs = image_job_stats()
+    with COMPRESSION_CACHE_LOCK:
+        compression_entries = len(COMPRESSION_CACHE)
+    with STATIC_FILE_CACHE_LOCK:
+        static_file_entries = len(STATIC_FILE_CACHE)
+    with RANKING_INDEX_LOCK:
+        ranking_entries = len(RANKING_INDEX_CACHE)
+    with STORE_TAG_INDEX_LOCK:
+        tag_index_entries = len(STORE_TAG_INDEX)
+    with TAG_OPTIONS_LOCK:
+        tag_options_entries = len(TAG_OPTIONS_CACHE["views"])
+    with FILE_PROBE_LOCK:
+        file_probe_entries = len(FILE_PROBE_CACHE)
+    cache_entries = {
+        "page": page_cache_stats()["entries"],
+        "compression": compression_entries,
+        "static_file": static_file_entries,
+        "ranking_index": ranking_entries,
+        "store_tag_index": tag_index_entries,
+        "tag_options": tag_options_entries,
+        "file_probe": file_probe_entries,
+    }
+
+    lines = [
+        "# HELP landing_request_duration_seconds Request latency by route.",
+        "# TYPE landing_request_duration_seconds histogram",
+    ]
+    for (method, route_name), histogram in sorted(request_latency.items()):
+        format_histogram(
+            lines,
+            "landing_request_duration_seconds",
+            {"method": method, "route": route_name},
+            histogram,
+        )
+    lines += [
+        "# HELP landing_requests_total Requests by route and response status.",
+        "# TYPE landing_requests_total counter",
+    ]
+    for (method, route_name, status), count in sorted(request_counts.items()):
+        labels = format_metric_labels({"method": method, "route": route_name, "status": status})
+        lines.append(f"landing_requests_total{{{labels}}} {count}")
+    lines += [
+        "# HELP landing_http_body_bytes_total Request and response body bytes by route.",
+        "# TYPE landing_http_body_bytes_total counter",
+    ]
+    for (route_name, direction), count in sorted(traffic.items()):
+        labels = format_metric_labels({"route": route_name, "direction": direction})
+        lines.append(f"landing_http_body_bytes_total{{{labels}}} {count}")
+    lines += [
+        "# HELP landing_operation_duration_seconds Time spent in data access, scan and render helpers.",
+        "# TYPE landing_operation_duration_seconds histogram",
+    ]
+    for operation, histogram in sorted(operation_latency.items()):
+        format_histogram(
+            lines, "landing_operation_duration_seconds", {"operation": operation}, histogram
+        )
+    lines += [
+        "# HELP landing_cache_lookups_total Cache lookups by cache and result.",
+        "# TYPE landing_cache_lookups_total counter",
+    ]
+    for (cache, result), count in sorted(cache_lookups.items()):
+        labels = format_metric_labels({"cache": cache, "result": result})
+        lines.append(f"landing_cache_lookups_total{{{labels}}} {count}")
+    lines += [
+        "# HELP landing_cache_entries Entries currently held by each in-memory cache.",
+        "# TYPE landing_cache_entries gauge",
+    ]
+    for cache, count in cache_entries.items():
+        lines.append(f'landing_cache_entries{{cache="{cache}"}} {count}')
+    lines += [
+        "# HELP landing_image_jobs_queued Derivative jobs waiting or running.",
+        "# TYPE landing_image_jobs_queued gauge",
+        f"landing_image_jobs_queued {jobs['queued']}",
+        "# HELP landing_image_jobs_total Derivative jobs by outcome.",
+        "# TYPE landing_image_jobs_total counter",
+    ]
+    for outcome in ("completed", "failed", "rejected"):
+        lines.append(f'landing_image_jobs_total{{result="{outcome}"}} {jobs[outcome]}')
+    lines += [
+        "# HELP landing_image_job_seconds_total Time spent generating derivatives.",
+        "# TYPE landing_image_job_seconds_total counter",
+        f"landing_image_job_seconds_total {jobs['total_seconds']:.6f}",
+        "# HELP landing_process_start_time_seconds Start time of this server process.",
+        "# TYPE landing_process_start_time_seconds gauge",
+        f"landing_process_start_time_seconds {METRICS_STARTED_AT:.3f}",
+    ]
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+class ApiError(Exception):
+    def __init__(self, status: int, message: str, headers: dict | None = None) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers
+
+
+def route(method: str, *paths: str):
+    def register(func):
+        func.__dict__.setdefault("routes", []).extend((method, path) for path in paths)
+        return func
+
+    return register
+
+
+ROUTE_PARAM_PATTERN = re.compile(r"\{\w+\}")
+
+
+class Router:
+    def __init__(self) -> None:
+        self.static: dict[tuple[str, str], str] = {}
+        self.dynamic: dict[str, list[tuple[str, str]]] = {}
+        self.patterns: dict[str, re.Pattern] = {}
+        self.groups: dict[str, dict[int, tuple[str, int, int]]] = {}
+
+    def add(self, method: str, path: str, handler_name: str) -> None:
+        if ROUTE_PARAM_PATTERN.search(path):
+            self.dynamic.setdefault(method, []).append((path, handler_name))
+        else:
+            self.static[(method, path)] = handler_name
+
+    def compile(self) -> None:
+        # One alternation per method: the outer group index identifies the route and
+        # its placeholders are the groups that follow it.
+        for method, routes in self.dynamic.items():
+            alternatives = []
+            groups = {}
+            index = 1
+            for path, handler_name in routes:
+                parts = ROUTE_PARAM_PATTERN.split(path)
+                groups[index] = (handler_name, index, index + len(parts) - 1)
+                alternatives.append("(" + r"(\d+)".join(re.escape(part) for part in parts) + ")")
+                index += len(parts)
+            self.patterns[method] = re.compile("|".join(alternatives))
+            self.groups[method] = groups
+
+    def resolve(self, method: str, path: str) -> tuple[str, tuple[int, ...]] | None:
+        handler_name = self.static.get((method, path))
+        if handler_name is not None:
+            return handler_name, ()
+        pattern = self.patterns.get(method)
+        match = pattern.fullmatch(path) if pattern is not None else None
+        if match is None:
+            return None
+        handler_name, start, end = self.groups[method][match.lastindex]
+        return handler_name, tuple(map(int, match.groups()[start:end]))
+
+    @classmethod
+    def from_handler(cls, handler_class: type) -> "Router":
+        router = cls()
+        for name in dir(handler_class):
+            for method, path in getattr(getattr(handler_class, name), "routes", ()):
+                router.add(method, path, name)
+        router.compile()
+        return router
+
+
+def get_store_or_404(store_id: int) -> dict:
+    store = fetch_store_by_id(store_id, include_photos=False)
+    if not store:
+        raise ApiError(404, "Store not found.")
+    return store
+
+
+def require_store_owner(store: dict, owner_email: str | None, message: str) -> None:
+    if (owner_email or "").strip().lower() != (store.get("owner_email") or "").strip().lower():
+        raise ApiError(403, message)
+
+
+def parse_tags_field(raw_tags: object) -> list[str]:
+    if raw_tags is None:
+        return []
+    if not isinstance(raw_tags, list):
+        raise ApiError(400, "tags must be an array.")
+    return [str(tag).strip() for tag in raw_tags if str(tag).strip()]
+
+
+class LandingHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    timeout = IDLE_CONNECTION_TIMEOUT
+    # Headers and body go out as separate writes; on a kept-alive socket Nagle would hold the body back.
+    disable_nagle_algorithm = True
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, directory=str(BASE_DIR), **kwargs)
+
+    def setup(self) -> None:
+        super().setup()
+        self.requests_handled = 0
+
+    def handle(self) -> None:
+        self.close_connection = True
+        self.handle_one_request()
+        while not self.close_connection:
+            # Between requests the connection only waits KEEP_ALIVE_TIMEOUT; EOF or timeout ends it quietly.
+            self.connection.settimeout(KEEP_ALIVE_TIMEOUT)
             try:
-                data = json.loads(payload) if payload else {}
-            except json.JSONDecodeError:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Invalid JSON payload."}).encode("utf-8"))
-                return
-
-            photo_path = (data.get("photo_path") or "").strip()
-            raw_tags = data.get("tags")
-            if raw_tags is None:
-                raw_tags = []
-            if not isinstance(raw_tags, list):
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "tags must be an array."}).encode("utf-8"))
-                return
-            tags = [str(tag).strip() for tag in raw_tags if str(tag).strip()]
-
-            updated = update_default_dress_metadata(photo_path, tags)
-            if not updated:
-                self.send_response(404)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Default photo not found."}).encode("utf-8"))
-                return
+                if not self.rfile.peek(1):
+                    break
+            except (TimeoutError, ConnectionError):
+                break
+            self.connection.settimeout(self.timeout)
+            self.handle_one_request()
 
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"photos": fetch_default_dress_metadata()}).encode("utf-8"))
-            return
+    def handle_one_request(self) -> None:
+        self.request_started = None
+        try:
+            super().handle_one_request()
+        finally:
+            if self.request_started is not None:
+                self.requests_handled += 1
+                self.finish_request_log()
 
-        metadata_match = re.fullmatch(r"/api/stores/(\d+)/dress-photo-metadata", parsed.path)
-        if not metadata_match:
-            self.send_response(404)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "Not found."}).encode("utf-8"))
-            return
+    def parse_request(self) -> bool:
+        # Timing starts once the request line has arrived, so idle connections are not counted.
+        self.request_started = time.perf_counter()
+        self.response_status = None
+        self.response_bytes = 0
+        self.route_name = "other"
+        self.body_pending = False
+        self.connection_header_pending = False
+        parsed = super().parse_request()
+        if parsed and self.command in ("GET", "HEAD"):
+            self.route_name = "static"
+        return parsed
 
-        store_id = int(metadata_match.group(1))
-        store = fetch_store_by_id(store_id)
-        if not store:
-            self.send_response(404)
-            self.send_header("Content-Type", "application/json")
+    def send_response(self, code: int, message: str | None = None) -> None:
+        super().send_response(code, message)
+        self.connection_header_pending = True
+
+    def send_header(self, keyword: str, value: str) -> None:
+        if keyword == "Content-Length":
+            self.response_bytes = int(value)
+        elif keyword == "Connection":
+            self.connection_header_pending = False
+        super().send_header(keyword, value)
+
+    def end_headers(self) -> None:
+        if self.connection_header_pending:
+            self.connection_header_pending = False
+            # An unread request body would be parsed as the next request, so those connections close.
+            if (
+                self.close_connection
+                or self.body_pending
+                or self.requests_handled + 1 >= KEEP_ALIVE_MAX_REQUESTS
+                or self.server.is_saturated()
+            ):
+                self.send_header("Connection", "close")
+            elif self.request_version == "HTTP/1.0":
+                self.send_header("Connection", "keep-alive")
+        super().end_headers()
+
+    def log_request(self, code="-", size="-") -> None:
+        self.response_status = code
+        if ACCESS_LOG_FORMAT == "text":
+            super().log_request(code, size)
+
+    def log_message(self, format: str, *args) -> None:
+        if ACCESS_LOG_FORMAT == "json":
+            entry = {
+                "time": datetime.now(timezone.utc).isoformat(),
+                "client": self.address_string(),
+                "message": format % args,
+            }
+            sys.stderr.write(json.dumps(entry) + "\n")
+        elif ACCESS_LOG_FORMAT == "text":
+            super().log_message(format, *args)
+
+    def finish_request_log(self) -> None:
+        elapsed = time.perf_counter() - self.request_started
+        status = str(int(self.response_status)) if self.response_status is not None else "error"
+        headers = getattr(self, "headers", None)
+        try:
+            bytes_in = int(headers.get("Content-Length") or 0) if headers is not None else 0
+        except ValueError:
+            bytes_in = 0
+        # Unknown methods and unparsable requests share one label to keep cardinality bounded.
+        method = self.command if self.route_name != "other" else "other"
+        if METRICS_ENABLED:
+            record_request(method, self.route_name, status, elapsed, bytes_in, self.response_bytes)
+        if ACCESS_LOG_FORMAT == "json":
+            entry = {
+                "time": datetime.now(timezone.utc).isoformat(),
+                "client": self.address_string(),
+                "method": self.command,
+                "path": getattr(self, "path", None),
+                "route": self.route_name,
+                "status": int(self.response_status) if self.response_status is not None else None,
+                "duration_ms": round(elapsed * 1000, 3),
+                "bytes_in": bytes_in,
+                "bytes_out": self.response_bytes,
+                "user_agent": headers.get("User-Agent") if headers is not None else None,
+            }
+            sys.stderr.write(json.dumps(entry) + "\n")
+
+    def send_compressible(
+        self,
+        status: int,
+        content_type: str,
+        body: bytes,
+        cache_key: tuple | None = None,
+        headers: dict | None = None,
+    ) -> None:
+        encoding = None
+        if len(body) >= COMPRESSION_MIN_BYTES:
+            encoding = choose_content_encoding(self.headers.get("Accept-Encoding"))
+        if encoding and cache_key is not None:
+            body = get_compressed_variant(cache_key, body, encoding, lambda: body)
+        elif encoding:
+            body = compress_body(body, encoding, cached=False)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Vary", "Accept-Encoding")
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) or path.endswith("/"):
+            return super().send_head()
+        try:
+            handle, stat = acquire_static_file(path)
+        except OSError:
+            self.send_error(404, "File not found")
+            return None
+        body = StaticFileBody(handle, 0, stat.st_size)
+        try:
+            etag = get_static_etag(path, stat)
+            content_type = self.guess_type(path)
+            last_modified = self.date_time_string(int(stat.st_mtime))
+            cache_headers = {
+                "ETag": etag,
+                "Last-Modified": last_modified,
+                "Cache-Control": get_static_cache_control(path),
+            }
+            encoding = None
+            if (
+                content_type.split(";")[0] in COMPRESSIBLE_CONTENT_TYPES
+                and stat.st_size >= COMPRESSION_MIN_BYTES
+            ):
+                cache_headers["Vary"] = "Accept-Encoding"
+                encoding = choose_content_encoding(self.headers.get("Accept-Encoding"))
+            if encoding:
+                etag = f'{etag[:-1]}-{encoding}"'
+                cache_headers["ETag"] = etag
+            if is_not_modified(self.headers, etag, stat.st_mtime):
+                body.close()
+                self.send_response(304)
+                for name, value in cache_headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                return None
+            if encoding:
+                compressed = get_compressed_variant(
+                    ("static", path),
+                    (stat.st_mtime_ns, stat.st_size),
+                    encoding,
+                    Path(path).read_bytes,
+                )
+                body.close()
+                body = io.BytesIO(compressed)
+                cache_headers["Content-Encoding"] = encoding
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(compressed)))
+            else:
+                cache_headers["Accept-Ranges"] = "bytes"
+                byte_range = None
+                if_range = self.headers.get("If-Range")
+                if not if_range or if_range.strip() in (etag, last_modified):
+                    byte_range = parse_byte_range(self.headers.get("Range"), stat.st_size)
+                if byte_range:
+                    body.offset, end = byte_range
+                    body.count = end - body.offset + 1
+                    self.send_response(206)
+                    self.send_header("Content-Range", f"bytes {body.offset}-{end}/{stat.st_size}")
+                else:
+                    self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(body.count))
+            for name, value in cache_headers.items():
+                self.send_header(name, value)
             self.end_headers()
-            self.wfile.write(json.dumps({"error": "Store not found."}).encode("utf-8"))
+            return body
+        except RangeNotSatisfiable:
+            body.close()
+            self.send_response(416)
+            self.send_header("Content-Range", f"bytes */{stat.st_size}")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+        except BaseException:
+            body.close()
+            raise
+
+    def copyfile(self, source, outputfile) -> None:
+        if isinstance(source, StaticFileBody):
+            source.send_to(self.connection)
             return
+        super().copyfile(source, outputfile)
 
+    def send_json(self, status: int, payload: object, headers: dict | None = None) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_compressible(status, "application/json", body, headers=headers)
+
+    def mark_body_read(self) -> None:
+        # Chunked request bodies are not decoded, so they never count as read.
+        self.body_pending = "Transfer-Encoding" in self.headers
+
+    def read_json_body(self) -> dict:
         try:
             length = int(self.headers.get("Content-Length", "0"))
         except ValueError:
             length = 0
         payload = self.rfile.read(length).decode("utf-8") if length else ""
+        self.mark_body_read()
         try:
             data = json.loads(payload) if payload else {}
         except json.JSONDecodeError:
-            self.send_response(400)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "Invalid JSON payload."}).encode("utf-8"))
-            return
+            raise ApiError(400, "Invalid JSON payload.") from None
+        if not isinstance(data, dict):
+            raise ApiError(400, "Invalid JSON payload.")
+        return data
 
-        owner_email = (data.get("owner_email") or "").strip().lower()
-        if owner_email != (store.get("owner_email") or "").strip().lower():
-            self.send_response(403)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(
-                json.dumps({"error": "Only the store owner can update dress metadata."}).encode("utf-8")
+    def read_multipart_length(self, max_bytes: int, too_large_message: str) -> tuple[str, int]:
+        content_type = self.headers.get("Content-Type") or ""
+        if "multipart/form-data" not in content_type:
+            raise ApiError(400, "multipart/form-data is required.")
+        try:
+            content_length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            content_length = -1
+        if content_length < 0:
+            raise ApiError(411, "Content-Length is required.")
+        if image_job_queue_full():
+            raise ApiError(
+                503, "Photo processing is busy. Please try again shortly.", {"Retry-After": "5"}
             )
+        if content_length > max_bytes:
+            raise ApiError(413, too_large_message)
+        return content_type, content_length
+
+    def send_page(self, query: dict, page_id: str) -> None:
+        locale = query.get("lang", [""])[0]
+        page, cache_hit = render_page_bytes(locale, page_id)
+        self.send_compressible(
+            200,
+            "text/html; charset=utf-8",
+            page,
+            cache_key=("page", page_id, hash(page)),
+            headers={"X-Page-Cache": "hit" if cache_hit else "miss"},
+        )
+
+    def dispatch(self, method: str) -> None:
+        parsed = urlparse(self.path)
+        self.body_pending = self.headers.get("Content-Length", "0") != "0" or (
+            "Transfer-Encoding" in self.headers
+        )
+        resolved = LANDING_ROUTER.resolve(method, parsed.path)
+        if resolved is None:
+            if method == "GET":
+                super().do_GET()
+            else:
+                self.route_name = "not_found"
+                self.send_json(404, {"error": "Not found."})
             return
+        handler_name, params = resolved
+        self.route_name = handler_name
+        try:
+            # sqlite3 raises OverflowError for ids past 64 bits; no such row can exist anyway.
+            if any(param > SQLITE_MAX_INTEGER for param in params):
+                raise ApiError(404, "Not found.")
+            getattr(self, handler_name)(parse_qs(parsed.query), *params)
+        except ApiError as error:
+            self.send_json(error.status, {"error": error.message}, headers=error.headers)
+
+    def do_GET(self) -> None:
+        self.dispatch("GET")
 
+    def do_POST(self) -> None:
+        self.dispatch("POST")
+
+    def do_PUT(self) -> None:
+        self.dispatch("PUT")
+
+    def do_DELETE(self) -> None:
+        self.dispatch("DELETE")
+
+    @route("GET", "/", "")
+    def get_landing_page(self, query: dict) -> None:
+        self.send_page(query, "landing")
+
+    @route("GET", "/login", "/login/")
+    def get_login_page(self, query: dict) -> None:
+        self.send_page(query, "login")
+
+    @route("GET", "/stores", "/stores/")
+    def get_stores_page(self, query: dict) -> None:
+        self.send_page(query, "stores")
+
+    @route("GET", "/admin", "/admin/")
+    def get_admin_page(self, query: dict) -> None:
+        self.send_page(query, "admin")
+
+    @route("GET", "/stores/details", "/stores/details/", "/details", "/details/")
+    def get_store_details_page(self, query: dict) -> None:
+        self.send_page(query, "store-details")
+
+    @route("GET", "/api/default-dress-photos")
+    def get_default_dress_photos(self, query: dict) -> None:
+        self.send_json(200, {"photos": list_default_dress_photos()})
+
+    @route("GET", "/api/default-dress-metadata")
+    def get_default_dress_metadata(self, query: dict) -> None:
+        tag_ids = normalize_tag_ids(query.get("tag", []))
+        self.send_json(200, {"photos": filter_default_dress_metadata(tag_ids)})
+
+    @route("PUT", "/api/default-dress-metadata")
+    def put_default_dress_metadata(self, query: dict) -> None:
+        data = self.read_json_body()
         photo_path = (data.get("photo_path") or "").strip()
-        raw_tags = data.get("tags")
-        if raw_tags is None:
-            raw_tags = []
-        if not isinstance(raw_tags, list):
-            self.send_response(400)
-            self.send_header("Content-Type", "application/json")
+        tags = parse_tags_field(data.get("tags"))
+        if not update_default_dress_metadata(photo_path, tags):
+            raise ApiError(404, "Default photo not found.")
+        self.send_json(200, {"photos": fetch_default_dress_metadata()})
+
+    @route("GET", "/api/sessions/deck")
+    def get_session_deck(self, query: dict) -> None:
+        try:
+            deck = get_session_deck_bytes()
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise ApiError(500, "Session deck is unavailable.") from None
+        self.send_compressible(
+            200, "application/json", deck, cache_key=("session-deck", hash(deck))
+        )
+
+    @route("GET", "/metrics")
+    def get_metrics(self, query: dict) -> None:
+        self.send_compressible(200, PROMETHEUS_CONTENT_TYPE, render_metrics())
+
+    @route("GET", "/api/image-jobs")
+    def get_image_jobs(self, query: dict) -> None:
+        self.send_json(200, image_job_stats())
+
+    @route("GET", "/api/tag-options")
+    def get_tag_options(self, query: dict) -> None:
+        try:
+            body, etag = get_tag_options_response(query.get("lang", [""])[0])
+        except (FileNotFoundError, json.JSONDecodeError):
+            raise ApiError(500, "Tag options are unavailable.") from None
+        # Weak, so gzip and identity responses share one validator.
+        headers = {"ETag": f"W/{etag}", "Cache-Control": "no-cache"}
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match is not None and etag_matches(if_none_match, etag):
+            self.send_response(304)
+            for name, value in headers.items():
+                self.send_header(name, value)
             self.end_headers()
-            self.wfile.write(json.dumps({"error": "tags must be an array."}).encode("utf-8"))
             return
-        tags = [str(tag).strip() for tag in raw_tags if str(tag).strip()]
+        self.send_compressible(
+            200, "application/json", body, cache_key=("tag-options", etag), headers=headers
+        )
+
+    @route("GET", "/api/stores")
+    def get_stores(self, query: dict) -> None:
+        owner_email = (query.get("owner", [""])[0]).strip().lower()
+        if not owner_email:
+            raise ApiError(400, "owner query param is required.")
+        include_photos = query.get("photos", ["1"])[0] != "0"
+        self.send_json(200, {"stores": fetch_stores(owner_email, include_photos)})
+
+    @route("POST", "/api/stores")
+    def post_store(self, query: dict) -> None:
+        data = self.read_json_body()
+        name = (data.get("name") or "").strip()
+        location = (data.get("location") or "").strip()
+        owner_email = (data.get("owner_email") or "").strip().lower()
+        if not name or not location or not owner_email:
+            raise ApiError(400, "name, location, and owner_email are required.")
+        self.send_json(201, create_store(name, location, owner_email))
+
+    @route("POST", "/api/stores/join")
+    def post_store_join(self, query: dict) -> None:
+        data = self.read_json_body()
+        invite_code = (data.get("invite_code") or "").strip().upper()
+        member_email = (data.get("member_email") or "").strip().lower()
+        if not invite_code or not member_email:
+            raise ApiError(400, "invite_code and member_email are required.")
+        store = join_store(invite_code, member_email)
+        if not store:
+            raise ApiError(404, "Invite code not found.")
+        self.send_json(200, store)
+
+    @route("GET", "/api/stores/{store_id}/dresses")
+    def get_store_dresses(self, query: dict, store_id: int) -> None:
+        tag_ids = normalize_tag_ids(query.get("tag", []))
+        try:
+            min_price = float(query["min_price"][0]) if query.get("min_price") else None
+            max_price = float(query["max_price"][0]) if query.get("max_price") else None
+            limit = int(query.get("limit", [DRESS_PAGE_DEFAULT_LIMIT])[0])
+            cursor = decode_dress_cursor(query["cursor"][0]) if query.get("cursor") else None
+        except ValueError:
+            raise ApiError(400, "min_price, max_price, limit and cursor must be valid.") from None
+        if not 1 <= limit <= DRESS_PAGE_MAX_LIMIT:
+            raise ApiError(400, f"limit must be between 1 and {DRESS_PAGE_MAX_LIMIT}.")
+        page = fetch_store_dress_page(store_id, tag_ids, min_price, max_price, cursor, limit)
+        if page is None:
+            raise ApiError(404, "Store not found.")
+        page["tags"] = tag_ids
+        self.send_json(200, page)
+
+    @route("POST", "/api/stores/{store_id}/dress-photo")
+    def post_store_dress_photo(self, query: dict, store_id: int) -> None:
+        store = get_store_or_404(store_id)
+        content_type, content_length = self.read_multipart_length(
+            MAX_UPLOAD_BYTES, "Uploaded file is too large."
+        )
+        try:
+            fields, upload = parse_multipart_upload(
+                self.rfile,
+                content_type,
+                content_length,
+                "dress_photo",
+                get_store_photo_dir(store_id),
+            )
+        except MultipartError as error:
+            raise ApiError(400, str(error)) from None
+        self.mark_body_read()
+        try:
+            require_store_owner(
+                store, fields.get("owner_email"), "Only the store owner can upload dress photos."
+            )
+            if upload is None or not upload["filename"]:
+                raise ApiError(400, "dress_photo is required.")
+            if not upload["size"]:
+                raise ApiError(400, "Uploaded file is empty.")
+            photo_path = save_store_dress_photo_file(
+                store_id, upload["filename"], upload["path"], upload["sha256"]
+            )
+        finally:
+            discard_upload(upload)
+        if not photo_path:
+            raise ApiError(400, "Only .png, .jpg, .jpeg, and .webp files are supported.")
+        self.send_json(
+            200,
+            {
+                "photo": fetch_store_dress_photo(store_id, photo_path),
+                "photo_count": count_store_dress_photos(store_id),
+            },
+        )
 
+    @route("DELETE", "/api/stores/{store_id}/dress-photo")
+    def delete_store_dress_photo(self, query: dict, store_id: int) -> None:
+        store = get_store_or_404(store_id)
+        data = self.read_json_body()
+        photo_path = (data.get("photo_path") or "").strip()
+        require_store_owner(
+            store, data.get("owner_email"), "Only the store owner can remove dress photos."
+        )
+        if not photo_path:
+            raise ApiError(400, "photo_path is required.")
+        if not remove_store_dress_photo(store_id, photo_path):
+            raise ApiError(404, "Photo not found.")
+        self.send_json(
+            200, {"photo_path": photo_path, "photo_count": count_store_dress_photos(store_id)}
+        )
+
+    @route("POST", "/api/stores/{store_id}/dress-photos/import")
+    def post_store_dress_photo_import(self, query: dict, store_id: int) -> None:
+        store = get_store_or_404(store_id)
+        # The owner is checked from the query string, before the body is streamed to disk.
+        require_store_owner(
+            store, query.get("owner_email", [""])[0], "Only the store owner can import dress photos."
+        )
+        content_type, content_length = self.read_multipart_length(
+            MAX_IMPORT_BYTES, "Import is too large."
+        )
+        upload_dir = get_store_photo_dir(store_id)
+        try:
+            _, uploads = parse_multipart_uploads(
+                self.rfile,
+                content_type,
+                content_length,
+                {"dress_photos": MAX_IMPORT_FILES, "archive": 1, "tags_csv": 1},
+                upload_dir,
+            )
+        except MultipartError as error:
+            raise ApiError(400, str(error)) from None
+        self.mark_body_read()
+        photos = [upload for upload in uploads if upload["field"] == "dress_photos"]
+        try:
+            skipped = []
+            tags_csv = None
+            for upload in uploads:
+                if upload["field"] == "archive":
+                    staged, archive_skipped, archive_csv = stage_import_archive(
+                        upload["path"], upload_dir
+                    )
+                    photos.extend(staged)
+                    skipped.extend(archive_skipped)
+                    tags_csv = tags_csv or archive_csv
+                elif upload["field"] == "tags_csv":
+                    # An uploaded sidecar takes precedence over one inside the archive.
+                    tags_csv = upload["path"].read_text("utf-8-sig")
+            if not photos and not skipped:
+                raise ApiError(400, "dress_photos or archive is required.")
+            metadata = parse_import_tags_csv(tags_csv) if tags_csv else {}
+            result = import_store_dress_photos(store_id, photos, metadata)
+        except PhotoImportError as error:
+            raise ApiError(400, str(error)) from None
+        except UnicodeDecodeError:
+            raise ApiError(400, "tags_csv must be UTF-8.") from None
+        finally:
+            for upload in uploads + photos:
+                discard_upload(upload)
+        result["skipped"] = skipped + result["skipped"]
+        result["photo_count"] = count_store_dress_photos(store_id)
+        self.send_json(200, result)
+
+    @route("PUT", "/api/stores/{store_id}/dress-photo-metadata")
+    def put_store_dress_photo_metadata(self, query: dict, store_id: int) -> None:
+        store = get_store_or_404(store_id)
+        data = self.read_json_body()
+        require_store_owner(
+            store, data.get("owner_email"), "Only the store owner can update dress metadata."
+        )
+        photo_path = (data.get("photo_path") or "").strip()
+        tags = parse_tags_field(data.get("tags"))
         raw_price = data.get("price")
         price = None
         if raw_price not in (None, ""):
             try:
                 price = float(raw_price)
             except (TypeError, ValueError):
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "price must be a number."}).encode("utf-8"))
-                return
+                raise ApiError(400, "price must be a number.") from None
             if price < 0:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "price must be positive."}).encode("utf-8"))
-                return
+                raise ApiError(400, "price must be positive.")
+        if not update_store_dress_photo_metadata(store_id, photo_path, price, tags):
+            raise ApiError(404, "Photo not found.")
+        self.send_json(200, {"photo": fetch_store_dress_photo(store_id, photo_path)})
 
-        updated = update_store_dress_photo_metadata(store_id, photo_path, price, tags)
-        if not updated:
-            self.send_response(404)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"error": "Photo not found."}).encode("utf-8"))
-            return
+    @route("POST", "/api/stores/{store_id}/rank")
+    def post_store_rank(self, query: dict, store_id: int) -> None:
+        data = self.read_json_body()
+        likes = data.get("likes") or []
+        dislikes = data.get("dislikes") or []
+        limit = data.get("limit", RANKING_DEFAULT_LIMIT)
+        offset = data.get("offset", 0)
+        if not all(
+            isinstance(items, list) and all(isinstance(tags, list) for tags in items)
+            for items in (likes, dislikes)
+        ):
+            raise ApiError(400, "likes and dislikes must be arrays of tag arrays.")
+        if not isinstance(limit, int) or isinstance(limit, bool) or not 1 <= limit <= RANKING_MAX_LIMIT:
+            raise ApiError(400, f"limit must be an integer between 1 and {RANKING_MAX_LIMIT}.")
+        if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+            raise ApiError(400, "offset must be a non-negative integer.")
+        index = get_store_ranking_index(store_id)
+        if index is None:
+            raise ApiError(404, "Store not found.")
+        ranking = rank_store_dresses(index, build_preference_scores(likes, dislikes), limit, offset)
+        total = len(index["photos"])
+        next_offset = offset + len(ranking)
+        self.send_json(
+            200,
+            {
+                "ranking": ranking,
+                "total": total,
+                "next_offset": next_offset if ranking and next_offset < total else None,
+            },
+        )
 
-        updated_store = fetch_store_by_id(store_id)
-        self.send_response(200)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps(updated_store).encode("utf-8"))
 
-    def do_DELETE(self) -> None:
-        parsed = urlparse(self.path)
-        dress_photo_match = re.fullmatch(r"/api/stores/(\d+)/dress-photo", parsed.path)
-        if dress_photo_match:
-            store_id = int(dress_photo_match.group(1))
-            store = fetch_store_by_id(store_id)
-            if not store:
-                self.send_response(404)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(json.dumps({"error": "Store not found."}).encode("utf-8"))
-                return
+LANDING_ROUTER = Router.from_handler(LandingHandler)
 
-            try:
-                length = int(self.headers.get("Content-Length", "0"))
-            except ValueError:
-                length = 0
-            payload = self.rfile.read(length).decode("utf-8") if length else ""
-            try:
-                data = json.loads(payload) if payload else {}
-            except json.JSONDecodeError:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Invalid JSON payload."}).encode("utf-8")
-                )
-                return
 
-            owner_email = (data.get("owner_email") or "").strip().lower()
-            photo_path = (data.get("photo_path") or "").strip()
-            if owner_email != (store.get("owner_email") or "").strip().lower():
-                self.send_response(403)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps(
-                        {"error": "Only the store owner can remove dress photos."}
-                    ).encode("utf-8")
-                )
-                return
-            if not photo_path:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "photo_path is required."}).encode("utf-8")
-                )
-                return
+class ThreadedLandingServer(ThreadingMixIn, TCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+    request_queue_size = 128
 
-            removed = remove_store_dress_photo(store_id, photo_path)
-            if not removed:
-                self.send_response(404)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Photo not found."}).encode("utf-8")
-                )
-                return
+    def __init__(self, server_address, handler_class, max_workers: int = DEFAULT_SERVER_WORKERS):
+        self.max_workers = max(1, max_workers)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="landing-worker"
+        )
+        self.open_connections = 0
+        self.connection_lock = threading.Lock()
+        super().__init__(server_address, handler_class)
 
-            updated_store = fetch_store_by_id(store_id)
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(updated_store).encode("utf-8"))
-            return
+    def process_request(self, request, client_address) -> None:
+        # Bounded pool instead of ThreadingMixIn's thread-per-request.
+        with self.connection_lock:
+            self.open_connections += 1
+        self.executor.submit(self.process_request_thread, request, client_address)
 
-        self.send_response(404)
-        self.send_header("Content-Type", "application/json")
-        self.end_headers()
-        self.wfile.write(json.dumps({"error": "Not found."}).encode("utf-8"))
+    def process_request_thread(self, request, client_address) -> None:
+        try:
+            super().process_request_thread(request, client_address)
+        finally:
+            with self.connection_lock:
+                self.open_connections -= 1
 
-    def do_GET(self) -> None:
-        parsed = urlparse(self.path)
-        if parsed.path == "/api/default-dress-photos":
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"photos": list_default_dress_photos()}).encode("utf-8"))
-            return
-        if parsed.path == "/api/default-dress-metadata":
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"photos": fetch_default_dress_metadata()}).encode("utf-8"))
-            return
-        if parsed.path == "/api/tag-options":
-            try:
-                options = load_tag_options()
-            except (FileNotFoundError, json.JSONDecodeError):
-                self.send_response(500)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "Tag options are unavailable."}).encode("utf-8")
-                )
-                return
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps(options).encode("utf-8"))
-            return
-        if parsed.path == "/api/stores":
-            query = parse_qs(parsed.query)
-            owner_email = (query.get("owner", [""])[0]).strip().lower()
-            if not owner_email:
-                self.send_response(400)
-                self.send_header("Content-Type", "application/json")
-                self.end_headers()
-                self.wfile.write(
-                    json.dumps({"error": "owner query param is required."}).encode("utf-8")
-                )
-                return
-            stores = fetch_stores(owner_email)
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json")
-            self.end_headers()
-            self.wfile.write(json.dumps({"stores": stores}).encode("utf-8"))
-            return
-        if parsed.path in {"", "/"}:
-            query = parse_qs(parsed.query)
-            locale = query.get("lang", [""])[0]
-            page = render_page(locale, "landing")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(page.encode("utf-8"))
-            return
-        if parsed.path in {"/login", "/login/"}:
-            query = parse_qs(parsed.query)
-            locale = query.get("lang", [""])[0]
-            page = render_page(locale, "login")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(page.encode("utf-8"))
-            return
-        if parsed.path in {"/stores", "/stores/"}:
-            query = parse_qs(parsed.query)
-            locale = query.get("lang", [""])[0]
-            page = render_page(locale, "stores")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(page.encode("utf-8"))
+    def is_saturated(self) -> bool:
+        # A kept-alive connection holds its worker, so stop reusing connections once others queue.
+        return self.open_connections > self.max_workers
+
+    def server_close(self) -> None:
+        super().server_close()
+        # Drain requests that were already accepted before the socket closed.
+        self.executor.shutdown(wait=True)
+
+
+class ReusePortLandingServer(ThreadedLandingServer):
+    def server_bind(self) -> None:
+        self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        super().server_bind()
+
+
+class SingleLandingServer(TCPServer):
+    allow_reuse_address = True
+
+    def is_saturated(self) -> bool:
+        # One connection at a time: keeping it open would block every other client.
+        return True
+
+
+class AsyncResponseWriter:
+    # Handler output is buffered on the worker thread and written by the loop once the handler returns.
+    def __init__(self, loop: asyncio.AbstractEventLoop, writer: asyncio.StreamWriter) -> None:
+        self.loop = loop
+        self.writer = writer
+        self.buffer = bytearray()
+
+    def write(self, data: bytes) -> int:
+        self.buffer += data
+        if len(self.buffer) >= ASYNC_WRITE_FLUSH_BYTES:
+            self.send_buffered()
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def send_buffered(self) -> None:
+        if self.buffer:
+            data = bytes(self.buffer)
+            self.buffer.clear()
+            asyncio.run_coroutine_threadsafe(self.drain(data), self.loop).result()
+
+    def sendfile(self, file, offset: int, count: int) -> None:
+        self.send_buffered()
+        asyncio.run_coroutine_threadsafe(
+            self.loop.sendfile(self.writer.transport, file, offset, count), self.loop
+        ).result()
+
+    async def drain(self, data: bytes = b"") -> None:
+        data = data or bytes(self.buffer)
+        self.buffer.clear()
+        if data:
+            self.writer.write(data)
+        await self.writer.drain()
+
+
+class AsyncRequestReader:
+    # The head (and small bodies) arrive pre-read; anything larger is pulled from the loop on demand.
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        reader: asyncio.StreamReader,
+        buffered: bytes,
+        response: AsyncResponseWriter,
+    ) -> None:
+        self.loop = loop
+        self.reader = reader
+        self.buffered = io.BytesIO(buffered)
+        self.response = response
+
+    def fetch(self, read, *args) -> bytes:
+        # A client waiting for "100 Continue" only sends its body once pending output is out.
+        self.response.send_buffered()
+        return asyncio.run_coroutine_threadsafe(
+            asyncio.wait_for(read(*args), IDLE_CONNECTION_TIMEOUT), self.loop
+        ).result()
+
+    def readline(self, limit: int = -1) -> bytes:
+        line = self.buffered.readline(limit)
+        if line.endswith(b"\n") or 0 <= limit <= len(line):
+            return line
+        return line + self.fetch(self.reader.readline)
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.buffered.read(size)
+        if size < 0:
+            return data + self.fetch(self.reader.read)
+        while len(data) < size:
+            chunk = self.fetch(self.reader.read, size - len(data))
+            if not chunk:
+                break
+            data += chunk
+        return data
+
+
+class AsyncLandingHandler(LandingHandler):
+    # One request per instance, run on a worker thread; the event loop owns the socket.
+    def setup(self) -> None:
+        self.rfile, self.wfile, self.requests_handled = self.request
+        self.connection = None
+        self.close_connection = True
+
+    def handle(self) -> None:
+        self.handle_one_request()
+
+    def finish(self) -> None:
+        pass
+
+    def copyfile(self, source, outputfile) -> None:
+        if isinstance(source, StaticFileBody) and source.count < ASYNC_WRITE_FLUSH_BYTES:
+            # Small files ride in the same write as the headers instead of a separate sendfile() round trip.
+            self.wfile.write(os.pread(source.handle.fd, source.count, source.offset))
             return
-        if parsed.path in {"/admin", "/admin/"}:
-            query = parse_qs(parsed.query)
-            locale = query.get("lang", [""])[0]
-            page = render_page(locale, "admin")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(page.encode("utf-8"))
+        if isinstance(source, StaticFileBody) and not SENDFILE_ENABLED:
+            offset, end = source.offset, source.offset + source.count
+            while offset < end:
+                chunk = os.pread(source.handle.fd, min(UPLOAD_CHUNK_SIZE, end - offset), offset)
+                if not chunk:
+                    raise ConnectionError("Static file ended before Content-Length was sent.")
+                self.wfile.write(chunk)
+                offset += len(chunk)
             return
-        if parsed.path in {"/stores/details", "/stores/details/"}:
-            query = parse_qs(parsed.query)
-            locale = query.get("lang", [""])[0]
-            page = render_page(locale, "store-details")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(page.encode("utf-8"))
+        if isinstance(source, StaticFileBody):
+            # A private descriptor lets the loop sendfile() without touching the cached one.
+            with os.fdopen(os.dup(source.handle.fd), "rb") as file:
+                self.wfile.sendfile(file, source.offset, source.count)
             return
-        if parsed.path in {"/details", "/details/"}:
-            query = parse_qs(parsed.query)
-            locale = query.get("lang", [""])[0]
-            page = render_page(locale, "store-details")
-            self.send_response(200)
-            self.send_header("Content-Type", "text/html; charset=utf-8")
-            self.end_headers()
-            self.wfile.write(page.encode("utf-8"))
+        super().copyfile(source, outputfile)
+
+
+class AsyncLandingServer:
+    # Idle and slow connections wait on the event loop; only parsed requests occupy a worker thread.
+    def __init__(self, server_address, handler_class, max_workers: int = DEFAULT_SERVER_WORKERS):
+        self.handler_class = handler_class
+        self.executor = ThreadPoolExecutor(
+            max_workers=max(1, max_workers), thread_name_prefix="landing-async"
+        )
+        self.socket = socket.create_server(server_address, backlog=ASYNC_LISTEN_BACKLOG)
+        self.socket.setblocking(False)
+        self.server_address = self.socket.getsockname()
+        self.loop = asyncio.new_event_loop()
+        self.stop_requested = asyncio.Event()
+        self.stopped = threading.Event()
+        self.stopping = False
+        self.connections: set[asyncio.Task] = set()
+        self.idle_connections: set[asyncio.Task] = set()
+
+    def is_saturated(self) -> bool:
+        return False
+
+    def __enter__(self) -> "AsyncLandingServer":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.server_close()
+
+    def serve_forever(self) -> None:
+        try:
+            self.loop.run_until_complete(self.serve())
+        finally:
+            self.loop.close()
+            self.stopped.set()
+
+    def shutdown(self) -> None:
+        try:
+            self.loop.call_soon_threadsafe(self.stop_requested.set)
+        except RuntimeError:
             return
-        super().do_GET()
+        self.stopped.wait()
 
+    def server_close(self) -> None:
+        self.socket.close()
+        self.executor.shutdown(wait=True)
+        if not self.loop.is_closed() and not self.loop.is_running():
+            self.loop.close()
+
+    async def serve(self) -> None:
+        server = await asyncio.start_server(
+            self.handle_connection, sock=self.socket, limit=ASYNC_MAX_HEADER_BYTES
+        )
+        await self.stop_requested.wait()
+        server.close()
+        # Idle connections close now; busy ones finish their current request first.
+        self.stopping = True
+        for task in list(self.idle_connections):
+            task.cancel()
+        if self.connections:
+            await asyncio.wait(list(self.connections))
+        await server.wait_closed()
 
-def run(port: int) -> None:
+    async def read_request(self, reader: asyncio.StreamReader, timeout: float) -> bytes | None:
+        task = asyncio.current_task()
+        self.idle_connections.add(task)
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), timeout)
+            match = CONTENT_LENGTH_PATTERN.search(head)
+            if (
+                match
+                and int(match.group(1)) <= ASYNC_BODY_BUFFER_BYTES
+                and not EXPECT_CONTINUE_PATTERN.search(head)
+            ):
+                head += await asyncio.wait_for(
+                    reader.readexactly(int(match.group(1))), IDLE_CONNECTION_TIMEOUT
+                )
+        except (
+            asyncio.IncompleteReadError,
+            asyncio.LimitOverrunError,
+            asyncio.TimeoutError,
+            asyncio.CancelledError,
+            ConnectionError,
+        ):
+            return None
+        finally:
+            self.idle_connections.discard(task)
+        return head
+
+    async def handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        task = asyncio.current_task()
+        self.connections.add(task)
+        client_address = writer.get_extra_info("peername")
+        requests_handled = 0
+        try:
+            while not self.stopping:
+                timeout = KEEP_ALIVE_TIMEOUT if requests_handled else IDLE_CONNECTION_TIMEOUT
+                request = await self.read_request(reader, timeout)
+                if request is None:
+                    break
+                response = AsyncResponseWriter(self.loop, writer)
+                rfile = AsyncRequestReader(self.loop, reader, request, response)
+                handler = await self.loop.run_in_executor(
+                    self.executor,
+                    self.handler_class,
+                    (rfile, response, requests_handled),
+                    client_address,
+                    self,
+                )
+                await response.drain()
+                requests_handled += 1
+                if handler.close_connection:
+                    break
+        except ConnectionError:
+            pass
+        except Exception:
+            sys.stderr.write(f"Exception occurred during processing of request from {client_address}\n")
+            traceback.print_exc()
+        finally:
+            self.connections.discard(task)
+            writer.close()
+
+
+def build_server(port: int, mode: str, workers: int) -> TCPServer | AsyncLandingServer:
+    if mode == "asyncio":
+        return AsyncLandingServer(("", port), AsyncLandingHandler, max_workers=workers)
+    if mode == "single":
+        return SingleLandingServer(("", port), LandingHandler)
+    if mode == "prefork":
+        return ReusePortLandingServer(("", port), LandingHandler, max_workers=workers)
+    return ThreadedLandingServer(("", port), LandingHandler, max_workers=workers)
+
+
+def install_shutdown_handlers(httpd: TCPServer) -> None:
+    def handle_signal(signum, frame) -> None:
+        # shutdown() blocks until serve_forever() returns, so it cannot run on the serving thread.
+        threading.Thread(target=httpd.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+
+def serve(port: int, mode: str, workers: int, resume_jobs: bool = True) -> None:
+    if resume_jobs:
+        resume_image_jobs()
+    try:
+        with build_server(port, mode, workers) as httpd:
+            install_shutdown_handlers(httpd)
+            httpd.serve_forever()
+    finally:
+        shutdown_image_jobs()
+
+
+def run_prefork(port: int, workers: int, processes: int) -> None:
+    children = []
+    for index in range(max(1, processes)):
+        pid = os.fork()
+        if pid == 0:
+            try:
+                serve(port, "prefork", workers, resume_jobs=index == 0)
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    def forward_signal(signum, frame) -> None:
+        for child in children:
+            try:
+                os.kill(child, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, forward_signal)
+    signal.signal(signal.SIGINT, forward_signal)
+    for child in children:
+        try:
+            os.waitpid(child, 0)
+        except ChildProcessError:
+            pass
+
+
+def run(
+    port: int,
+    mode: str = DEFAULT_SERVER_MODE,
+    workers: int = DEFAULT_SERVER_WORKERS,
+    processes: int = DEFAULT_SERVER_PROCESSES,
+) -> None:
+    if mode not in SERVER_MODES:
+        raise ValueError(f"Unknown server mode: {mode}")
+    if ACCESS_LOG_FORMAT not in ACCESS_LOG_FORMATS:
+        raise ValueError(f"Unknown access log format: {ACCESS_LOG_FORMAT}")
     init_db()
-    with TCPServer(("", port), LandingHandler) as httpd:
-        print(f"Landing page running at http://localhost:{port}")
-        httpd.serve_forever()
+    print(f"Landing page running at http://localhost:{port} ({mode})")
+    if mode == "prefork":
+        run_prefork(port, workers, processes)
+        return
+    serve(port, mode, workers)
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bridal Studio Sessions landing server.")
+    parser.add_argument(
+        "--port", type=int, default=int(os.environ.get("LANDING_SERVER_PORT", "8000"))
+    )
+    parser.add_argument(
+        "--mode",
+        choices=SERVER_MODES,
+        default=os.environ.get("LANDING_SERVER_MODE", DEFAULT_SERVER_MODE),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=int(os.environ.get("LANDING_SERVER_WORKERS", DEFAULT_SERVER_WORKERS)),
+        help="Worker threads per process.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        default=int(os.environ.get("LANDING_SERVER_PROCESSES", DEFAULT_SERVER_PROCESSES)),
+        help="Forked processes sharing the port in prefork mode.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    import_parser = commands.add_parser(
+        "import-photos", help="Bulk import a directory of dress photos into a store."
+    )
+    import_parser.add_argument("store_id", type=int)
+    import_parser.add_argument("directory", type=Path)
+    import_parser.add_argument(
+        "--tags-csv",
+        type=Path,
+        help=f"Sidecar with filename,tags,price columns (default: <directory>/{IMPORT_TAGS_CSV_NAME}).",
+    )
+    commands.add_parser(
+        "build-assets",
+        help="Write content-hashed copies of app.js, styles.css and images/ plus build/manifest.json.",
+    )
+    commands.add_parser(
+        "storage-report", help="Compare the bytes stored in images/blobs/ with the bytes they stand for."
+    )
+    return parser.parse_args(argv)
 
 
 if __name__ == "__main__":
-    run(port=8000)
+    args = parse_args()
+    if args.command == "import-photos":
+        raise SystemExit(import_photos_command(args.store_id, args.directory, args.tags_csv))
+    if args.command == "build-assets":
+        raise SystemExit(build_assets_command())
+    if args.command == "storage-report":
+        raise SystemExit(storage_report_command())
+    run(port=args.port, mode=args.mode, workers=args.workers, processes=args.processes)
@@ -0,0 +1,76 @@
+import contextlib
+import io
+import sqlite3
+import sys
+import tempfile
+import time
+import unittest
+from concurrent.futures import Future
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import landing_server  # noqa: E402
+
+PHOTO_PATH = "images/blobs/ab/abcdef.jpg"
+
+
+class FinishImageJobTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(landing_server, "DB_PATH", Path(directory.name) / "stores.db")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        stats = mock.patch.dict(landing_server.IMAGE_JOB_STATS, {"queued": 1, "completed": 0, "failed": 0})
+        stats.start()
+        self.addCleanup(stats.stop)
+        landing_server.init_db()
+        store = landing_server.create_store("Atelier", "Paris", "owner@example.com")
+        with landing_server.get_db_connection() as conn:
+            conn.execute(
+                """
+                INSERT INTO store_dress_photos (store_id, photo_path, created_at, status)
+                VALUES (?, ?, '2024-01-01T00:00:00+00:00', 'processing')
+                """,
+                (store["id"], PHOTO_PATH),
+            )
+
+    def finish(self, failures: int) -> str:
+        connect = landing_server.get_db_connection
+        calls = []
+
+        def flaky_connection() -> sqlite3.Connection:
+            calls.append(None)
+            if len(calls) <= failures:
+                raise sqlite3.OperationalError("database is locked")
+            return connect()
+
+        future = Future()
+        future.set_result([{"width": 480, "format": "webp", "path": "images/derived/480/ab/abcdef.webp"}])
+        with (
+            mock.patch.object(landing_server, "get_db_connection", flaky_connection),
+            mock.patch.object(landing_server, "remove_dress_photo_derivatives") as remove,
+            contextlib.redirect_stderr(io.StringIO()),
+        ):
+            landing_server.finish_image_job(PHOTO_PATH, time.monotonic(), future)
+        remove.assert_called_once_with(PHOTO_PATH)
+        with landing_server.get_db_connection() as conn:
+            return conn.execute(
+                "SELECT status FROM store_dress_photos WHERE photo_path = ?", (PHOTO_PATH,)
+            ).fetchone()[0]
+
+    def test_failed_result_write_marks_photo_failed(self) -> None:
+        self.assertEqual(self.finish(failures=1), "failed")
+        self.assertEqual(landing_server.IMAGE_JOB_STATS["failed"], 1)
+        self.assertEqual(landing_server.IMAGE_JOB_STATS["completed"], 0)
+        self.assertEqual(landing_server.IMAGE_JOB_STATS["queued"], 0)
+
+    def test_unwritable_database_leaves_photo_for_resume(self) -> None:
+        self.assertEqual(self.finish(failures=2), "processing")
+        self.assertEqual(landing_server.IMAGE_JOB_STATS["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import json
+import random
+import shutil
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import landing_server  # noqa: E402
+
+# The ranking app.js used before POST /api/stores/<id>/rank existed, kept verbatim apart
+# from reading its inputs from stdin.
+CLIENT_RANKING_JS = r"""
+const normalizeToken = (value) =>
+  (value || '')
+    .toString()
+    .trim()
+    .toLowerCase()
+    .replace(/[^a-z0-9]+/g, '-');
+
+const { photos: currentDressPhotos, likes: swipeLikes, dislikes: swipeDislikes } = JSON.parse(
+  require('fs').readFileSync(0, 'utf8'),
+);
+
+const buildSwipePreferenceScores = () => {
+  const scores = new Map();
+  const updateScores = (items, delta) => {
+    items.forEach((item) => {
+      const uniqueTags = new Set((Array.isArray(item.tags) ? item.tags : []).map((tag) => normalizeToken(tag)).filter(Boolean));
+      uniqueTags.forEach((tagId) => {
+        scores.set(tagId, (scores.get(tagId) || 0) + delta);
+      });
+    });
+  };
+
+  updateScores(swipeLikes, 1);
+  updateScores(swipeDislikes, -1);
+  return scores;
+};
+
+const rankStoreDressesFromSession = () => {
+  const preferenceScores = buildSwipePreferenceScores();
+  const safePhotos = Array.isArray(currentDressPhotos) ? currentDressPhotos : [];
+  return safePhotos
+    .map((photo) => {
+      const normalizedTags = Array.isArray(photo.tags)
+        ? photo.tags.map((tag) => normalizeToken(tag)).filter(Boolean)
+        : [];
+      const score = normalizedTags.reduce((total, tagId) => total + (preferenceScores.get(tagId) || 0), 0);
+      return {
+        ...photo,
+        score,
+        normalizedTags,
+      };
+    })
+    .sort((first, second) => {
+      if (second.score !== first.score) {
+        return second.score - first.score;
+      }
+      return (first.photo_path || '').localeCompare(second.photo_path || '');
+    });
+};
+
+console.log(JSON.stringify(rankStoreDressesFromSession().map((photo) => [photo.photo_path, photo.score])));
+"""
+
+
+def build_fixture(seed: int) -> dict:
+    rng = random.Random(seed)
+    tags = ["Lace", "lace ", "A-Line", "a line", "Mermaid", "Boho", "Silk", "Tulle", "Off Shoulder", "Sleeves"]
+    names = ["dress", "Dress", "DRESS", "robe", "Robe_", "robé", "_gown", "gown-2", "Gown.10", "gown.9"]
+    photos = []
+    for number in range(400):
+        photos.append(
+            {
+                "photo_path": f"images/stores/1/{rng.choice(names)}{rng.choice(['', '_', '-', '.'])}{number}.jpg",
+                "tags": rng.sample(tags, rng.randint(0, 4)),
+            }
+        )
+    # A few duplicated tags per photo and a handful of identical-score paths exercise ties.
+    photos[5]["tags"] = ["Lace", "Lace", "lace"]
+    sessions = [
+        [{"tags": rng.sample(tags, rng.randint(1, 3))} for _ in range(rng.randint(1, 8))] for _ in range(2)
+    ]
+    return {"photos": photos, "likes": sessions[0], "dislikes": sessions[1]}
+
+
+def rank_like_client(fixture: dict) -> list[list]:
+    result = subprocess.run(
+        ["node", "-e", CLIENT_RANKING_JS],
+        input=json.dumps(fixture),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout)
+
+
+def rank_on_server(fixture: dict, page_size: int) -> list[list]:
+    index = landing_server.build_ranking_index(fixture["photos"], version=1)
+    preferences = landing_server.build_preference_scores(
+        [item["tags"] for item in fixture["likes"]], [item["tags"] for item in fixture["dislikes"]]
+    )
+    ranking = []
+    while page := landing_server.rank_store_dresses(index, preferences, page_size, len(ranking)):
+        ranking.extend(page)
+    return [[photo["photo_path"], photo["score"]] for photo in ranking]
+
+
+@unittest.skipUnless(shutil.which("node"), "node is needed to run the old client ranking")
+class ServerRankingMatchesClientTest(unittest.TestCase):
+    def assert_matches_client(self) -> None:
+        for seed in range(5):
+            fixture = build_fixture(seed)
+            expected = rank_like_client(fixture)
+            for page_size in (1, 37, 500):
+                with self.subTest(seed=seed, page_size=page_size):
+                    self.assertEqual(rank_on_server(fixture, page_size), expected)
+
+    @unittest.skipIf(landing_server.numpy is None, "NumPy is not installed")
+    def test_numpy_ranking_matches_client(self) -> None:
+        self.assert_matches_client()
+
+    def test_python_ranking_matches_client(self) -> None:
+        numpy = landing_server.numpy
+        landing_server.numpy = None
+        try:
+            self.assert_matches_client()
+        finally:
+            landing_server.numpy = numpy
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import landing_server  # noqa: E402
+
+OWNER = "owner@example.com"
+PHOTOS_PER_STORE = 50
+
+
+class FetchStoresQueryCountTest(unittest.TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        patcher = mock.patch.object(landing_server, "DB_PATH", Path(directory.name) / "stores.db")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        landing_server.init_db()
+        self.store_count = 0
+
+    def add_stores(self, total: int) -> None:
+        while self.store_count < total:
+            store = landing_server.create_store(f"Store {self.store_count}", "Paris", OWNER)
+            with landing_server.get_db_connection() as conn:
+                conn.executemany(
+                    """
+                    INSERT INTO store_dress_photos (store_id, photo_path, tags_json, created_at)
+                    VALUES (?, ?, '["lace"]', '2024-01-01T00:00:00+00:00')
+                    """,
+                    [(store["id"], f"images/stores/{store['id']}/{number}.jpg") for number in range(PHOTOS_PER_STORE)],
+                )
+            self.store_count += 1
+
+    def count_queries(self, include_photos: bool) -> tuple[int, list[dict]]:
+        conn = landing_server.get_db_connection()
+        statements = []
+        conn.set_trace_callback(statements.append)
+        try:
+            stores = landing_server.fetch_stores(OWNER, include_photos)
+        finally:
+            conn.set_trace_callback(None)
+        return sum(statement.lstrip().upper().startswith("SELECT") for statement in statements), stores
+
+    def test_query_count_does_not_grow_with_stores(self) -> None:
+        # One query for the stores and one for all of their photos (or photo summaries).
+        for total in (1, 10, 100):
+            self.add_stores(total)
+            for include_photos in (True, False):
+                with self.subTest(stores=total, include_photos=include_photos):
+                    queries, stores = self.count_queries(include_photos)
+                    self.assertEqual(queries, 2)
+                    self.assertEqual(len(stores), total)
+                    self.assertTrue(all(store["photo_count"] == PHOTOS_PER_STORE for store in stores))
+
+
+if __name__ == "__main__":
+    unittest.main()